@@ -4,7 +4,7 @@ from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
 from .models import (
     Organization, Membership, UserProfile, RoleAlias,
-    Tab, Entry, EntryImage
+    Tab, Entry, EntryImage, Invite, InviteCampaign, OutboundEmail
 )
 
 User = get_user_model()
@@ -61,6 +61,27 @@ class EntryImageAdmin(admin.ModelAdmin):
     list_select_related = ("entry",)
     raw_id_fields = ("entry",)
 
+@admin.register(Invite)
+class InviteAdmin(admin.ModelAdmin):
+    list_display = ("id", "org", "delivery", "email", "phone", "delivery_status", "delivery_attempts", "created_at")
+    list_filter = ("delivery_status", "delivery", "org")
+    search_fields = ("email", "phone", "org__name")
+    list_select_related = ("org",)
+    readonly_fields = ("token", "delivery_status", "delivery_attempts", "delivery_error", "delivered_at")
+
+@admin.register(InviteCampaign)
+class InviteCampaignAdmin(admin.ModelAdmin):
+    list_display = ("id", "org", "role", "total", "created_by", "created_at")
+    list_filter = ("org",)
+    list_select_related = ("org", "created_by")
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("id", "subject", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = ("attempts", "error", "claimed_at", "sent_at")
+
 # --- User admin (keep Django’s features + add inlines) ---
 class UserProfileInline(admin.StackedInline):
     model = UserProfile
@@ -0,0 +1,115 @@
+"""
+Cross-request caches built on Django's cache API (locmem in dev, Redis in prod).
+
+Each cache counts its hits/misses in the cache backend itself, so the numbers
+are shared by every worker; read them with `cache_stats(name)` or
+`manage.py cache_stats`.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
+from .models import Membership
+
+STATS_PREFIX = "journal:stats"
+
+
+# --- Hit/miss counters ---
+
+def bump(name, outcome, n=1):
+    """Increment the `outcome` ("hits" / "misses") counter of cache `name`."""
+    if not n:
+        return
+    key = f"{STATS_PREFIX}:{name}:{outcome}"
+    try:
+        cache.incr(key, n)
+    except ValueError:  # first use (or evicted): counters are best-effort
+        cache.set(key, n, None)
+
+
+def cache_stats(name):
+    hits = cache.get(f"{STATS_PREFIX}:{name}:hits", 0)
+    misses = cache.get(f"{STATS_PREFIX}:{name}:misses", 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": (hits / total) if total else 0.0}
+
+
+def reset_stats(name):
+    cache.delete_many([f"{STATS_PREFIX}:{name}:hits", f"{STATS_PREFIX}:{name}:misses"])
+
+
+# --- Per-user memberships ---
+
+MEMBERSHIP_CACHE = "memberships"
+
+
+def _membership_key(user_id):
+    return f"journal:mem:{user_id}"
+
+
+def cached_memberships(user):
+    """
+    All of the user's memberships (org loaded, `has_subusers` annotated),
+    oldest first. Served from cache; invalidated by journal.signals.
+    """
+    key = _membership_key(user.pk)
+    rows = cache.get(key)
+    if rows is not None:
+        bump(MEMBERSHIP_CACHE, "hits")
+        return rows
+
+    bump(MEMBERSHIP_CACHE, "misses")
+    subusers = Membership.objects.filter(org=OuterRef("org"), managed_by=OuterRef("user"))
+    rows = list(Membership.objects
+                .select_related("org")
+                .filter(user=user)
+                .annotate(has_subusers=Exists(subusers))
+                .order_by("id"))
+    cache.set(key, rows, getattr(settings, "MEMBERSHIP_CACHE_TTL", 300))
+    return rows
+
+
+def invalidate_memberships(*user_ids):
+    keys = [_membership_key(uid) for uid in set(user_ids) if uid]
+    if keys:
+        cache.delete_many(keys)
+
+
+# --- Content versions (ETag validators) ---
+# Opaque tokens per scope ("org:<id>", "author:<id>"), replaced whenever
+# something rendered under that scope changes. A lost/evicted token just
+# means one extra full render, never a stale 304.
+
+def _version_key(scope):
+    return f"journal:ver:{scope}"
+
+
+def content_version(scope):
+    key = _version_key(scope)
+    v = cache.get(key)
+    if v is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        v = cache.get(key)
+    return v
+
+
+def bump_versions(*scopes):
+    cache.set_many({_version_key(s): uuid.uuid4().hex for s in scopes if s}, None)
+
+
+# --- Cached counts ---
+
+def cached_count(qs, scope, *parts):
+    """
+    qs.count() cached under the current content version of `scope`, so a
+    bump_versions(scope) from journal.signals retires it; `parts` tell apart
+    different filters within the scope.
+    """
+    key = ":".join(["journal:count", scope, content_version(scope), *map(str, parts)])
+    n = cache.get(key)
+    if n is None:
+        n = qs.count()
+        cache.set(key, n, getattr(settings, "COUNT_CACHE_TTL", 3600))
+    return n
@@ -0,0 +1,54 @@
+"""
+Conditional GET for HTML pages and HTMX partials.
+
+`etag_for(scope_func)` wraps Django's `condition()` so a matching
+If-None-Match is answered with 304 before the view (and any template) runs.
+scope_func(request, *args, **kwargs) returns a content-version string from
+journal.caching (or None to skip validation). Everything else that changes
+the rendered bytes for a given user is folded into the ETag: user, role,
+whether they manage subusers (the nav), HX-Request, the full path and the CSRF secret (a rotated secret must not
+revive a page carrying the old token).
+"""
+import hashlib
+from functools import wraps
+
+from django.contrib import messages
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from .utils import active_membership
+
+
+def _etag(scope_func):
+    def etag_func(request, *args, **kwargs):
+        if len(messages.get_messages(request)):
+            return None  # flash messages render once; always send the page
+        scope = scope_func(request, *args, **kwargs)
+        if scope is None:
+            return None
+        raw = "|".join([
+            scope,
+            str(request.user.pk),
+            str(active_membership(request.user).role),
+            str(active_membership(request.user).has_subusers),  # shows the Review Queue link
+            request.headers.get("HX-Request", ""),
+            request.get_full_path(),
+            request.META.get("CSRF_COOKIE", ""),
+        ])
+        return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return etag_func
+
+
+def etag_for(scope_func):
+    def decorator(view):
+        conditional_view = condition(etag_func=_etag(scope_func))(view)
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            # per-user bytes: browsers may keep them, shared caches may not
+            patch_vary_headers(response, ("Cookie", "HX-Request"))
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return inner
+    return decorator
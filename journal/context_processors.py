@@ -1,4 +1,4 @@
-from .models import Organization, Membership
+from .utils import active_membership
 
 def org_and_role(request):
     user = getattr(request, "user", None)
@@ -10,28 +10,15 @@ def org_and_role(request):
             "show_review_queue": False,
         }
 
-    # Get this user's membership (and org) with 1 query
-    mem = (
-        Membership.objects
-        .select_related("org")
-        .filter(user=user)
-        .order_by("org__id")
-        .first()
-    )
-
-    org = mem.org if mem else None
-    role = mem.role if mem else None
-    is_mod = role in {"OWNER", "ADMIN", "MODERATOR"}
-
-    # Only compute has_subusers if the field exists and we have an org
-    has_subusers = False
-    if org and hasattr(Membership, "managed_by"):
-        has_subusers = Membership.objects.filter(org=org, managed_by=user).exists()
+    # Shared with views/permissions: at most 1 membership query per request
+    am = getattr(request, "active_membership", None) or active_membership(user)
+    is_mod = am.is_moderator
+    has_subusers = am.has_subusers
 
     return {
-        "current_org": org,
+        "current_org": am.org,
         "is_moderator": is_mod,
         "has_subusers": has_subusers,
         # Tweak this rule as you like:
         "show_review_queue": has_subusers or is_mod,
-    }
\ No newline at end of file
+    }
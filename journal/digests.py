@@ -0,0 +1,94 @@
+"""
+Notification digests (journal.tasks.send_notification_digests, a beat job
+every DIGEST_INTERVAL_HOURS).
+
+Moderators hear about entries submitted in their orgs and authors about
+their entries being approved, in one mail per person per run instead of
+one per event. The events come from two range scans on the indexed
+submitted_at / approved_at columns, starting at the oldest watermark,
+rather than from a query per user.
+
+Each user has a DigestWatermark. A run reports (watermark, now] and moves
+the watermark to now in the same transaction that queues the mail
+(journal.mail_queue), so each event is reported once. A user without a
+watermark starts from the previous run (the newest watermark), or one
+interval back on the very first run.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max, Min
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .mail_queue import enqueue_many
+from .models import DigestWatermark, Entry, Membership, OutboundEmail
+from .utils import MODERATOR_ROLES
+
+MAX_LOOKBACK = timedelta(days=7)  # older news isn't worth a mail
+
+
+def _events(field, since, until):
+    return list(Entry.objects.filter(**{f"{field}__gt": since, f"{field}__lte": until})
+                .order_by(field)
+                .values("pk", "org_id", "org__name", "author_id", "author__username", "title", field))
+
+
+def _section(events, field, mark):
+    items = [e for e in events if e[field] > mark]
+    for e in items[:settings.DIGEST_MAX_ITEMS]:
+        e.setdefault("url", settings.SITE_URL + reverse("journal:entry_detail", args=[e["pk"]]))
+    return items[:settings.DIGEST_MAX_ITEMS], max(0, len(items) - settings.DIGEST_MAX_ITEMS)
+
+
+def run(now=None):
+    """Queue this run's digests and advance watermarks; returns counts."""
+    now = now or timezone.now()
+    marks = DigestWatermark.objects.aggregate(oldest=Min("sent_until"), newest=Max("sent_until"))
+    default = marks["newest"] or now - timedelta(hours=settings.DIGEST_INTERVAL_HOURS)
+    since = max(marks["oldest"] or default, now - MAX_LOOKBACK)
+
+    submitted = _events("submitted_at", since, now)
+    approved = _events("approved_at", since, now)
+    stats = {"since": since, "submitted": len(submitted), "approved": len(approved), "mails": 0}
+
+    recipients = defaultdict(lambda: {"submitted": [], "approved": []})
+    if submitted:
+        moderators = defaultdict(list)
+        for user_id, org_id in (Membership.objects
+                                .filter(org_id__in={e["org_id"] for e in submitted}, role__in=MODERATOR_ROLES)
+                                .values_list("user_id", "org_id")):
+            moderators[org_id].append(user_id)
+        for e in submitted:
+            for user_id in moderators[e["org_id"]]:
+                if user_id != e["author_id"]:
+                    recipients[user_id]["submitted"].append(e)
+    for e in approved:
+        recipients[e["author_id"]]["approved"].append(e)
+    if not recipients:
+        return stats
+
+    user_marks = dict(DigestWatermark.objects.filter(user_id__in=recipients).values_list("user_id", "sent_until"))
+    mail = []
+    for user in get_user_model().objects.filter(pk__in=recipients).exclude(email=""):
+        mark = user_marks.get(user.pk, default)
+        events = recipients[user.pk]
+        ctx = {"user": user, "site_name": settings.SITE_NAME,
+               "review_url": settings.SITE_URL + reverse("journal:review_queue")}
+        ctx["submitted"], ctx["submitted_more"] = _section(events["submitted"], "submitted_at", mark)
+        ctx["approved"], ctx["approved_more"] = _section(events["approved"], "approved_at", mark)
+        if ctx["submitted"] or ctx["approved"]:
+            mail.append(OutboundEmail(subject=f"Your {settings.SITE_NAME} digest", to=[user.email],
+                                      body=render_to_string("journal/partials/digest_email.txt", ctx)))
+
+    with transaction.atomic():
+        enqueue_many(mail)
+        DigestWatermark.objects.bulk_create(
+            [DigestWatermark(user_id=user_id, sent_until=now) for user_id in recipients],
+            update_conflicts=True, unique_fields=["user"], update_fields=["sent_until"])
+    stats["mails"] = len(mail)
+    return stats
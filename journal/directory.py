@@ -0,0 +1,77 @@
+"""
+Member directory search (the members page autocomplete).
+
+Every word of a member's username, first/last name, display/full/pet name
+and nicknames is normalized (casefolded, accents stripped) and stored as a
+MemberNameToken row per org they belong to. A query such as "jo sm" then
+needs, for each word, one range scan of the (org, token) unique index --
+token LIKE 'jo%' -- instead of scanning users or splitting nickname text.
+Every word has to match some token of the same member.
+
+journal.signals re-tokenizes a user when their User, UserProfile or
+memberships change; `manage.py reindex_member_names` backfills.
+"""
+import re
+import unicodedata
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import MemberNameToken, Membership, UserProfile
+
+TOKEN_MAX = 64
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text):
+    """Lower-case, accent-free words of `text`."""
+    text = unicodedata.normalize("NFKD", text or "").casefold()
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return [w[:TOKEN_MAX] for w in _WORD.findall(text)]
+
+
+def name_tokens(user, profile=None):
+    parts = [user.get_username(), user.first_name, user.last_name]
+    if profile is not None:
+        parts += [profile.display_name, profile.full_name, profile.pet_name, *profile.nicknames_list]
+    tokens = set()
+    for part in parts:
+        tokens.update(normalize(part))
+    return tokens
+
+
+def reindex_users(user_ids):
+    """Rebuild the tokens of these users in every org they belong to."""
+    user_ids = list(user_ids)
+    users = get_user_model().objects.filter(pk__in=user_ids).only("username", "first_name", "last_name")
+    profiles = {p.user_id: p for p in UserProfile.objects.filter(user_id__in=user_ids)
+                .only("user_id", "display_name", "full_name", "pet_name", "nicknames")}
+    orgs = {}
+    for user_id, org_id in Membership.objects.filter(user_id__in=user_ids).values_list("user_id", "org_id"):
+        orgs.setdefault(user_id, []).append(org_id)
+
+    rows = [MemberNameToken(org_id=org_id, user_id=user.pk, token=token)
+            for user in users
+            for token in name_tokens(user, profiles.get(user.pk))
+            for org_id in orgs.get(user.pk, ())]
+    with transaction.atomic():
+        MemberNameToken.objects.filter(user_id__in=user_ids).delete()
+        MemberNameToken.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def reindex_user(user_id):
+    return reindex_users([user_id])
+
+
+def search_members(org, query, limit=10):
+    """Memberships of `org` whose names have a token starting with each word of `query`."""
+    words = normalize(query)
+    if not words:
+        return []
+    qs = Membership.objects.filter(org=org)
+    for word in dict.fromkeys(words):
+        qs = qs.filter(user_id__in=MemberNameToken.objects
+                       .filter(org=org, token__startswith=word).values("user_id"))
+    return list(qs.select_related("user", "user__profile")
+                .order_by("user__username")[:limit])
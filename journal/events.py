@@ -0,0 +1,118 @@
+"""
+Per-org live events for the review queue (served as SSE by views_events).
+
+- "local" backend (dev): in-process fan-out to asyncio queues. Only reaches
+  subscribers in the same process, which is all runserver/uvicorn --reload has.
+- "redis" backend (prod): Redis pub/sub on one channel per org, so an event
+  published by any web/Celery worker reaches every connected moderator.
+
+Events are small JSON dicts ({"kind": ..., "ids": [...]}); subscribers render
+their own HTML, so nothing user-specific (CSRF tokens) crosses the wire.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+
+SUBMITTED = "submitted"  # entries entered the queue
+REVIEWED = "reviewed"    # entries left the queue (approved / sent back)
+
+
+def _channel(org_id):
+    return f"journal:events:org:{org_id}"
+
+
+def _heartbeat():
+    return getattr(settings, "SSE_HEARTBEAT_SECONDS", 15)
+
+
+class LocalBroker:
+    def __init__(self):
+        self._subs = defaultdict(set)  # org_id -> {(loop, queue)}
+        self._lock = threading.Lock()
+
+    def publish(self, org_id, event):
+        with self._lock:
+            subs = list(self._subs.get(org_id, ()))
+        for loop, queue in subs:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:  # subscriber's loop already closed
+                pass
+
+    async def subscribe(self, org_id):
+        sub = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subs[org_id].add(sub)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(sub[1].get(), _heartbeat())
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subs[org_id].discard(sub)
+                if not self._subs[org_id]:
+                    del self._subs[org_id]
+
+
+class RedisBroker:
+    def __init__(self, url):
+        self.url = url
+        self._client = None
+
+    def publish(self, org_id, event):
+        import redis
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        try:
+            self._client.publish(_channel(org_id), json.dumps(event))
+        except redis.RedisError:  # live updates are best-effort; the page still works
+            log.warning("could not publish %s for org %s", event.get("kind"), org_id, exc_info=True)
+
+    async def subscribe(self, org_id):
+        import redis.asyncio as aioredis
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(_channel(org_id))
+        try:
+            while True:
+                msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_heartbeat())
+                yield json.loads(msg["data"]) if msg else None
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+
+
+def broker():
+    global _broker
+    if _broker is None:
+        if getattr(settings, "EVENTS_BACKEND", "local") == "redis":
+            _broker = RedisBroker(settings.EVENTS_REDIS_URL)
+        else:
+            _broker = LocalBroker()
+    return _broker
+
+
+def publish(org_id, kind, ids):
+    """Announce `kind` for entry `ids` in org `org_id` once the transaction commits."""
+    ids = [int(i) for i in ids]
+    if ids:
+        event = {"kind": kind, "ids": ids}
+        transaction.on_commit(lambda: broker().publish(org_id, event))
+
+
+def subscribe(org_id):
+    """Async iterator of events for `org_id`; yields None every heartbeat with no traffic."""
+    return broker().subscribe(org_id)
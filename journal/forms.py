@@ -1,5 +1,6 @@
 
 from django import forms
+from django.conf import settings
 from django.forms import inlineformset_factory
 from django.contrib.auth import get_user_model
 
@@ -7,6 +8,7 @@ from .models import (
     Entry, Tab, Membership, Invite,
     UserProfile, SocialLink, ProfileImage, CustomField
 )
+from .invites import parse_recipients
 
 User = get_user_model()
 
@@ -16,6 +18,17 @@ User = get_user_model()
 class MultiFileInput(forms.ClearableFileInput):
     allow_multiple_selected = True
 
+class MultipleFileField(forms.FileField):
+    """FileField that accepts (and cleans) every file from a MultiFileInput."""
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("widget", MultiFileInput(attrs={"multiple": True}))
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        if isinstance(data, (list, tuple)):
+            return [super(MultipleFileField, self).clean(d, initial) for d in data]
+        return super().clean(data, initial)
+
 ROLE_CHOICES = [
     ("MODERATOR", "Moderator"),
     ("AUTHOR", "Author"),
@@ -26,7 +39,7 @@ ROLE_CHOICES = [
 # Entries / Tabs
 # -----------------------
 class EntryForm(forms.ModelForm):
-    images = forms.FileField(required=False, widget=MultiFileInput(attrs={"multiple": True}))
+    images = MultipleFileField(required=False)
     tabs = forms.ModelMultipleChoiceField(queryset=Tab.objects.all(), required=False)
 
     class Meta:
@@ -83,6 +96,23 @@ class InviteForm(forms.Form):
             self.add_error("phone", "Phone required.")
         return data
 
+class BulkInviteForm(forms.Form):
+    recipients = forms.CharField(
+        widget=forms.Textarea(attrs={"rows": 4, "class": "form-control"}),
+        help_text="Emails and/or E.164 phone numbers, separated by commas or new lines.",
+    )
+    role = forms.ChoiceField(choices=ROLE_CHOICES, initial="AUTHOR")
+
+    def clean_recipients(self):
+        found, bad = parse_recipients(self.cleaned_data["recipients"])
+        if bad:
+            raise forms.ValidationError("Not an email or E.164 number: %s" % ", ".join(bad[:10]))
+        if not found:
+            raise forms.ValidationError("Add at least one recipient.")
+        if len(found) > settings.INVITE_BULK_MAX:
+            raise forms.ValidationError(f"At most {settings.INVITE_BULK_MAX} recipients at a time.")
+        return found
+
 class AcceptInviteForm(forms.Form):
     username = forms.CharField(max_length=150)
     password = forms.CharField(widget=forms.PasswordInput)
@@ -0,0 +1,55 @@
+"""
+Rendered-fragment cache for entry cards and entry-detail bodies.
+
+An approved entry renders the same for every viewer, so the HTML is cached
+under (kind, entry id, updated_at): any edit yields a new key and old ones
+simply age out. Tab/image changes touch updated_at (journal.signals) for the
+same effect. Fragments live in the "fragments" cache alias, a size-bounded
+LRU (LocMemCache MAX_ENTRIES), falling back to "default" if it isn't defined.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .caching import bump
+
+FRAGMENT_CACHE = "entry_fragments"
+
+TEMPLATES = {
+    "card": "journal/partials/entry_card.html",
+    "body": "journal/partials/entry_body.html",
+}
+
+
+def _store():
+    return caches["fragments" if "fragments" in settings.CACHES else "default"]
+
+
+def _key(kind, entry):
+    return f"journal:frag:{kind}:{entry.pk}:{entry.updated_at.timestamp()}"
+
+
+def render_entries(kind, entries):
+    """Return [(entry, html)] for `entries`, rendering only cache misses."""
+    store = _store()
+    keys = {e.pk: _key(kind, e) for e in entries}
+    found = store.get_many(list(keys.values()))
+
+    out, fresh = [], {}
+    for e in entries:
+        html = found.get(keys[e.pk])
+        if html is None:
+            html = render_to_string(TEMPLATES[kind], {"e": e})
+            fresh[keys[e.pk]] = html
+        out.append((e, mark_safe(html)))
+
+    if fresh:
+        store.set_many(fresh, getattr(settings, "FRAGMENT_CACHE_TTL", 86400))
+    bump(FRAGMENT_CACHE, "hits", len(entries) - len(fresh))
+    bump(FRAGMENT_CACHE, "misses", len(fresh))
+    return out
+
+
+def render_entry(kind, entry):
+    return render_entries(kind, [entry])[0][1]
@@ -0,0 +1,109 @@
+"""
+Management hierarchy (Membership.managed_by) queries.
+
+managed_by only links a member to their direct manager, so "everyone under
+X" used to mean one query per level. ManagementPath keeps the transitive
+closure per org instead: a row for every (manager at any depth, member)
+pair. "All descendants of X" is then one range scan of the
+(ancestor, descendant, org) unique index and "is X above Y" a single
+lookup in it.
+
+journal.signals calls set_manager() whenever a membership is created, gets
+a new manager or is deleted; moving a member moves their whole subtree.
+`manage.py rebuild_management_paths` rebuilds everything from managed_by.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import ManagementPath, Membership
+
+
+def descendant_ids(org, user):
+    """Subquery of the user ids managed, at any depth, by `user` in `org`."""
+    return (ManagementPath.objects.filter(ancestor=user, org=org)
+            .values("descendant_id"))
+
+
+def descendant_ids_anywhere(user):
+    """Subquery of the user ids `user` manages, at any depth, in any org."""
+    return ManagementPath.objects.filter(ancestor=user).values("descendant_id")
+
+
+def descendants(org, user):
+    """Memberships of `org` managed, directly or not, by `user`."""
+    return Membership.objects.filter(org=org, user_id__in=descendant_ids(org, user))
+
+
+def is_ancestor(ancestor, descendant, org=None):
+    """Does `ancestor` manage `descendant`, at any depth (in `org`, or in any org)?"""
+    qs = ManagementPath.objects.filter(ancestor=ancestor, descendant=descendant)
+    if org is not None:
+        qs = qs.filter(org=org)
+    return qs.exists()
+
+
+def check_manager(org_id, user_id, manager_id):
+    """Raise ValidationError if `manager_id` managing `user_id` would make a cycle."""
+    if manager_id is None:
+        return
+    if manager_id == user_id or is_ancestor(user_id, manager_id, org_id):
+        raise ValidationError("A member can't be managed by someone they manage.")
+
+
+def set_manager(org_id, user_id, manager_id):
+    """
+    Re-hang `user_id` and everyone under them below `manager_id` (None:
+    no manager). Paths inside the subtree are kept; paths from the old
+    manager chain are dropped and the new chain is joined on.
+    """
+    check_manager(org_id, user_id, manager_id)
+    below = [(user_id, 0), *ManagementPath.objects.filter(ancestor_id=user_id, org_id=org_id)
+             .values_list("descendant_id", "depth")]
+    below_ids = [pk for pk, _ in below]
+    with transaction.atomic():
+        (ManagementPath.objects.filter(descendant_id__in=below_ids, org_id=org_id)
+         .exclude(ancestor_id__in=below_ids).delete())
+        if manager_id is None:
+            return
+        above = [(manager_id, 1), *((pk, depth + 1) for pk, depth in
+                                    ManagementPath.objects.filter(descendant_id=manager_id, org_id=org_id)
+                                    .values_list("ancestor_id", "depth"))]
+        ManagementPath.objects.bulk_create(
+            [ManagementPath(org_id=org_id, ancestor_id=a, descendant_id=d, depth=da + dd)
+             for a, da in above for d, dd in below],
+            batch_size=1000)
+
+
+def forget_member(org_id, user_id):
+    """A membership was deleted: it has no manager any more (its subusers keep theirs)."""
+    set_manager(org_id, user_id, None)
+
+
+def paths_for(parents):
+    """
+    Closure rows for {(org_id, user_id): manager_id}, following each chain
+    upwards; a cycle already in the data is cut where it repeats.
+    """
+    rows = []
+    for (org_id, user_id), manager_id in parents.items():
+        depth, seen = 1, {user_id}
+        while manager_id is not None and manager_id not in seen:
+            rows.append(ManagementPath(org_id=org_id, ancestor_id=manager_id,
+                                       descendant_id=user_id, depth=depth))
+            seen.add(manager_id)
+            manager_id = parents.get((org_id, manager_id))
+            depth += 1
+    return rows
+
+
+def rebuild(org=None):
+    """Recompute the closure from managed_by (all orgs, or one); returns the row count."""
+    memberships = Membership.objects.all() if org is None else Membership.objects.filter(org=org)
+    parents = {(org_id, user_id): manager_id for org_id, user_id, manager_id
+               in memberships.values_list("org_id", "user_id", "managed_by_id")}
+    rows = paths_for(parents)
+    paths = ManagementPath.objects.all() if org is None else ManagementPath.objects.filter(org=org)
+    with transaction.atomic():
+        paths.delete()
+        ManagementPath.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,170 @@
+"""
+Resized derivatives ("variants") of uploaded images.
+
+Phones upload 8-12 MB originals; pages should not ship them. After an upload
+commits, journal.tasks.build_image_variants writes each width in
+IMAGE_VARIANT_WIDTHS as WebP and JPEG next to the original and records them
+in the model's variants JSON:
+
+    {"src": <original name>, "width": W, "height": H,
+     "webp": [[w, h, name], ...], "jpeg": [[w, h, name], ...]}
+
+Templates use them through {% responsive_img %}. Until they land (or if the
+original is replaced, making "src" stale) the original is served as before.
+"""
+import io
+import logging
+import math
+import os
+
+from django.conf import settings
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+log = logging.getLogger(__name__)
+
+# model label -> (image field, variants field)
+TARGETS = {
+    "journal.entryimage": ("image", "variants"),
+    "journal.profileimage": ("image", "variants"),
+    "journal.userprofile": ("profile_pic", "profile_pic_variants"),
+}
+
+FORMATS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+_ROTATED = {5, 6, 7, 8}  # EXIF orientations that swap width/height
+
+
+def widths():
+    return sorted(getattr(settings, "IMAGE_VARIANT_WIDTHS", (320, 640, 1280)))
+
+
+def fields_for(obj):
+    return TARGETS[obj._meta.label_lower]
+
+
+def ready_variants(obj):
+    """The variants dict if it matches the current file, else {}."""
+    field, attr = fields_for(obj)
+    f, variants = getattr(obj, field), getattr(obj, attr) or {}
+    if f and variants.get("src") == f.name:
+        return variants
+    return {}
+
+
+def needs_variants(obj):
+    field, _ = fields_for(obj)
+    return bool(getattr(obj, field)) and not ready_variants(obj)
+
+
+def variant_name(name, width, ext):
+    stem, _ = os.path.splitext(name)
+    return f"{stem}.w{width}.{ext}"
+
+
+def _flatten(img):
+    """RGB copy for JPEG; transparent areas become white instead of black."""
+    if img.mode == "RGBA":
+        bg = Image.new("RGB", img.size, "white")
+        bg.paste(img, mask=img.getchannel("A"))
+        return bg
+    return img.convert("RGB")
+
+
+def build_variants(fieldfile):
+    """Write the resized copies of `fieldfile` and return its variants dict."""
+    storage = fieldfile.storage
+    out = {"src": fieldfile.name, "webp": [], "jpeg": []}
+    with fieldfile.open("rb") as fh:
+        img = Image.open(fh)
+        ow, oh = img.size
+        if img.getexif().get(0x0112) in _ROTATED:
+            ow, oh = oh, ow
+        targets = [w for w in widths() if w < ow]
+        if targets:
+            # JPEG decodes at a reduced DCT scale, never below the largest target
+            scale = targets[-1] / ow
+            img.draft("RGB", (math.ceil(img.size[0] * scale), math.ceil(img.size[1] * scale)))
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+        out.update(width=ow, height=oh)
+        for w in targets:
+            h = max(1, round(oh * w / ow))
+            resized = img.resize((w, h), Image.LANCZOS)
+            for key, fmt, opts in FORMATS:
+                buf = io.BytesIO()
+                (resized if key == "webp" else _flatten(resized)).save(buf, fmt, **opts)
+                buf.seek(0)
+                name = storage.save(variant_name(fieldfile.name, w, key), buf)
+                out[key].append([w, h, name])
+    return out
+
+
+def delete_variants(storage, variants):
+    for key, _, _ in FORMATS:
+        for _, _, name in variants.get(key, ()):
+            storage.delete(name)
+
+
+def _shared_variants(obj):
+    """Variants already built for another row holding the same (deduplicated) file."""
+    field, attr = fields_for(obj)
+    f = getattr(obj, field)
+    if not getattr(f.storage, "content_addressed", False):
+        return None
+    return (type(obj).objects
+            .filter(**{field: f.name, f"{attr}__src": f.name})
+            .exclude(pk=obj.pk)
+            .values_list(attr, flat=True)
+            .first())
+
+
+def refresh_variants(obj):
+    """(Re)build obj's variants in place; unreadable files are recorded, not retried."""
+    field, attr = fields_for(obj)
+    f = getattr(obj, field)
+    if not f or ready_variants(obj):
+        return
+    old = getattr(obj, attr) or {}
+    variants = _shared_variants(obj)
+    if variants is None:
+        try:
+            variants = build_variants(f)
+        except UnidentifiedImageError:
+            variants = {"src": f.name, "error": "unreadable"}
+    # deduplicated files share their variants; journal.storage removes them with the blob
+    if old and not getattr(f.storage, "content_addressed", False):
+        delete_variants(f.storage, old)
+    setattr(obj, attr, variants)
+    obj.save(update_fields=[attr])
+
+
+def _queue(task, *args):
+    def send():
+        try:
+            task.delay(*args)
+        except Exception:  # broker down: the original keeps being served
+            log.warning("could not queue %s%r", task.name, args, exc_info=True)
+
+    transaction.on_commit(send)
+
+
+def schedule(obj):
+    """Queue variant generation once the current transaction commits."""
+    from .tasks import build_image_variants
+    _queue(build_image_variants, obj._meta.label_lower, obj.pk)
+
+
+def schedule_entry(entry_id):
+    """Same, for every image of an entry (rows made by bulk_create)."""
+    from .tasks import build_entry_image_variants
+    _queue(build_entry_image_variants, entry_id)
+
+
+def srcset(storage, variants, key):
+    return ", ".join(f"{storage.url(name)} {w}w" for w, _, name in variants.get(key, ()))
@@ -0,0 +1,131 @@
+"""
+Invite delivery: message text, plus queueing the send onto Celery so no
+request waits on SMTP or Twilio. journal.tasks.deliver_invite does the send
+and records the outcome on the Invite (delivery_status & co).
+
+Bulk invites (start_campaign) insert every Invite with one bulk_create and
+hand the campaign to journal.tasks.send_invite_campaign, which sends
+INVITE_BATCH_SIZE at a time (email via journal.mail_queue, SMS over one
+client) and waits INVITE_BATCH_INTERVAL_SECONDS between batches.
+"""
+import logging
+import re
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Count, Q
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from .models import Invite, InviteCampaign
+
+log = logging.getLogger(__name__)
+
+
+def invite_message(inv, accept_url):
+    """(subject, body) for an invite; subject is unused for SMS."""
+    if inv.delivery == "email":
+        body = render_to_string("journal/partials/invite_email.txt", {"org": inv.org, "accept_url": accept_url})
+        return f"You're invited to {inv.org.name}", body
+    return "", f"Join {inv.org.name}: {accept_url}"
+
+
+def queue_delivery(inv, accept_url):
+    """Send `inv` from a worker once the current transaction commits."""
+    from .tasks import deliver_invite
+
+    def send():
+        try:
+            deliver_invite.delay(inv.pk, accept_url)
+        except Exception as exc:  # broker down: say so on the invite rather than pretend
+            log.warning("could not queue invite %s", inv.pk, exc_info=True)
+            Invite.objects.filter(pk=inv.pk).update(
+                delivery_status=Invite.Delivery.FAILED, delivery_error=f"Not queued: {exc}"[:255])
+
+    transaction.on_commit(send)
+
+
+def accept_url(base_url, inv):
+    return base_url + reverse("journal:invite_accept", args=[inv.token])
+
+
+PHONE_RE = re.compile(r"^\+[1-9]\d{6,14}$")  # E.164
+
+
+def parse_recipients(text):
+    """
+    Split pasted recipients (commas, semicolons or newlines) into
+    ([("email"|"sms", address)], [bad items]); duplicates are dropped.
+    """
+    found, bad, seen = [], [], set()
+    for item in re.split(r"[\n,;]+", text or ""):
+        item = item.strip()
+        if not item:
+            continue
+        if "@" in item:
+            try:
+                validate_email(item)
+            except ValidationError:
+                bad.append(item)
+                continue
+            kind, address = "email", item.lower()
+        else:
+            address = re.sub(r"[\s()\-.]", "", item)
+            if not PHONE_RE.match(address):
+                bad.append(item)
+                continue
+            kind = "sms"
+        if address not in seen:
+            seen.add(address)
+            found.append((kind, address))
+    return found, bad
+
+
+def start_campaign(*, org, role, created_by, recipients, base_url):
+    """Create a campaign and all its invites in one insert; sending starts after commit."""
+    from .tasks import send_invite_campaign
+
+    with transaction.atomic():
+        campaign = InviteCampaign.objects.create(org=org, role=role, created_by=created_by,
+                                                 total=len(recipients))
+        Invite.objects.bulk_create(
+            [Invite.build(org=org, role=role, created_by=created_by, campaign=campaign, delivery=kind,
+                          email=address if kind == "email" else "", phone=address if kind == "sms" else "")
+             for kind, address in recipients],
+            batch_size=500)
+
+        def send():
+            try:
+                send_invite_campaign.delay(campaign.pk, base_url)
+            except Exception as exc:
+                log.warning("could not queue invite campaign %s", campaign.pk, exc_info=True)
+                campaign.invites.filter(delivery_status=Invite.Delivery.QUEUED).update(
+                    delivery_status=Invite.Delivery.FAILED, delivery_error=f"Not queued: {exc}"[:255])
+
+        transaction.on_commit(send)
+    return campaign
+
+
+def campaign_progress(org, limit=5):
+    """
+    Recent campaigns with per-status counts (`.pending` is queued + retrying)
+    -- one query, polled while anything is pending; recipients are loaded
+    separately (campaign_recipients) when a campaign is opened.
+    """
+    D = Invite.Delivery
+    campaigns = list(
+        InviteCampaign.objects.filter(org=org)
+        .annotate(sent=Count("invites", filter=Q(invites__delivery_status=D.SENT)),
+                  failed=Count("invites", filter=Q(invites__delivery_status=D.FAILED)),
+                  pending=Count("invites", filter=Q(invites__delivery_status__in=[D.QUEUED, D.RETRYING])))
+        [:limit])
+    for c in campaigns:
+        c.percent = round(100 * (c.sent + c.failed) / c.total) if c.total else 100
+    return campaigns
+
+
+def campaign_recipients(campaign):
+    """The campaign's invites with their delivery status, for its expanded row."""
+    return (campaign.invites.only("campaign", "email", "phone", "delivery_status", "delivery_error")
+            .order_by("pk"))
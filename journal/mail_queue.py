@@ -0,0 +1,160 @@
+"""
+Outbound email queue (journal.tasks.flush_mail_queue).
+
+send_mail() opens a fresh SMTP connection for every message. Callers here
+enqueue() an OutboundEmail row instead; the first enqueue in a window
+schedules a flush MAIL_BATCH_WINDOW_SECONDS later, which claims up to
+MAIL_BATCH_SIZE pending rows and sends them all over one get_connection()
+session. A connection-level failure puts the unsent rest of the batch back
+(the task retries with backoff); a message the server rejects (refused
+recipients, too large, ...) fails on its own. After MAIL_MAX_ATTEMPTS a message is marked failed.
+
+Rows tied to an invite mirror their outcome onto Invite.delivery_status.
+A beat job flushes every minute too, so nothing waits on a lost schedule.
+"""
+import logging
+import smtplib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Invite, OutboundEmail
+
+log = logging.getLogger(__name__)
+
+FLUSH_KEY = "mail-queue:flush-scheduled"
+STALE_CLAIM = timedelta(minutes=10)  # claimed by a worker that died mid-batch
+SERVICE_CLOSING = 421  # the server is ending the session, not judging the message
+
+
+class MailTransportError(Exception):
+    """The SMTP session failed; the unsent part of the batch was requeued."""
+
+
+def enqueue(subject, body, to, *, from_email="", invite=None):
+    msg = OutboundEmail(subject=subject, body=body, to=list(to), from_email=from_email, invite=invite)
+    return enqueue_many([msg])[0]
+
+
+def enqueue_many(messages):
+    """Insert unsaved OutboundEmail rows at once; a flush is scheduled on commit."""
+    OutboundEmail.objects.bulk_create(messages, batch_size=500)
+    transaction.on_commit(schedule_flush)
+    return messages
+
+
+def schedule_flush():
+    """Queue one flush per window, however many messages arrive in it."""
+    from .tasks import flush_mail_queue
+
+    window = settings.MAIL_BATCH_WINDOW_SECONDS
+    if not cache.add(FLUSH_KEY, 1, window + 30):
+        return
+    try:
+        flush_mail_queue.apply_async(countdown=window)
+    except Exception:  # broker down: the beat flush picks these up
+        cache.delete(FLUSH_KEY)
+        log.warning("could not schedule a mail flush", exc_info=True)
+
+
+def _claim(limit):
+    S = OutboundEmail.Status
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(OutboundEmail.objects.select_for_update(skip_locked=True)
+                   .filter(Q(status=S.PENDING) | Q(status=S.SENDING, claimed_at__lt=now - STALE_CLAIM))
+                   .order_by("created_at").values_list("pk", flat=True)[:limit])
+        OutboundEmail.objects.filter(pk__in=ids).update(status=S.SENDING, claimed_at=now)
+    return list(OutboundEmail.objects.filter(pk__in=ids).order_by("created_at"))
+
+
+def _record(sent, refused, unsent, error):
+    S, D = OutboundEmail.Status, Invite.Delivery
+    now = timezone.now()
+    for msg in sent:
+        msg.attempts += 1
+        msg.status, msg.error, msg.sent_at = S.SENT, "", now
+    for msg, reason in refused:
+        msg.attempts += 1
+        msg.status, msg.error = S.FAILED, reason[:255]
+    for msg in unsent:
+        msg.attempts += 1
+        msg.status = S.FAILED if msg.attempts >= settings.MAIL_MAX_ATTEMPTS else S.PENDING
+        msg.error = str(error)[:255]
+    batch = sent + [m for m, _ in refused] + unsent
+    OutboundEmail.objects.bulk_update(batch, ["status", "error", "attempts", "sent_at"])
+
+    sent_invites = [m.invite_id for m in sent if m.invite_id]
+    if sent_invites:
+        Invite.objects.filter(pk__in=sent_invites).update(
+            delivery_status=D.SENT, delivery_error="", delivered_at=now,
+            delivery_attempts=F("delivery_attempts") + 1)
+    for msg in batch:
+        if msg.invite_id and msg.status != S.SENT:
+            Invite.objects.filter(pk=msg.invite_id).update(
+                delivery_status=D.FAILED if msg.status == S.FAILED else D.RETRYING,
+                delivery_error=msg.error, delivery_attempts=F("delivery_attempts") + 1)
+
+
+def flush(batch_size=None):
+    """
+    Send one batch of pending mail over a single connection. Returns stats
+    with per-batch timings (connect_ms, send_ms); raises MailTransportError
+    after requeueing if the session broke.
+    """
+    batch = _claim(batch_size or settings.MAIL_BATCH_SIZE)
+    stats = {"batch": len(batch), "sent": 0, "refused": 0, "requeued": 0, "connect_ms": 0.0, "send_ms": 0.0}
+    if not batch:
+        return stats
+
+    sent, refused, error = [], [], None
+    started = time.monotonic()
+    connection = get_connection()
+    try:
+        connection.open()
+        connected = time.monotonic()
+        stats["connect_ms"] = round((connected - started) * 1000, 1)
+        for msg in batch:
+            email = EmailMessage(msg.subject, msg.body, msg.from_email or settings.DEFAULT_FROM_EMAIL,
+                                 msg.to, connection=connection)
+            try:
+                email.send()
+            except smtplib.SMTPRecipientsRefused as exc:
+                refused.append((msg, str(exc)))
+            except smtplib.SMTPResponseException as exc:
+                if exc.smtp_code == SERVICE_CLOSING:
+                    raise
+                # this message only (552 too large, sender refused, ...): go on with the batch
+                reason = exc.smtp_error
+                if isinstance(reason, bytes):
+                    reason = reason.decode(errors="replace")
+                refused.append((msg, f"{exc.smtp_code} {reason}"))
+            else:
+                sent.append(msg)
+        stats["send_ms"] = round((time.monotonic() - connected) * 1000, 1)
+    except (smtplib.SMTPException, OSError) as exc:
+        error = exc
+    except Exception as exc:
+        # not a transport problem, but don't leave the batch claimed: a stale
+        # claim would be re-sent whole, including what already went out
+        error = exc
+    finally:
+        connection.close()
+
+    done = {m.pk for m in sent} | {m.pk for m, _ in refused}
+    unsent = [m for m in batch if m.pk not in done]
+    _record(sent, refused, unsent, error)
+    stats.update(sent=len(sent), refused=len(refused), requeued=len(unsent))
+    log.info("mail batch: %(sent)d sent, %(refused)d refused, %(requeued)d requeued "
+             "(connect %(connect_ms)sms, send %(send_ms)sms)", stats)
+    if isinstance(error, (smtplib.SMTPException, OSError)):
+        raise MailTransportError(str(error)) from error
+    if error is not None:
+        raise error
+    return stats
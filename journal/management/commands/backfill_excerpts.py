@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from journal.models import Entry
+
+class Command(BaseCommand):
+    help = "Fill Entry.excerpt / Entry.word_count for rows saved before they existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--all", action="store_true",
+                            help="Recompute every entry, not just ones with an empty excerpt.")
+
+    def handle(self, *args, **opts):
+        size = opts["batch_size"]
+        qs = Entry.objects.only("id", "body").order_by("id")
+        if not opts["all"]:
+            qs = qs.filter(excerpt="").exclude(body="")
+
+        done, last_id = 0, 0
+        while True:
+            # keyset batches: bounded memory, no growing OFFSET
+            batch = list(qs.filter(id__gt=last_id)[:size])
+            if not batch:
+                break
+            for e in batch:
+                e.excerpt, e.word_count = Entry.make_excerpt(e.body)
+            Entry.objects.bulk_update(batch, ["excerpt", "word_count"])
+            done += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {done} entries"))
@@ -0,0 +1,28 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from journal.images import TARGETS, needs_variants, refresh_variants
+from journal.tasks import build_image_variants
+
+class Command(BaseCommand):
+    help = "Queue (or build with --sync) resized variants for images uploaded before they existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sync", action="store_true",
+                            help="Resize in this process instead of queueing Celery tasks.")
+
+    def handle(self, *args, **opts):
+        total = 0
+        for label, (field, attr) in TARGETS.items():
+            model = apps.get_model(label)
+            qs = model.objects.exclude(**{field: ""}).exclude(**{f"{field}__isnull": True})
+            for obj in qs.only("pk", field, attr).iterator(chunk_size=500):
+                if not needs_variants(obj):
+                    continue
+                if opts["sync"]:
+                    refresh_variants(obj)
+                else:
+                    build_image_variants.delay(label, obj.pk)
+                total += 1
+
+        verb = "Built" if opts["sync"] else "Queued"
+        self.stdout.write(self.style.SUCCESS(f"{verb} variants for {total} images"))
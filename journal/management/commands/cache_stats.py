@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from journal.caching import MEMBERSHIP_CACHE, cache_stats, reset_stats
+from journal.fragments import FRAGMENT_CACHE
+from journal.profiles import PROFILE_CACHE
+
+CACHES = [MEMBERSHIP_CACHE, FRAGMENT_CACHE, PROFILE_CACHE]
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters for the journal caches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after printing.")
+
+    def handle(self, *args, **opts):
+        for name in CACHES:
+            s = cache_stats(name)
+            self.stdout.write(f"{name}: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.1%} hit rate)")
+            if opts["reset"]:
+                reset_stats(name)
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+from journal.media_gc import collect, purge_quarantine
+
+class Command(BaseCommand):
+    help = "Delete (or quarantine) media files no row references any more."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed.")
+        parser.add_argument("--delete", action="store_true",
+                            help="Delete orphans outright instead of moving them to the quarantine folder.")
+        parser.add_argument("--grace-hours", type=int, default=settings.MEDIA_GC_GRACE_HOURS,
+                            help="Leave files younger than this alone (uploads in flight).")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--verbose-files", action="store_true", help="List every orphan.")
+
+    def handle(self, *args, **opts):
+        dry = opts["dry_run"]
+        log = (lambda name, size: self.stdout.write(f"  {name} ({filesizeformat(size)})")) \
+            if opts["verbose_files"] else None
+        stats = collect(dry_run=dry, quarantine=not opts["delete"], grace_hours=opts["grace_hours"],
+                        batch_size=opts["batch_size"], log=log)
+        purged = purge_quarantine(settings.MEDIA_GC_QUARANTINE_DAYS, dry_run=dry)
+
+        verb = "Would reclaim" if dry else ("Quarantined" if stats["quarantine"] else "Reclaimed")
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {stats['scanned']} files, {stats['orphans']} orphans. "
+            f"{verb} {filesizeformat(stats['bytes'])}"
+            + (f" (in {stats['quarantine']})" if stats["quarantine"] else "")
+            + (f"; purged {filesizeformat(purged)} of old quarantine" if purged else "")))
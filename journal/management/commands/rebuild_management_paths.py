@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from journal.hierarchy import rebuild
+from journal.models import Organization
+
+class Command(BaseCommand):
+    help = "Rebuild the managed_by closure table (journal.hierarchy) from memberships."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, help="Only this organization id.")
+
+    def handle(self, *args, **opts):
+        org = Organization.objects.get(pk=opts["org"]) if opts["org"] else None
+        rows = rebuild(org)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} management paths"))
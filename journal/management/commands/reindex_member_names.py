@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from journal.directory import reindex_users
+
+class Command(BaseCommand):
+    help = "Rebuild the member directory name tokens (journal.directory) for every user."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        ids = get_user_model().objects.order_by("pk").values_list("pk", flat=True)
+        batch, users, tokens = [], 0, 0
+        for pk in ids.iterator(chunk_size=opts["batch_size"]):
+            batch.append(pk)
+            if len(batch) == opts["batch_size"]:
+                tokens += reindex_users(batch)
+                users += len(batch)
+                batch = []
+        if batch:
+            tokens += reindex_users(batch)
+            users += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {tokens} name tokens for {users} users"))
@@ -0,0 +1,138 @@
+"""
+Orphaned media collection (manage.py gc_media, or the optional beat job).
+
+Walks the upload trees under MEDIA_ROOT (MEDIA_GC_ROOTS) as a stream,
+checks each batch of file names against the rows that reference them with
+indexed IN lookups, and deletes -- or moves to a dated quarantine folder --
+every file nothing points at. Memory stays bounded by the batch size, not
+by the size of the tree.
+
+A resized variant ("<stem>.w320.webp", see journal.images) is kept exactly
+as long as its original is. Files younger than MEDIA_GC_GRACE_HOURS are
+skipped: an upload is written before its row commits.
+"""
+import os
+import re
+import shutil
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+
+from .models import EntryImage, MediaBlob, ProfileImage, UserProfile
+from .uploads import IMAGE_EXTENSIONS
+
+QUARANTINE_DIR = ".quarantine"
+_VARIANT = re.compile(r"^(?P<stem>.+)\.w\d+\.(webp|jpeg)$")
+
+
+def _walk(root):
+    """Yield (relative name, size, mtime) for every file under root, depth-first."""
+    base = settings.MEDIA_ROOT
+    stack = [os.path.join(base, root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.is_file(follow_symlinks=False):
+                    st = e.stat(follow_symlinks=False)
+                    yield os.path.relpath(e.path, base).replace(os.sep, "/"), st.st_size, st.st_mtime
+
+
+def _candidates(name):
+    """Stored names that would keep `name` alive: itself, or the original of a variant."""
+    yield name
+    m = _VARIANT.match(name)
+    if m:
+        for ext in IMAGE_EXTENSIONS:
+            yield f"{m['stem']}.{ext}"
+            yield f"{m['stem']}.{ext.upper()}"
+
+
+def _referenced(names):
+    cands = {c for n in names for c in _candidates(n)}
+    found = set(EntryImage.objects.filter(image__in=cands).values_list("image", flat=True))
+    found |= set(ProfileImage.objects.filter(image__in=cands).values_list("image", flat=True))
+    user_ids = {int(n.split("/")[1]) for n in names
+                if n.startswith("profiles/") and n.split("/")[1].isdigit()}
+    if user_ids:
+        found |= set(UserProfile.objects.filter(user_id__in=user_ids)
+                     .exclude(profile_pic="").values_list("profile_pic", flat=True))
+    return {n for n in names if any(c in found for c in _candidates(n))}
+
+
+def _dispose(name, quarantine_to):
+    full = os.path.join(settings.MEDIA_ROOT, name)
+    if quarantine_to:
+        dest = os.path.join(quarantine_to, name)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.move(full, dest)
+    else:
+        os.unlink(full)
+
+
+def purge_quarantine(days, dry_run=False):
+    """Delete quarantine batches older than `days`; returns bytes freed."""
+    qroot = os.path.join(settings.MEDIA_ROOT, QUARANTINE_DIR)
+    if not os.path.isdir(qroot):
+        return 0
+    cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y%m%d-%H%M%S")
+    freed = 0
+    for batch in sorted(os.listdir(qroot)):
+        if batch >= cutoff:
+            continue
+        path = os.path.join(qroot, batch)
+        for _, size, _ in _walk(os.path.relpath(path, settings.MEDIA_ROOT)):
+            freed += size
+        if not dry_run:
+            shutil.rmtree(path, ignore_errors=True)
+    return freed
+
+
+def collect(*, dry_run=False, quarantine=True, grace_hours=None, batch_size=500, log=None):
+    """
+    Find (and unless dry_run, remove) unreferenced media.
+    Returns {"scanned", "orphans", "bytes", "quarantine"}.
+    """
+    grace = settings.MEDIA_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    newest = time.time() - grace * 3600
+    quarantine_to = None
+    if quarantine and not dry_run:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        quarantine_to = os.path.join(settings.MEDIA_ROOT, QUARANTINE_DIR, stamp)
+    stats = {"scanned": 0, "orphans": 0, "bytes": 0, "quarantine": quarantine_to}
+
+    def flush(batch):
+        keep = _referenced([n for n, _ in batch])
+        gone = []
+        for name, size in batch:
+            if name in keep:
+                continue
+            stats["orphans"] += 1
+            stats["bytes"] += size
+            if log:
+                log(name, size)
+            if not dry_run:
+                _dispose(name, quarantine_to)
+                gone.append(name)
+        if gone:
+            MediaBlob.objects.filter(name__in=gone).delete()  # stale counters for vanished blobs
+
+    batch = []
+    for root in settings.MEDIA_GC_ROOTS:
+        for name, size, mtime in _walk(root):
+            stats["scanned"] += 1
+            if mtime > newest:
+                continue
+            batch.append((name, size))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+    if batch:
+        flush(batch)
+    return stats
@@ -0,0 +1,133 @@
+"""
+Bulk member provisioning from CSV text (members page, "Bulk add").
+
+Columns: username, email, role, password -- a header row is optional, and
+only username is required. Every row is validated before anything is
+written; one bad row means nothing is created and the report lists each
+problem by line. Passwords are hashed in a process pool (PBKDF2 is slow on
+purpose), then users, profiles and memberships go in with bulk_create
+inside one transaction. Blank passwords give an unusable password: the
+member signs in after a reset or an invite.
+"""
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from .caching import bump_versions
+from .directory import reindex_users
+from .forms import ROLE_CHOICES
+from .models import Membership, UserProfile
+
+COLUMNS = ("username", "email", "role", "password")
+ROLES = {value for value, _ in ROLE_CHOICES}
+
+_pool = None
+
+
+def _init_worker(settings_module):
+    # workers started with spawn/forkserver need Django configured to hash
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS,
+                                    initializer=_init_worker,
+                                    initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", ""),))
+    return _pool
+
+
+def hash_passwords(passwords):
+    """make_password() for each item (None -> unusable), spread over worker processes."""
+    real = [p for p in passwords if p]
+    if len(real) < 2 or not settings.PASSWORD_HASH_WORKERS:
+        return [make_password(p or None) for p in passwords]
+    hashed = iter(_executor().map(make_password, real, chunksize=max(1, len(real) // 32)))
+    return [next(hashed) if p else make_password(None) for p in passwords]
+
+
+def parse(text):
+    """[(line_no, {column: value})] from CSV text, skipping blank lines and the header."""
+    rows = []
+    for n, cells in enumerate(csv.reader(io.StringIO(text or "")), start=1):
+        cells = [c.strip() for c in cells]
+        if not any(cells):
+            continue
+        if n == 1 and cells[0].lower() == "username":
+            continue
+        rows.append((n, dict(zip(COLUMNS, cells + [""] * (len(COLUMNS) - len(cells))))))
+    return rows
+
+
+def validate(rows):
+    """Return (clean rows, report); report is [{"line", "username", "errors"}] for bad rows only."""
+    if len(rows) > settings.MEMBER_IMPORT_MAX_ROWS:
+        return [], [{"line": 0, "username": "",
+                     "errors": [f"At most {settings.MEMBER_IMPORT_MAX_ROWS} rows per import."]}]
+    User = get_user_model()
+    username_field = User._meta.get_field("username")
+    lowered = [r["username"].lower() for _, r in rows if r["username"]]
+    taken = set(User.objects.annotate(u=Lower("username"))
+                .filter(u__in=lowered).values_list("u", flat=True))
+
+    clean, report, seen = [], [], set()
+    for line, r in rows:
+        errors = []
+        name = r["username"]
+        if not name:
+            errors.append("Username is required.")
+        else:
+            try:
+                username_field.clean(name, None)
+            except ValidationError as e:
+                errors.extend(e.messages)
+            if name.lower() in taken:
+                errors.append("Username already exists.")
+            elif name.lower() in seen:
+                errors.append("Username repeated in this import.")
+            seen.add(name.lower())
+        if r["email"]:
+            try:
+                validate_email(r["email"])
+            except ValidationError:
+                errors.append("Invalid email.")
+        role = (r["role"] or Membership.Role.AUTHOR).upper()
+        if role not in ROLES:
+            errors.append(f"Unknown role {r['role']!r}.")
+        if errors:
+            report.append({"line": line, "username": name, "errors": errors})
+        else:
+            clean.append({**r, "role": role})
+    return clean, report
+
+
+def create_members(org, rows):
+    """Create users + profiles + memberships for validated rows; returns the count."""
+    User = get_user_model()
+    hashes = hash_passwords([r["password"] for r in rows])
+    users = [User(username=r["username"], email=r["email"], password=h) for r, h in zip(rows, hashes)]
+
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=500)
+        # bulk_create skips post_save and (on MySQL) doesn't return pks: look them up once
+        ids = dict(User.objects.filter(username__in=[u.username for u in users])
+                   .values_list("username", "pk"))
+        UserProfile.objects.bulk_create([UserProfile(user_id=ids[u.username]) for u in users], batch_size=500)
+        Membership.objects.bulk_create(
+            [Membership(user_id=ids[r["username"]], org=org, role=r["role"]) for r in rows], batch_size=500)
+        # bulk_create sends no signals: do what journal.signals would
+        reindex_users(ids.values())
+        bump_versions(f"members:{org.pk}")
+    return len(users)
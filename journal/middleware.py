@@ -0,0 +1,17 @@
+from django.utils.functional import SimpleLazyObject
+from .utils import active_membership
+
+
+class ActiveMembershipMiddleware:
+    """
+    Attach request.active_membership (membership / org / role / is_moderator
+    / has_subusers), resolved lazily and at most once per request.
+    Must sit after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.active_membership = SimpleLazyObject(lambda: active_membership(request.user))
+        return self.get_response(request)
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+def create_fulltext(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor == "mysql":
+        schema_editor.execute(
+            "CREATE FULLTEXT INDEX journal_entry_title_body_ft ON journal_entry (title, body)"
+        )
+    elif conn.vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS journal_entry_fts "
+            "USING fts5(title, body, tokenize='unicode61')"
+        )
+        schema_editor.execute(
+            "INSERT INTO journal_entry_fts(rowid, title, body) "
+            "SELECT id, title, body FROM journal_entry"
+        )
+
+
+def drop_fulltext(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor == "mysql":
+        schema_editor.execute("DROP INDEX journal_entry_title_body_ft ON journal_entry")
+    elif conn.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS journal_entry_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0009_alter_userprofile_nicknames'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext, drop_fulltext),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0010_entry_fulltext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='excerpt',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='entry',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0011_entry_excerpt_word_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entryimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='profileimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='profile_pic_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
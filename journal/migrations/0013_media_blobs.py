@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:46
+
+import django.core.validators
+import journal.models
+import journal.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0012_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('refs', models.PositiveIntegerField(default=0)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='entryimage',
+            name='image',
+            field=models.ImageField(storage=journal.storage.blob_storage, upload_to=journal.models.entry_image_path),
+        ),
+        migrations.AlterField(
+            model_name='profileimage',
+            name='image',
+            field=models.ImageField(storage=journal.storage.blob_storage, upload_to=journal.models.profile_upload_path, validators=[django.core.validators.FileExtensionValidator(['jpg', 'jpeg', 'png', 'webp'])]),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:50
+
+import django.core.validators
+import journal.models
+import journal.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0013_media_blobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='entryimage',
+            name='image',
+            field=models.ImageField(db_index=True, storage=journal.storage.blob_storage, upload_to=journal.models.entry_image_path),
+        ),
+        migrations.AlterField(
+            model_name='profileimage',
+            name='image',
+            field=models.ImageField(db_index=True, storage=journal.storage.blob_storage, upload_to=journal.models.profile_upload_path, validators=[django.core.validators.FileExtensionValidator(['jpg', 'jpeg', 'png', 'webp'])]),
+        ),
+    ]
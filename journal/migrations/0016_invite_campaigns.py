@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0015_invite_delivery_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InviteCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('OWNER', 'Owner'), ('ADMIN', 'Admin'), ('MODERATOR', 'Moderator'), ('AUTHOR', 'Author'), ('SUBAUTHOR', 'Subauthor')], max_length=16)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='invite_campaigns', to=settings.AUTH_USER_MODEL)),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='invite_campaigns', to='journal.organization')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='invite',
+            name='campaign',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='invites', to='journal.invitecampaign'),
+        ),
+    ]
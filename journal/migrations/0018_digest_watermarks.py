@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('journal', '0017_outbound_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DigestWatermark',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='digest_watermark', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('sent_until', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    Membership = apps.get_model("journal", "Membership")
+    ManagementPath = apps.get_model("journal", "ManagementPath")
+    parents = {(org_id, user_id): manager_id for org_id, user_id, manager_id
+               in Membership.objects.values_list("org_id", "user_id", "managed_by_id")}
+    rows = []
+    for (org_id, user_id), manager_id in parents.items():
+        depth, seen = 1, {user_id}
+        while manager_id is not None and manager_id not in seen:
+            rows.append(ManagementPath(org_id=org_id, ancestor_id=manager_id,
+                                       descendant_id=user_id, depth=depth))
+            seen.add(manager_id)
+            manager_id = parents.get((org_id, manager_id))
+            depth += 1
+    ManagementPath.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journal', '0019_member_name_tokens'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ManagementPath',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('descendant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='journal.organization')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'org'], name='management_path_desc_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant', 'org'), name='uniq_management_path')],
+            },
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,18 @@
 from django.db import models
 from django.conf import settings  # <-- needed for AUTH_USER_MODEL
-from django.utils.text import slugify
+from django.utils.text import slugify, Truncator
 from django.core.validators import FileExtensionValidator
 from django.utils import timezone
+import re
 import secrets
 from django.db.models import JSONField  # works on MySQL 8+
+from .storage import blob_storage
 
 
 def profile_upload_path(instance, filename):
-    return f"profiles/{instance.user_id}/{filename}"
+    # UserProfile has user_id; ProfileImage reaches it through its profile
+    user_id = getattr(instance, "user_id", None) or instance.profile.user_id
+    return f"profiles/{user_id}/{filename}"
 
 def _unique_tab_slug(org, name):
     base = slugify(name) or "tab"
@@ -57,6 +61,30 @@ class Membership(models.Model):
     def __str__(self): return f"{self.user.username}@{self.org.name}({self.role})"
 
 
+class ManagementPath(models.Model):
+    """
+    Closure table of Membership.managed_by, per org: one row for every
+    (manager at any depth, managed member) pair. Maintained by
+    journal.hierarchy from journal.signals.
+    """
+    org = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="+")
+    ancestor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                                 related_name="+", db_index=False)
+    descendant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                                   related_name="+", db_index=False)
+    depth = models.PositiveSmallIntegerField()  # 1 = direct manager
+
+    class Meta:
+        constraints = [
+            # "descendants of X" (ancestor, org) and "is X above Y" (ancestor, descendant)
+            models.UniqueConstraint(fields=["ancestor", "descendant", "org"], name="uniq_management_path"),
+        ]
+        indexes = [models.Index(fields=["descendant", "org"], name="management_path_desc_idx")]
+
+    def __str__(self):
+        return f"{self.ancestor_id} > {self.descendant_id} ({self.depth}) @{self.org_id}"
+
+
 class UserProfile(models.Model):
     # Prefer AUTH_USER_MODEL everywhere for consistency
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="profile")
@@ -74,6 +102,7 @@ class UserProfile(models.Model):
         upload_to=profile_upload_path, blank=True, null=True,
         validators=[FileExtensionValidator(["jpg","jpeg","png","webp"])],
     )
+    profile_pic_variants = JSONField(default=dict, blank=True)  # resized copies, see journal.images
     # arbitrary custom fields (key/value/type)
     custom_fields = JSONField(default=list, blank=True)    # [{"key":"Hobby","value":"Fishing","type":"text"}]
 
@@ -110,9 +139,10 @@ class UserProfile(models.Model):
 class ProfileImage(models.Model):
     profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="images")
     image   = models.ImageField(
-        upload_to=profile_upload_path,
+        upload_to=profile_upload_path, storage=blob_storage, db_index=True,
         validators=[FileExtensionValidator(["jpg","jpeg","png","webp"])],
     )
+    variants = JSONField(default=dict, blank=True)  # resized copies, see journal.images
     caption = models.CharField(max_length=200, blank=True)
     is_primary = models.BooleanField(default=False)
     visible = models.BooleanField(default=True)
@@ -181,6 +211,9 @@ class Entry(models.Model):
 
     title = models.CharField(max_length=200)
     body  = models.TextField(blank=True)
+    # derived from body on save, so feeds can defer("body")
+    excerpt = models.CharField(max_length=500, blank=True, default="")
+    word_count = models.PositiveIntegerField(default=0)
     tabs  = models.ManyToManyField("Tab", related_name="entries", blank=True)
 
     created_at   = models.DateTimeField(auto_now_add=True, db_index=True)
@@ -192,6 +225,23 @@ class Entry(models.Model):
     status = models.PositiveSmallIntegerField(choices=Status.choices,
                                               default=Status.DRAFT, db_index=True)
 
+    EXCERPT_WORDS = 40
+
+    @classmethod
+    def make_excerpt(cls, body):
+        """Return (excerpt, word_count) for a body text."""
+        body = body or ""
+        excerpt = Truncator(Truncator(body).words(cls.EXCERPT_WORDS)).chars(500)
+        return excerpt, len(body.split())
+
+    def save(self, *args, **kwargs):
+        if "body" not in self.get_deferred_fields():
+            self.excerpt, self.word_count = self.make_excerpt(self.body)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "body" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "excerpt", "word_count"}
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ("-created_at",)
         indexes = [
@@ -206,13 +256,38 @@ def entry_image_path(instance, filename):
 
 class EntryImage(models.Model):
     entry = models.ForeignKey(Entry, on_delete=models.CASCADE, related_name="images", db_index=True)
-    image = models.ImageField(upload_to=entry_image_path)
+    image = models.ImageField(upload_to=entry_image_path, storage=blob_storage, db_index=True)
+    variants = models.JSONField(default=dict, blank=True)  # resized copies, see journal.images
     caption = models.CharField(max_length=200, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return f"{self.entry_id} – {self.image.name}"
 
+class MediaBlob(models.Model):
+    """One deduplicated file in journal.storage, with the number of rows using it."""
+    name = models.CharField(max_length=255, unique=True)
+    refs = models.PositiveIntegerField(default=0)
+    size = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refs} refs)"
+
+class InviteCampaign(models.Model):
+    """One bulk invite submission; its Invites are sent in throttled batches."""
+    org = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="invite_campaigns")
+    role = models.CharField(max_length=16, choices=Membership.Role.choices)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="invite_campaigns")
+    created_at = models.DateTimeField(auto_now_add=True)
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.total} invites to {self.org} ({self.created_at:%Y-%m-%d})"
+
 class Invite(models.Model):
     DELIVERY_CHOICES = [("email","Email"), ("sms","SMS")]
 
@@ -229,6 +304,20 @@ class Invite(models.Model):
     expires_at = models.DateTimeField()
     accepted_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True,
                                     on_delete=models.SET_NULL, related_name="accepted_invites")
+    campaign = models.ForeignKey(InviteCampaign, null=True, blank=True,
+                                 on_delete=models.SET_NULL, related_name="invites")
+
+    class Delivery(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RETRYING = "retrying", "Retrying"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    # filled in by journal.tasks.deliver_invite
+    delivery_status = models.CharField(max_length=10, choices=Delivery.choices, default=Delivery.QUEUED)
+    delivery_attempts = models.PositiveSmallIntegerField(default=0)
+    delivery_error = models.CharField(max_length=255, blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
 
     def mark_used(self, user=None):
         self.used_at = timezone.now()
@@ -237,18 +326,76 @@ class Invite(models.Model):
         self.save(update_fields=["used_at","accepted_by"])
 
     @classmethod
-    def create(cls, *, org, role, created_by, email="", phone="", ttl_hours=72, delivery="email"):
-        return cls.objects.create(
+    def build(cls, *, org, role, created_by, email="", phone="", ttl_hours=72, delivery="email", campaign=None):
+        """An unsaved invite (for bulk_create); create() saves one."""
+        return cls(
             org=org, role=role, created_by=created_by,
             email=email.strip().lower(), phone=phone.strip(),
-            delivery=delivery,
+            delivery=delivery, campaign=campaign,
             token=secrets.token_urlsafe(32),
             expires_at=timezone.now() + timezone.timedelta(hours=ttl_hours),
         )
 
+    @classmethod
+    def create(cls, **kwargs):
+        inv = cls.build(**kwargs)
+        inv.save()
+        return inv
+
     def is_valid(self):
         return self.used_at is None and timezone.now() < self.expires_at
 
+class OutboundEmail(models.Model):
+    """A queued message for journal.mail_queue; sent in batches over one SMTP session."""
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    to = JSONField(default=list)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.CharField(max_length=255, blank=True)
+    # delivery outcome is mirrored onto the invite (delivery_status & co)
+    invite = models.ForeignKey(Invite, null=True, blank=True, on_delete=models.SET_NULL, related_name="emails")
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"], name="outbound_status_created_idx")]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+class DigestWatermark(models.Model):
+    """How far journal.digests has reported to a user: events up to sent_until are done."""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True,
+                                related_name="digest_watermark")
+    sent_until = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.sent_until:%Y-%m-%d %H:%M}"
+
+class MemberNameToken(models.Model):
+    """One normalized name/nickname word of a member, per org (see journal.directory)."""
+    org = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="+", db_index=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        constraints = [
+            # also the index behind org-scoped prefix lookups (token LIKE 'jo%')
+            models.UniqueConstraint(fields=["org", "token", "user"], name="uniq_member_name_token"),
+        ]
+
+    def __str__(self):
+        return f"{self.token} -> {self.user_id}@{self.org_id}"
+
 class SocialLink(models.Model):
     profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name="socials")
     platform = models.CharField(max_length=50)         # e.g. "Twitter"
@@ -0,0 +1,104 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are ordered by ("-created_at", "-id") and continue from the last row
+seen, so page N costs the same index range scan as page 1 (no OFFSET).
+The cursor is an opaque url-safe token; treat a bad token as "first page".
+
+keyset_page_by() does the same for any ordering that ends in a unique
+column (sortable tables); its cursor carries the sort name and the last
+row's sort values.
+"""
+import base64
+import json
+from datetime import datetime
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+
+def encode_cursor(created_at, pk):
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Return (created_at, pk) or None if the token is missing/garbled."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        ts, pk = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(ts), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_page(qs, cursor=None, size=20):
+    """
+    Slice one page off `qs` (newest first).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    qs = qs.order_by("-created_at", "-id")
+    after = decode_cursor(cursor)
+    if after:
+        ts, pk = after
+        qs = qs.filter(Q(created_at__lt=ts) | Q(created_at=ts, id__lt=pk))
+
+    rows = list(qs[:size + 1])  # one extra row tells us if there's more
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.pk)
+    return rows, next_cursor
+
+
+def _lookup_value(obj, path):
+    for attr in path.split("__"):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def encode_values(tag, values):
+    raw = json.dumps([tag, *values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_values(token, tag, n):
+    """The n sort values stored in `token` for sort `tag`, or None."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(data, list) or len(data) != n + 1 or data[0] != tag:
+        return None
+    return data[1:]
+
+
+def keyset_page_by(qs, fields, cursor=None, size=20, descending=False, tag=""):
+    """
+    One page of `qs` ordered by `fields` (all ascending, or all descending);
+    the last field must be unique, e.g. "id". `tag` names the ordering so a
+    cursor from another sort is ignored. Returns (rows, next_cursor).
+    """
+    sign = "-" if descending else ""
+    qs = qs.order_by(*(sign + f for f in fields))
+    after = decode_values(cursor, tag, len(fields))
+    if after is not None:
+        op = "lt" if descending else "gt"
+        # (a, b, c) > (x, y, z)  ==  a > x  OR  (a = x AND b > y)  OR  ...
+        qs = qs.filter(reduce(or_, (
+            Q(**{f"{f}__{op}": v}, **dict(zip(fields[:i], after[:i])))
+            for i, (f, v) in enumerate(zip(fields, after)))))
+
+    rows = list(qs[:size + 1])
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_values(tag, [_lookup_value(rows[-1], f) for f in fields])
+    return rows, next_cursor
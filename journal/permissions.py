@@ -1,6 +1,8 @@
 from django.http import Http404
 from django.contrib.auth import get_user_model
-from .models import Membership, Organization
+from .hierarchy import is_ancestor
+from .models import Membership
+from .utils import active_membership
 
 ROLE_ORDER = {"SUBAUTHOR": 0, "AUTHOR": 1, "MODERATOR": 2, "ADMIN": 3, "OWNER": 4}
 
@@ -18,10 +20,9 @@ def can_view_profile(viewer, subject):
         return False
     if viewer == subject:
         return True
-    # same org + viewer is subject's manager
+    # viewer manages subject, directly or through their subusers
     try:
-        # subject.mem.managed_by == viewer
-        return Membership.objects.filter(user=subject, managed_by=viewer).exists()
+        return is_ancestor(viewer, subject)
     except Exception:
         return False
 
@@ -30,12 +31,12 @@ def can_edit_profile(viewer, subject):
     return can_view_profile(viewer, subject)
 
 def user_org(user):
-    return (Organization.objects
-            .filter(memberships__user=user)
-            .order_by("id")
-            .first())
+    return active_membership(user).org
 
 def user_role_in_org(user, org):
+    am = active_membership(user)
+    if org is not None and am.org == org:
+        return am.role
     return (Membership.objects
             .filter(user=user, org=org)
             .values_list("role", flat=True)
@@ -55,6 +56,33 @@ def can_manage(manager, target):
     t_role = user_role_in_org(target,  org) or "SUBAUTHOR"
     return ROLE_ORDER.get(m_role, -1) > ROLE_ORDER.get(t_role, -1)
 
+def can_manage_map(actor, memberships):
+    """
+    Bulk form of templatetags.can_manage.user_can_manage_user for a members
+    table: {membership.pk: bool}. Uses the role already on each row and the
+    actor's cached membership, so a whole table costs no extra queries.
+    """
+    if not getattr(actor, "is_authenticated", False):
+        return {m.pk: False for m in memberships}
+    if actor.is_superuser:
+        return {m.pk: True for m in memberships}
+    mem = active_membership(actor).membership
+    if not mem:
+        return {m.pk: False for m in memberships}
+    a_rank = ROLE_ORDER.get(str(mem.role).upper(), -1)
+    return {
+        m.pk: m.org_id == mem.org_id and a_rank > ROLE_ORDER.get(str(m.role).upper(), -1)
+        for m in memberships
+    }
+
+def assignable_roles(actor):
+    """Roles `actor` may hand out: those ranked strictly below their own."""
+    if actor.is_superuser:
+        return set(ROLE_ORDER)
+    mem = active_membership(actor).membership
+    rank = ROLE_ORDER.get(str(mem.role).upper(), -1) if mem else -1
+    return {role for role, r in ROLE_ORDER.items() if r < rank}
+
 def get_target_user_or_404(request_user, user_id: int | None):
     U = get_user_model()
     if user_id is None:
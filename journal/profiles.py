@@ -0,0 +1,67 @@
+"""
+Profile page: a fixed-query loader and a render cache.
+
+load_profile() fetches a user's profile with its visible socials, images and
+custom items in four queries (the profile joined to its user, then one
+prefetch per related list), however often the template walks them.
+
+render_profile() caches the rendered profile card in the "fragments" cache
+under a per-user content version ("profile:<user id>", journal.caching);
+journal.signals bumps it when the user, their UserProfile or one of their
+SocialLink / ProfileImage / CustomField rows is saved or deleted, so a hit
+is never stale and needs no queries.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .caching import bump, content_version
+from .fragments import _store
+from .models import CustomField, ProfileImage, SocialLink, UserProfile
+
+PROFILE_CACHE = "profile_pages"
+
+
+def version_scope(user_id):
+    return f"profile:{user_id}"
+
+
+def _profiles():
+    return (UserProfile.objects
+            .select_related("user")
+            .prefetch_related(
+                Prefetch("socials", queryset=SocialLink.objects.filter(visible=True),
+                         to_attr="visible_socials"),
+                Prefetch("images", queryset=ProfileImage.objects.filter(visible=True),
+                         to_attr="visible_images"),
+                Prefetch("custom_items", queryset=CustomField.objects.filter(visible=True),
+                         to_attr="visible_custom_items")))
+
+
+def load_profile(user_id):
+    """The user's profile with `.visible_socials/_images/_custom_items`; None if no such user."""
+    profile = _profiles().filter(user_id=user_id).first()
+    if profile is None and get_user_model().objects.filter(pk=user_id).exists():
+        UserProfile.objects.get_or_create(user_id=user_id)  # predates the ensure_profile signal
+        profile = _profiles().get(user_id=user_id)
+    return profile
+
+
+def render_profile(user_id):
+    """Rendered profile card for `user_id` (cached), or None if there's no such user."""
+    store = _store()
+    key = f"journal:frag:profile:{user_id}:{content_version(version_scope(user_id))}"
+    html = store.get(key)
+    if html is not None:
+        bump(PROFILE_CACHE, "hits")
+        return mark_safe(html)
+
+    profile = load_profile(user_id)
+    if profile is None:
+        return None
+    bump(PROFILE_CACHE, "misses")
+    html = render_to_string("journal/partials/profile_card.html", {"profile": profile, "subject": profile.user})
+    store.set(key, html, getattr(settings, "FRAGMENT_CACHE_TTL", 86400))
+    return mark_safe(html)
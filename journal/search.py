@@ -0,0 +1,93 @@
+"""
+Full-text search over Entry.title/body.
+
+- MySQL: a FULLTEXT(title, body) index, maintained by InnoDB itself.
+- SQLite (dev/tests): an FTS5 table keyed by entry id, kept in sync from
+  journal.signals via index_entry()/unindex_entry().
+
+Both paths rank in the database and only return one page of ids, which are
+then loaded through the ORM; nothing LIKE-scans the body column.
+"""
+import re
+
+from django.db import connection
+
+from .models import Entry
+
+FTS_TABLE = "journal_entry_fts"
+
+
+def _sqlite():
+    return connection.vendor == "sqlite"
+
+
+def _fts5_query(text):
+    # quote each word (no FTS syntax from users), prefix-match, implicit AND
+    words = re.findall(r"\w+", text or "")
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def index_entry(entry):
+    if not _sqlite():
+        return
+    with connection.cursor() as cur:
+        cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [entry.pk])
+        cur.execute(f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (%s, %s, %s)",
+                    [entry.pk, entry.title, entry.body])
+
+
+def unindex_entry(pk):
+    if not _sqlite():
+        return
+    with connection.cursor() as cur:
+        cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def search_entries(org, text, *, status=Entry.Status.APPROVED, tab=None, page=1, size=20):
+    """
+    Return (entries, has_more) for one page of `text` matches in `org`,
+    best match first.
+    """
+    entry_t = Entry._meta.db_table
+    tabs_t = Entry.tabs.through._meta.db_table
+    page = max(1, int(page or 1))
+
+    if _sqlite():
+        match = _fts5_query(text)
+        if not match:
+            return [], False
+        sql = (f"SELECT e.id FROM {FTS_TABLE} f JOIN {entry_t} e ON e.id = f.rowid "
+               f"WHERE {FTS_TABLE} MATCH %s AND e.org_id = %s AND e.status = %s")
+        params = [match, org.pk, status]
+        order = f"bm25({FTS_TABLE}, 5.0, 1.0), e.id DESC"  # title hits outrank body hits
+    else:
+        text = (text or "").strip()
+        if not text:
+            return [], False
+        sql = (f"SELECT e.id FROM {entry_t} e "
+               f"WHERE MATCH(e.title, e.body) AGAINST (%s IN NATURAL LANGUAGE MODE) "
+               f"AND e.org_id = %s AND e.status = %s")
+        params = [text, org.pk, status]
+        order = "MATCH(e.title, e.body) AGAINST (%s IN NATURAL LANGUAGE MODE) DESC, e.id DESC"
+
+    if tab is not None:
+        sql += f" AND EXISTS (SELECT 1 FROM {tabs_t} t WHERE t.entry_id = e.id AND t.tab_id = %s)"
+        params.append(getattr(tab, "pk", tab))
+
+    sql += f" ORDER BY {order} LIMIT %s OFFSET %s"
+    if not _sqlite():
+        params.append(text)
+    params += [size + 1, (page - 1) * size]
+
+    with connection.cursor() as cur:
+        cur.execute(sql, params)
+        ids = [row[0] for row in cur.fetchall()]
+
+    has_more = len(ids) > size
+    ids = ids[:size]
+    by_id = (Entry.objects
+             .defer("body")
+             .select_related("author")
+             .prefetch_related("tabs")
+             .in_bulk(ids))
+    return [by_id[i] for i in ids if i in by_id], has_more
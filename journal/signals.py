@@ -1,11 +1,200 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import UserProfile
+from django.utils import timezone
+from .models import (UserProfile, Membership, Organization, Entry, EntryImage, ProfileImage, Tab,
+                     SocialLink, CustomField)
+from . import hierarchy, images, storage
+from .caching import invalidate_memberships, bump_versions
+from .directory import reindex_user
+from .profiles import version_scope as profile_scope
+from .search import index_entry, unindex_entry
 
 User = get_user_model()
 
 @receiver(post_save, sender=User)
 def ensure_profile(sender, instance, created, **kwargs):
     if created:
-        UserProfile.objects.get_or_create(user=instance)
\ No newline at end of file
+        UserProfile.objects.get_or_create(user=instance)
+
+# --- Membership cache invalidation ---
+
+@receiver(pre_save, sender=Membership)
+def remember_old_manager(sender, instance, **kwargs):
+    # a manager losing a subuser needs its has_subusers flag refreshed too
+    instance._old_managed_by_id = None
+    if instance.pk:
+        instance._old_managed_by_id = (Membership.objects
+                                       .filter(pk=instance.pk)
+                                       .values_list("managed_by_id", flat=True)
+                                       .first())
+    # refuse a cycle before it's written (journal.hierarchy)
+    if instance.managed_by_id != instance._old_managed_by_id:
+        hierarchy.check_manager(instance.org_id, instance.user_id, instance.managed_by_id)
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def membership_changed(sender, instance, **kwargs):
+    invalidate_memberships(instance.user_id, instance.managed_by_id,
+                           getattr(instance, "_old_managed_by_id", None))
+    bump_versions(f"members:{instance.org_id}")  # cached table totals
+
+@receiver(post_save, sender=Membership)
+def membership_moved(sender, instance, created, **kwargs):
+    if created or instance.managed_by_id != getattr(instance, "_old_managed_by_id", None):
+        hierarchy.set_manager(instance.org_id, instance.user_id, instance.managed_by_id)
+
+@receiver(post_delete, sender=Membership)
+def membership_removed(sender, instance, **kwargs):
+    hierarchy.forget_member(instance.org_id, instance.user_id)
+
+@receiver(post_save, sender=Organization)
+def organization_changed(sender, instance, created, **kwargs):
+    # cached memberships carry the org row; deletes cascade through Membership
+    if not created:
+        invalidate_memberships(*instance.memberships.values_list("user_id", flat=True))
+        bump_versions(f"org:{instance.pk}")  # org-scoped pages render its name
+
+# --- Profile page render cache (journal.profiles) ---
+
+@receiver(post_save, sender=User)
+def user_profile_version(sender, instance, created, update_fields=None, **kwargs):
+    if not created and update_fields and set(update_fields) <= {"last_login", "password"}:
+        return  # logins don't change what the profile shows
+    bump_versions(profile_scope(instance.pk))
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def profile_version(sender, instance, **kwargs):
+    bump_versions(profile_scope(instance.user_id))
+
+@receiver(post_save, sender=SocialLink)
+@receiver(post_delete, sender=SocialLink)
+@receiver(post_save, sender=ProfileImage)
+@receiver(post_delete, sender=ProfileImage)
+@receiver(post_save, sender=CustomField)
+@receiver(post_delete, sender=CustomField)
+def profile_row_version(sender, instance, **kwargs):
+    user_id = UserProfile.objects.filter(pk=instance.profile_id).values_list("user_id", flat=True).first()
+    if user_id:
+        bump_versions(profile_scope(user_id))
+
+# --- Member directory name tokens (journal.directory) ---
+
+@receiver(post_save, sender=User)
+def user_names_changed(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {"last_login", "password"}:
+        return
+    reindex_user(instance.pk)
+
+@receiver(post_save, sender=UserProfile)
+def profile_names_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not {"display_name", "full_name", "pet_name", "nicknames"} & set(update_fields):
+        return  # e.g. image variants or onboarding step
+    reindex_user(instance.user_id)
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def member_orgs_changed(sender, instance, **kwargs):
+    reindex_user(instance.user_id)
+
+# --- Full-text index (no-op on MySQL, where FULLTEXT maintains itself) ---
+
+@receiver(post_save, sender=Entry)
+def entry_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not {"title", "body"} & set(update_fields):
+        return  # status/timestamp-only saves don't touch indexed text
+    index_entry(instance)
+
+@receiver(post_delete, sender=Entry)
+def entry_deleted(sender, instance, **kwargs):
+    unindex_entry(instance.pk)
+
+# --- Content versions behind the conditional-GET ETags (journal.conditional) ---
+
+@receiver(post_save, sender=Entry)
+@receiver(post_delete, sender=Entry)
+def entry_version(sender, instance, **kwargs):
+    bump_versions(f"org:{instance.org_id}", f"author:{instance.author_id}")
+
+@receiver(post_save, sender=EntryImage)
+@receiver(post_delete, sender=EntryImage)
+def entry_image_version(sender, instance, **kwargs):
+    entry = Entry.objects.filter(pk=instance.entry_id).values("org_id", "author_id").first()
+    if entry:
+        touch_entries([instance.entry_id])
+        bump_versions(f"org:{entry['org_id']}", f"author:{entry['author_id']}")
+
+@receiver(post_save, sender=EntryImage)
+@receiver(post_save, sender=ProfileImage)
+@receiver(post_save, sender=UserProfile)
+def queue_image_variants(sender, instance, update_fields=None, **kwargs):
+    field, _ = images.fields_for(instance)
+    if update_fields is not None and field not in update_fields:
+        return  # includes the task's own variants-only save
+    if images.needs_variants(instance):
+        images.schedule(instance)
+
+# --- Shared media reference counts (journal.storage) ---
+
+@receiver(pre_save, sender=EntryImage)
+@receiver(pre_save, sender=ProfileImage)
+def remember_old_image(sender, instance, update_fields=None, **kwargs):
+    instance._old_image = None
+    if instance.pk and (update_fields is None or "image" in update_fields):
+        instance._old_image = sender.objects.filter(pk=instance.pk).values_list("image", flat=True).first()
+
+@receiver(post_save, sender=EntryImage)
+@receiver(post_save, sender=ProfileImage)
+def image_refs_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and "image" not in update_fields:
+        return
+    old, new = getattr(instance, "_old_image", None), instance.image.name
+    if created or old != new:
+        storage.retain([new])
+        storage.release([old])
+
+@receiver(post_delete, sender=EntryImage)
+@receiver(post_delete, sender=ProfileImage)
+def image_refs_deleted(sender, instance, **kwargs):
+    storage.release([instance.image.name])
+
+@receiver(post_save, sender=Tab)
+@receiver(post_delete, sender=Tab)
+def tab_version(sender, instance, **kwargs):
+    bump_versions(f"org:{instance.org_id}")
+
+def _tab_author_scopes(tab):
+    # drafts tables (author-scoped ETags) show the tab names of each entry
+    authors = Entry.objects.filter(tabs=tab).values_list("author_id", flat=True).distinct()
+    return [f"author:{a}" for a in authors]
+
+@receiver(post_save, sender=Tab)
+def tab_renamed(sender, instance, created, **kwargs):
+    if not created:  # tab names are part of cached entry bodies
+        touch_entries(Entry.objects.filter(tabs=instance).values("pk"))
+        bump_versions(*_tab_author_scopes(instance))
+
+@receiver(pre_delete, sender=Tab)
+def tab_deleted(sender, instance, **kwargs):
+    # the entry links are gone by post_delete, and clearing them sends no m2m_changed
+    touch_entries(Entry.objects.filter(tabs=instance).values("pk"))
+    bump_versions(*_tab_author_scopes(instance))
+
+@receiver(m2m_changed, sender=Entry.tabs.through)
+def entry_tabs_version(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # post_clear carries no pk_set: note which entries lose this tab
+        instance._cleared_entry_pks = list(Entry.objects.filter(tabs=instance).values_list("pk", flat=True))
+        return
+    if action == "post_clear" and reverse:
+        pk_set = instance.__dict__.pop("_cleared_entry_pks", [])
+    if action.startswith("post_"):
+        # reverse=True: instance is a Tab and pk_set holds entry ids
+        touch_entries((pk_set or []) if reverse else [instance.pk])
+        bump_versions(f"org:{instance.org_id}",
+                      f"author:{instance.author_id}" if isinstance(instance, Entry) else None)
+
+def touch_entries(pks):
+    """Move updated_at so cached fragments / detail ETags keyed on it roll over."""
+    Entry.objects.filter(pk__in=pks).update(updated_at=timezone.now())
@@ -0,0 +1,51 @@
+"""
+Pluggable SMS sending, picked by settings.SMS_BACKEND (like EMAIL_BACKEND).
+
+- TwilioBackend: the real thing; one client per process, errors raise so the
+  caller (journal.tasks.deliver_invite) can retry.
+- ConsoleBackend: prints messages (dev default when Twilio isn't configured).
+- LocMemBackend: keeps messages in `journal.sms.outbox` (tests).
+"""
+import os
+import sys
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+outbox = []
+
+
+class SMSError(Exception):
+    pass
+
+
+class ConsoleBackend:
+    def send(self, to, body):
+        sys.stdout.write(f"[SMS to {to}] {body}\n")
+
+
+class LocMemBackend:
+    def send(self, to, body):
+        outbox.append({"to": to, "body": body})
+
+
+class TwilioBackend:
+    def __init__(self):
+        self.from_number = os.getenv("TWILIO_FROM_NUMBER")  # e.g. +15551234567
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def client():
+        from twilio.rest import Client
+        return Client(os.getenv("TWILIO_ACCOUNT_SID"), os.getenv("TWILIO_AUTH_TOKEN"))
+
+    def send(self, to, body):
+        try:
+            self.client().messages.create(to=to, from_=self.from_number, body=body)
+        except Exception as exc:  # twilio raises its own hierarchy; normalise for retry
+            raise SMSError(str(exc)) from exc
+
+
+def get_backend():
+    return import_string(getattr(settings, "SMS_BACKEND", "journal.sms.ConsoleBackend"))()
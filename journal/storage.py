@@ -0,0 +1,159 @@
+"""
+Content-addressed, deduplicating media storage for EntryImage/ProfileImage.
+
+Originals are stored as cas/<aa>/<bb>/<sha256><ext>, whatever name upload_to
+produced, so the same photo uploaded to five entries and a profile library
+is one file; a repeated upload skips the write entirely. The digest comes
+from the upload handler (journal.uploads) when it streamed the file, so it
+isn't read twice.
+
+Names already inside cas/ are derivatives of a blob (journal.images
+variants) and are stored under that name as-is.
+
+Files are shared, so rows never delete them directly: MediaBlob.refs counts
+the rows pointing at each blob (journal.signals keeps it current) and
+release() removes the blob and its derivatives once nothing references it.
+Reusing a stored blob and collecting it both lock its MediaBlob row, so a
+collection can't delete a file a new upload has just been pointed at.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+PREFIX = "cas/"
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(PREFIX)
+
+
+def _digest(content):
+    digest = getattr(content, "sha256", None)
+    if digest:
+        return digest
+    h = hashlib.sha256()
+    for chunk in content.chunks():
+        h.update(chunk)
+    content.seek(0)
+    return h.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    content_addressed = True
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        if not is_blob(name):
+            digest = _digest(content)
+            ext = os.path.splitext(name)[1].lower()
+            name = f"{PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+        return self._save(name, content)
+
+    def _save(self, name, content):
+        if self._reuse(name):
+            return name
+        full = self.path(name)
+        directory = os.path.dirname(full)
+        os.makedirs(directory, exist_ok=True)
+        # write beside the target, then rename: concurrent writers of the same
+        # blob both succeed and readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        try:
+            if hasattr(content, "temporary_file_path"):
+                os.close(fd)
+                file_move_safe(content.temporary_file_path(), tmp, allow_overwrite=True)
+            else:
+                with os.fdopen(fd, "wb") as out:
+                    for chunk in content.chunks():
+                        out.write(chunk)
+            os.chmod(tmp, self.file_permissions_mode or 0o644)
+            os.replace(tmp, full)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return name
+
+    def _reuse(self, name):
+        """
+        True if these bytes are already stored and may be shared. Locking
+        the MediaBlob row first means a _collect() of the same blob has
+        either finished (file gone: write it again) or waits for the
+        caller's transaction, in which retain() bumps refs. The fresh mtime
+        covers the new row in gc_media's grace period.
+        """
+        from .models import MediaBlob
+
+        with transaction.atomic():
+            list(MediaBlob.objects.select_for_update().filter(name=name).values_list("pk"))
+            try:
+                os.utime(self.path(name))
+            except FileNotFoundError:
+                return False
+        return True
+
+    def delete_blob(self, name):
+        """Remove a blob and every derivative stored next to it."""
+        stem = os.path.splitext(os.path.basename(name))[0]
+        directory = os.path.dirname(name)
+        if not self.exists(directory):
+            return
+        for fname in self.listdir(directory)[1]:
+            if fname.split(".", 1)[0] == stem:
+                self.delete(f"{directory}/{fname}")
+
+
+def blob_storage():
+    return storages["blobs"]
+
+
+# --- Reference counts ---
+
+def retain(names):
+    from .models import MediaBlob
+
+    counts = {}
+    for name in names:
+        if is_blob(name):
+            counts[name] = counts.get(name, 0) + 1
+    for name, n in counts.items():
+        if MediaBlob.objects.filter(name=name).update(refs=F("refs") + n):
+            continue
+        if not blob_storage().exists(name):
+            # collected between save and now: fail the caller's transaction, not leave a row pointing at nothing
+            raise FileNotFoundError(f"media blob {name} is missing")
+        try:
+            with transaction.atomic():
+                MediaBlob.objects.create(name=name, refs=n, size=blob_storage().size(name))
+        except IntegrityError:  # created concurrently
+            MediaBlob.objects.filter(name=name).update(refs=F("refs") + n)
+
+
+def release(names):
+    from .models import MediaBlob
+
+    for name in names:
+        if not is_blob(name):
+            continue
+        MediaBlob.objects.filter(name=name, refs__gt=0).update(refs=F("refs") - 1)
+        transaction.on_commit(lambda name=name: _collect(name))
+
+
+def _collect(name):
+    from .models import MediaBlob
+
+    # the row lock is held until the file is gone, so a concurrent save of
+    # the same bytes (ContentAddressedStorage._reuse) waits and rewrites it
+    with transaction.atomic():
+        blob = MediaBlob.objects.select_for_update().filter(name=name, refs=0).first()
+        if blob is None:
+            return
+        blob.delete()
+        blob_storage().delete_blob(name)
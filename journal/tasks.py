@@ -1,8 +1,164 @@
 
 from celery import shared_task
-from django.core.mail import send_mail
 from django.conf import settings
 
 @shared_task
 def send_email_async(subject, message, recipient_list):
-    send_mail(subject, message, getattr(settings,"DEFAULT_FROM_EMAIL",None), recipient_list, fail_silently=True)
+    """Kept for callers of the old task: the message joins the batched mail queue."""
+    from .mail_queue import enqueue
+    enqueue(subject, message, recipient_list)
+
+@shared_task(bind=True, max_retries=5, acks_late=True)
+def flush_mail_queue(self):
+    """Send one batch of journal.mail_queue over a single SMTP session; returns its stats/timings."""
+    from django.core.cache import cache
+    from .mail_queue import FLUSH_KEY, MailTransportError, flush
+
+    cache.delete(FLUSH_KEY)  # mail enqueued from now on schedules the next flush
+    try:
+        stats = flush()
+    except MailTransportError as exc:
+        raise self.retry(exc=exc, countdown=min(600, 30 * 2 ** self.request.retries))
+    if stats["batch"] == settings.MAIL_BATCH_SIZE:
+        self.apply_async()  # a backlog: carry on with the next batch
+    return stats
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30, acks_late=True)
+def build_image_variants(self, label, pk):
+    """Resize one uploaded image (see journal.images); a no-op if it's gone or done."""
+    from django.apps import apps
+    from .images import refresh_variants
+
+    obj = apps.get_model(label).objects.filter(pk=pk).first()
+    if obj is None:
+        return
+    try:
+        refresh_variants(obj)
+    except OSError as exc:  # storage hiccup: try again later
+        raise self.retry(exc=exc)
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30, acks_late=True)
+def build_entry_image_variants(self, entry_id):
+    """build_image_variants for each image of one entry still missing them."""
+    from .images import needs_variants, refresh_variants
+    from .models import EntryImage
+
+    try:
+        for img in EntryImage.objects.filter(entry_id=entry_id):
+            if needs_variants(img):
+                refresh_variants(img)
+    except OSError as exc:
+        raise self.retry(exc=exc)
+
+@shared_task
+def gc_orphaned_media():
+    """Nightly beat job (MEDIA_GC_BEAT): quarantine orphans, purge old quarantine."""
+    from .media_gc import collect, purge_quarantine
+
+    stats = collect()
+    stats["purged_bytes"] = purge_quarantine(settings.MEDIA_GC_QUARANTINE_DAYS)
+    return stats
+
+@shared_task
+def send_notification_digests():
+    """Beat job: one mail per moderator/author covering events since their last digest."""
+    from django.core.cache import cache
+    from .digests import run
+
+    if not cache.add("digests:running", 1, 3600):  # a previous run is still going
+        return None
+    try:
+        return run()
+    finally:
+        cache.delete("digests:running")
+
+@shared_task(bind=True, max_retries=5, acks_late=True)
+def deliver_invite(self, invite_id, accept_url):
+    """Send one invite: email goes via journal.mail_queue; SMS retries with backoff (30s .. 10min)."""
+    import random
+    from django.utils import timezone
+    from .invites import invite_message
+    from .mail_queue import enqueue
+    from .models import Invite, OutboundEmail
+    from .utils import send_invite_sms
+
+    inv = Invite.objects.select_related("org").filter(pk=invite_id).first()
+    if inv is None or inv.delivery_status == Invite.Delivery.SENT or inv.used_at:
+        return
+    subject, body = invite_message(inv, accept_url)
+    if inv.delivery == "email":
+        # batched with other mail; journal.mail_queue records the outcome on the invite
+        if not inv.emails.filter(status__in=[OutboundEmail.Status.PENDING, OutboundEmail.Status.SENDING]).exists():
+            enqueue(subject, body, [inv.email], invite=inv)
+        return
+    inv.delivery_attempts += 1
+    try:
+        send_invite_sms(inv.phone, body)
+    except Exception as exc:
+        final = self.request.retries >= self.max_retries
+        inv.delivery_status = Invite.Delivery.FAILED if final else Invite.Delivery.RETRYING
+        inv.delivery_error = str(exc)[:255]
+        inv.save(update_fields=["delivery_status", "delivery_error", "delivery_attempts"])
+        if final:
+            return
+        countdown = min(600, 30 * 2 ** self.request.retries) + random.uniform(0, 5)
+        raise self.retry(exc=exc, countdown=countdown)
+
+    inv.delivery_status = Invite.Delivery.SENT
+    inv.delivery_error = ""
+    inv.delivered_at = timezone.now()
+    inv.save(update_fields=["delivery_status", "delivery_error", "delivery_attempts", "delivered_at"])
+
+@shared_task(bind=True, acks_late=True)
+def send_invite_campaign(self, campaign_id, base_url):
+    """
+    Send the next INVITE_BATCH_SIZE queued invites of a bulk campaign, then
+    reschedule itself after INVITE_BATCH_INTERVAL_SECONDS until none are
+    left. Emails join journal.mail_queue in one insert (one SMTP session per
+    flush); SMS share one client, and failures are handed to deliver_invite
+    and its backoff.
+    """
+    from django.utils import timezone
+    from .invites import accept_url, invite_message
+    from .mail_queue import enqueue_many
+    from .models import Invite, OutboundEmail
+    from .sms import get_backend
+    from .utils import send_invite_sms
+
+    batch = list(Invite.objects.select_related("org")
+                 .filter(campaign_id=campaign_id, delivery_status=Invite.Delivery.QUEUED, used_at=None,
+                         emails__isnull=True)  # not yet handed to the mail queue
+                 .order_by("pk")[:settings.INVITE_BATCH_SIZE])
+    if not batch:
+        return
+
+    mail, texts, failed = [], [], []
+    for inv in batch:
+        url = accept_url(base_url, inv)
+        subject, body = invite_message(inv, url)
+        if inv.delivery == "email":
+            mail.append(OutboundEmail(subject=subject, body=body, to=[inv.email], invite=inv))
+        else:
+            texts.append((inv, url, body))
+    enqueue_many(mail)
+
+    sms = get_backend() if texts else None
+    for inv, url, body in texts:
+        inv.delivery_attempts += 1
+        try:
+            send_invite_sms(inv.phone, body, backend=sms)
+        except Exception as exc:
+            inv.delivery_status = Invite.Delivery.RETRYING
+            inv.delivery_error = str(exc)[:255]
+            failed.append((inv.pk, url))
+        else:
+            inv.delivery_status = Invite.Delivery.SENT
+            inv.delivery_error = ""
+            inv.delivered_at = timezone.now()
+    Invite.objects.bulk_update([inv for inv, _, _ in texts],
+                               ["delivery_status", "delivery_error", "delivery_attempts", "delivered_at"])
+
+    for invite_id, url in failed:
+        deliver_invite.apply_async((invite_id, url), countdown=30)
+    if len(batch) == settings.INVITE_BATCH_SIZE:
+        self.apply_async((campaign_id, base_url), countdown=settings.INVITE_BATCH_INTERVAL_SECONDS)
@@ -1,5 +1,6 @@
 from django import template
-from journal.models import Membership, Organization
+from journal.models import Membership
+from journal.utils import active_membership
 
 register = template.Library()
 
@@ -12,17 +13,12 @@ def user_can_manage_user(actor, target) -> bool:
         return False
     if actor.is_superuser:
         return True
-    # same org?
-    org = (Organization.objects
-           .filter(memberships__user=actor)
-           .order_by("id")
-           .first())
+    # same org? (actor's org/role come from the request-scoped membership)
+    am = active_membership(actor)
+    org = am.org
     if not org:
         return False
-    a_role = (Membership.objects
-              .filter(user=actor, org=org)
-              .values_list("role", flat=True)
-              .first())
+    a_role = am.role
     t_role = (Membership.objects
               .filter(user=target, org=org)
               .values_list("role", flat=True)
@@ -0,0 +1,33 @@
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+
+from journal.images import fields_for, ready_variants, srcset
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_img(obj, sizes="100vw", **attrs):
+    """
+    Usage: {% responsive_img img sizes="200px" class="img-fluid" %}
+    <picture> with WebP/JPEG srcsets once variants exist, else the original.
+    Always lazy-loaded.
+    """
+    field, _ = fields_for(obj)
+    f = getattr(obj, field)
+    if not f:
+        return ""
+    attrs = {"loading": "lazy", "decoding": "async", "alt": "", **attrs}
+    v = ready_variants(obj)
+    if not v.get("jpeg"):
+        return format_html('<img src="{}"{}>', f.url, flatatt(attrs))
+
+    largest = v["jpeg"][-1]
+    attrs.update(width=largest[0], height=largest[1])
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}"{}></picture>',
+        srcset(f.storage, v, "webp"), sizes,
+        f.storage.url(largest[2]), srcset(f.storage, v, "jpeg"), sizes, flatatt(attrs),
+    )
@@ -0,0 +1,12 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # locmem outlives each test's DB rollback; don't let cached rows leak across tests
+    for c in caches.all():
+        c.clear()
+    yield
+    for c in caches.all():
+        c.clear()
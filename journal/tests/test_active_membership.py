@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from journal.caching import MEMBERSHIP_CACHE, cache_stats, reset_stats
+from journal.utils import active_membership, get_user_org, user_is_moderator
+from .utils import make_user, make_org, add_member
+
+User = get_user_model()
+
+
+def membership_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if "journal_membership" in q["sql"]]
+
+
+class ActiveMembershipTests(TestCase):
+    def setUp(self):
+        self.owner = make_user("boss")
+        self.org = make_org(self.owner)
+        self.mod = make_user("mod")
+        add_member(self.mod, self.org, "MODERATOR")
+        self.client.login(username="mod", password="pass")
+
+    def test_helpers_share_one_lookup(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(get_user_org(self.mod), self.org)
+            self.assertTrue(user_is_moderator(self.mod))
+            self.assertFalse(active_membership(self.mod).has_subusers)
+        self.assertEqual(len(membership_queries(ctx)), 1)
+
+    def test_moderator_view_costs_one_membership_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(reverse("journal:review_queue"))
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.context["is_moderator"])
+        self.assertEqual(r.context["current_org"], self.org)
+        self.assertEqual(len(membership_queries(ctx)), 1)
+
+    def test_has_subusers_flag(self):
+        kid = make_user("kid")
+        m = add_member(kid, self.org, "SUBAUTHOR")
+        m.managed_by = self.mod
+        m.save()
+        r = self.client.get(reverse("journal:review_queue"))
+        self.assertTrue(r.context["has_subusers"])
+
+    def test_anonymous_user_has_no_org(self):
+        from django.contrib.auth.models import AnonymousUser
+        self.assertIsNone(get_user_org(AnonymousUser()))
+        self.assertFalse(user_is_moderator(AnonymousUser()))
+
+
+class MembershipCacheTests(TestCase):
+    def setUp(self):
+        self.owner = make_user("boss")
+        self.org = make_org(self.owner)
+        self.mod = make_user("mod")
+        self.mem = add_member(self.mod, self.org, "MODERATOR")
+        reset_stats(MEMBERSHIP_CACHE)
+
+    def fresh(self, user):
+        # a new user object per "request", like AuthenticationMiddleware gives us
+        return User.objects.get(pk=user.pk)
+
+    def test_second_request_is_a_cache_hit(self):
+        self.assertTrue(user_is_moderator(self.fresh(self.mod)))
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(get_user_org(self.fresh(self.mod)), self.org)
+        self.assertEqual(membership_queries(ctx), [])
+        self.assertEqual(cache_stats(MEMBERSHIP_CACHE)["hits"], 1)
+        self.assertEqual(cache_stats(MEMBERSHIP_CACHE)["misses"], 1)
+
+    def test_role_change_invalidates(self):
+        self.assertTrue(user_is_moderator(self.fresh(self.mod)))
+        self.mem.role = "AUTHOR"
+        self.mem.save()
+        self.assertFalse(user_is_moderator(self.fresh(self.mod)))
+
+    def test_membership_delete_invalidates(self):
+        self.assertEqual(get_user_org(self.fresh(self.mod)), self.org)
+        self.mem.delete()
+        self.assertIsNone(get_user_org(self.fresh(self.mod)))
+
+    def test_manager_change_invalidates_old_and_new_manager(self):
+        kid = add_member(make_user("kid"), self.org, "SUBAUTHOR")
+        kid.managed_by = self.mod
+        kid.save()
+        self.assertTrue(active_membership(self.fresh(self.mod)).has_subusers)
+        kid.managed_by = self.owner
+        kid.save()
+        self.assertFalse(active_membership(self.fresh(self.mod)).has_subusers)
+        self.assertTrue(active_membership(self.fresh(self.owner)).has_subusers)
+
+    def test_org_rename_invalidates_members(self):
+        self.assertEqual(get_user_org(self.fresh(self.mod)).name, "Org")
+        self.org.name = "Renamed"
+        self.org.save()
+        self.assertEqual(get_user_org(self.fresh(self.mod)).name, "Renamed")
@@ -0,0 +1,101 @@
+from django.test import TestCase
+from django.urls import reverse
+from journal.models import Entry, Tab
+from .utils import make_user, make_org, add_member
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.u = make_user("mod")
+        self.org = make_org(self.u)
+        self.entry = Entry.objects.create(org=self.org, author=self.u, title="Hello",
+                                          status=Entry.Status.APPROVED)
+        self.client.login(username="mod", password="pass")
+
+    def revalidate(self, url, **headers):
+        first = self.client.get(url, **headers)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.has_header("ETag"))
+        return self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"], **headers)
+
+    def test_unchanged_pages_return_304_without_rendering(self):
+        for url in (reverse("journal:index"),
+                    reverse("journal:entry_detail", args=[self.entry.pk]),
+                    reverse("journal:drafts"),
+                    reverse("journal:review_queue"),
+                    reverse("journal:tabs_table")):
+            r = self.revalidate(url)
+            self.assertEqual(r.status_code, 304, url)
+            self.assertEqual(r.templates, [], url)
+
+    def test_entry_change_invalidates_org_pages(self):
+        url = reverse("journal:index")
+        etag = self.client.get(url)["ETag"]
+        Entry.objects.create(org=self.org, author=self.u, title="New", status=Entry.Status.APPROVED)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_tab_change_invalidates_tabs_table(self):
+        url = reverse("journal:tabs_table")
+        etag = self.client.get(url)["ETag"]
+        Tab.objects.create(org=self.org, name="Fresh")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_org_rename_invalidates_org_pages(self):
+        url = reverse("journal:index")
+        etag = self.client.get(url)["ETag"]
+        self.org.name = "Renamed"
+        self.org.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_gaining_a_subuser_changes_the_nav(self):
+        author = make_user("author")
+        add_member(author, self.org, "AUTHOR")
+        self.client.login(username="author", password="pass")
+        url = reverse("journal:index")
+        etag = self.client.get(url)["ETag"]
+        sub = add_member(make_user("sub"), self.org, "SUBAUTHOR")
+        sub.managed_by = author
+        sub.save()
+        r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Review Queue")
+
+    def test_tab_rename_or_delete_invalidates_drafts(self):
+        tab = Tab.objects.create(org=self.org, name="Old")
+        draft = Entry.objects.create(org=self.org, author=self.u, title="Draft")
+        draft.tabs.add(tab)
+        url = reverse("journal:drafts")
+        etag = self.client.get(url)["ETag"]
+        tab.name = "New"
+        tab.save()
+        r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        etag = r["ETag"]
+        tab.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_entry_edit_invalidates_detail(self):
+        url = reverse("journal:entry_detail", args=[self.entry.pk])
+        etag = self.client.get(url)["ETag"]
+        self.entry.title = "Changed"
+        self.entry.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_varies_by_user_and_htmx(self):
+        url = reverse("journal:index")
+        mine = self.client.get(url)
+        self.assertIn("HX-Request", mine["Vary"])
+        self.assertIn("private", mine["Cache-Control"])
+        htmx = self.client.get(url, HTTP_HX_REQUEST="true")
+        self.assertNotEqual(mine["ETag"], htmx["ETag"])
+
+        add_member(make_user("other"), self.org, "AUTHOR")
+        self.client.login(username="other", password="pass")
+        r = self.client.get(url, HTTP_IF_NONE_MATCH=mine["ETag"])
+        self.assertEqual(r.status_code, 200)
+
+    def test_pending_messages_skip_validation(self):
+        self.client.get(reverse("journal:tutorial_disable"))  # queues "Tutorial disabled."
+        r = self.client.get(reverse("journal:index"))
+        self.assertContains(r, "Tutorial disabled.")
+        self.assertFalse(r.has_header("ETag"))
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from journal import digests
+from journal.models import DigestWatermark, Entry, OutboundEmail
+from .utils import make_user, make_org, add_member
+
+
+class DigestTests(TestCase):
+    def setUp(self):
+        self.mod = make_user("mod", email="mod@example.com")
+        self.org = make_org(self.mod)
+        self.author = make_user("author", email="author@example.com")
+        add_member(self.author, self.org)
+        self.now = timezone.now()
+
+    def entry(self, title, **times):
+        return Entry.objects.create(org=self.org, author=self.author, title=title, **times)
+
+    def mail_to(self, user):
+        return [m.body for m in OutboundEmail.objects.filter(to=[user.email])]
+
+    def test_one_digest_per_recipient(self):
+        self.entry("First", submitted_at=self.now - timedelta(hours=2))
+        self.entry("Second", submitted_at=self.now - timedelta(hours=1),
+                   approved_at=self.now - timedelta(minutes=5))
+        stats = digests.run(self.now)
+        self.assertEqual(stats["mails"], 2)
+
+        [mod_mail] = self.mail_to(self.mod)
+        self.assertIn("- First by author (Org)", mod_mail)
+        self.assertIn("- Second by author", mod_mail)
+        [author_mail] = self.mail_to(self.author)
+        self.assertIn("Your approved entries:\n- Second", author_mail)
+        self.assertNotIn("First", author_mail)
+        self.assertEqual(DigestWatermark.objects.get(user=self.mod).sent_until, self.now)
+
+    def test_watermark_prevents_repeats(self):
+        self.entry("Old", submitted_at=self.now - timedelta(hours=2))
+        digests.run(self.now - timedelta(hours=1))
+        self.entry("New", submitted_at=self.now - timedelta(minutes=30))
+        digests.run(self.now)
+        bodies = self.mail_to(self.mod)
+        self.assertEqual(len(bodies), 2)
+        self.assertIn("Old", bodies[0])
+        self.assertNotIn("Old", bodies[1])
+        self.assertIn("New", bodies[1])
+
+    def test_nothing_new_sends_nothing(self):
+        self.entry("Ancient", submitted_at=self.now - timedelta(days=30))
+        self.assertEqual(digests.run(self.now)["mails"], 0)
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_moderator_not_told_about_own_submission(self):
+        Entry.objects.create(org=self.org, author=self.mod, title="Mine", submitted_at=self.now)
+        digests.run(self.now)
+        self.assertEqual(self.mail_to(self.mod), [])
@@ -0,0 +1,87 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from journal.models import Entry
+from journal.pagination import decode_cursor, encode_cursor
+from .utils import make_user, make_org
+
+
+@override_settings(FEED_PAGE_SIZE=3)
+class IndexFeedPaginationTests(TestCase):
+    def setUp(self):
+        self.u = make_user("feeder")
+        self.org = make_org(self.u)
+        for i in range(7):
+            Entry.objects.create(org=self.org, author=self.u, title=f"E{i}",
+                                 status=Entry.Status.APPROVED)
+        Entry.objects.create(org=self.org, author=self.u, title="Draft")
+        self.client.login(username="feeder", password="pass")
+
+    def test_first_page_is_bounded(self):
+        r = self.client.get(reverse("journal:index"))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([e.title for e in r.context["entries"]], ["E6", "E5", "E4"])
+        self.assertIsNotNone(r.context["next_cursor"])
+
+    def test_walk_pages_with_cursor(self):
+        seen, cursor = [], None
+        while True:
+            url = reverse("journal:index") + (f"?cursor={cursor}" if cursor else "")
+            r = self.client.get(url, HTTP_HX_REQUEST="true")
+            seen += [e.title for e in r.context["entries"]]
+            cursor = r.context["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, [f"E{i}" for i in range(6, -1, -1)])
+
+    def test_htmx_page_renders_cards_partial(self):
+        first = self.client.get(reverse("journal:index"))
+        r = self.client.get(reverse("journal:index") + f"?cursor={first.context['next_cursor']}",
+                            HTTP_HX_REQUEST="true")
+        self.assertTemplateUsed(r, "journal/partials/entry_cards.html")
+        self.assertTemplateNotUsed(r, "journal/index.html")
+
+    def test_bad_cursor_falls_back_to_first_page(self):
+        self.assertIsNone(decode_cursor("not-a-cursor!"))
+        r = self.client.get(reverse("journal:index") + "?cursor=garbage")
+        self.assertEqual(r.context["entries"][0].title, "E6")
+
+    def test_cursor_round_trip(self):
+        e = Entry.objects.first()
+        self.assertEqual(decode_cursor(encode_cursor(e.created_at, e.pk)), (e.created_at, e.pk))
+
+
+class EntryExcerptTests(TestCase):
+    def setUp(self):
+        self.u = make_user("writer")
+        self.org = make_org(self.u)
+
+    def test_excerpt_and_word_count_follow_body(self):
+        e = Entry.objects.create(org=self.org, author=self.u, title="T", body="word " * 100)
+        self.assertEqual(e.word_count, 100)
+        self.assertEqual(e.excerpt, "word " * 39 + "word…")
+        e.body = "short one"
+        e.save(update_fields=["body"])
+        e.refresh_from_db()
+        self.assertEqual((e.excerpt, e.word_count), ("short one", 2))
+
+    def test_backfill_command(self):
+        e = Entry.objects.create(org=self.org, author=self.u, title="T", body="a b c")
+        Entry.objects.filter(pk=e.pk).update(excerpt="", word_count=0)
+        call_command("backfill_excerpts", batch_size=1, stdout=StringIO())
+        e.refresh_from_db()
+        self.assertEqual((e.excerpt, e.word_count), ("a b c", 3))
+
+    def test_feed_does_not_load_body(self):
+        Entry.objects.create(org=self.org, author=self.u, title="T", body="secret body text",
+                             status=Entry.Status.APPROVED)
+        self.client.login(username="writer", password="pass")
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(reverse("journal:index"))
+        self.assertContains(r, "secret body text")  # via the stored excerpt
+        feed_sql = [q["sql"] for q in ctx.captured_queries if 'FROM "journal_entry"' in q["sql"]]
+        self.assertTrue(feed_sql)
+        self.assertFalse(any('"journal_entry"."body"' in sql for sql in feed_sql))
@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.urls import reverse
+from journal.caching import cache_stats, reset_stats
+from journal.fragments import FRAGMENT_CACHE, render_entry
+from journal.models import Entry, Tab
+from .utils import make_user, make_org
+
+
+class EntryFragmentCacheTests(TestCase):
+    def setUp(self):
+        self.u = make_user("writer")
+        self.org = make_org(self.u)
+        self.tab = Tab.objects.create(org=self.org, name="Trips")
+        self.e = Entry.objects.create(org=self.org, author=self.u, title="Lake day",
+                                      body="Fish.", status=Entry.Status.APPROVED)
+        reset_stats(FRAGMENT_CACHE)
+
+    def fresh(self):
+        return Entry.objects.get(pk=self.e.pk)
+
+    def test_second_render_is_a_hit(self):
+        render_entry("card", self.fresh())
+        render_entry("card", self.fresh())
+        s = cache_stats(FRAGMENT_CACHE)
+        self.assertEqual((s["hits"], s["misses"]), (1, 1))
+
+    def test_edit_produces_new_fragment(self):
+        render_entry("card", self.fresh())
+        self.e.title = "Lake night"
+        self.e.save()
+        self.assertIn("Lake night", render_entry("card", self.fresh()))
+
+    def test_tab_and_rename_invalidate_body(self):
+        self.assertIn("None", render_entry("body", self.fresh()))
+        self.e.tabs.add(self.tab)
+        self.assertIn("Trips", render_entry("body", self.fresh()))
+        self.tab.name = "Outings"
+        self.tab.save()
+        self.assertIn("Outings", render_entry("body", self.fresh()))
+
+    def test_tab_delete_or_clear_invalidates_body(self):
+        self.e.tabs.add(self.tab)
+        self.assertIn("Trips", render_entry("body", self.fresh()))
+        self.tab.entries.clear()
+        self.assertNotIn("Trips", render_entry("body", self.fresh()))
+
+        doomed = Tab.objects.create(org=self.org, name="DoomedTab")
+        self.e.tabs.add(doomed)
+        self.assertIn("DoomedTab", render_entry("body", self.fresh()))
+        doomed.delete()
+        self.assertNotIn("DoomedTab", render_entry("body", self.fresh()))
+
+    def test_feed_reuses_cards(self):
+        self.client.login(username="writer", password="pass")
+        self.client.get(reverse("journal:index"))
+        r = self.client.get(reverse("journal:index"))
+        self.assertContains(r, "Lake day")
+        self.assertNotIn("journal/partials/entry_card.html", [t.name for t in r.templates])
+        self.assertEqual(cache_stats(FRAGMENT_CACHE)["hits"], 1)
@@ -0,0 +1,98 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from journal import hierarchy
+from journal.models import ManagementPath, Membership
+from journal.permissions import can_view_profile
+from .utils import make_user, make_org, add_member
+
+
+class ManagementHierarchyTests(TestCase):
+    def setUp(self):
+        # boss > lead > dev > intern, plus a second lead
+        self.boss = make_user("boss")
+        self.org = make_org(self.boss)
+        self.lead, self.lead2, self.dev, self.intern = (
+            make_user(n) for n in ("lead", "lead2", "dev", "intern"))
+        self.chain = [self.boss, self.lead, self.dev, self.intern]
+        for manager, user in zip(self.chain, self.chain[1:]):
+            self.managed(user, manager)
+        self.managed(self.lead2, self.boss)
+
+    def managed(self, user, manager, role="SUBAUTHOR"):
+        m = add_member(user, self.org, role=role)
+        m.managed_by = manager
+        m.save()
+        return m
+
+    def below(self, user):
+        return sorted(m.user.username for m in hierarchy.descendants(self.org, user).select_related("user"))
+
+    def assert_matches_rebuild(self):
+        live = set(ManagementPath.objects.values_list("org_id", "ancestor_id", "descendant_id", "depth"))
+        hierarchy.rebuild()
+        self.assertEqual(live, set(ManagementPath.objects.values_list("org_id", "ancestor_id",
+                                                                      "descendant_id", "depth")))
+
+    def test_descendants_and_ancestors(self):
+        self.assertEqual(self.below(self.boss), ["dev", "intern", "lead", "lead2"])
+        self.assertEqual(self.below(self.lead), ["dev", "intern"])
+        self.assertEqual(self.below(self.intern), [])
+        self.assertTrue(hierarchy.is_ancestor(self.boss, self.intern, self.org))
+        self.assertFalse(hierarchy.is_ancestor(self.intern, self.boss))
+        self.assertFalse(hierarchy.is_ancestor(self.lead2, self.dev))
+        self.assertEqual(ManagementPath.objects.get(ancestor=self.boss, descendant=self.intern).depth, 3)
+        with self.assertNumQueries(1):
+            list(hierarchy.descendants(self.org, self.boss))
+        self.assert_matches_rebuild()
+
+    def test_moving_a_member_moves_their_subtree(self):
+        dev = Membership.objects.get(user=self.dev, org=self.org)
+        dev.managed_by = self.lead2
+        dev.save()
+        self.assertEqual(self.below(self.lead), [])
+        self.assertEqual(self.below(self.lead2), ["dev", "intern"])
+        self.assertTrue(hierarchy.is_ancestor(self.boss, self.intern))
+        self.assert_matches_rebuild()
+
+    def test_cycles_are_refused(self):
+        lead = Membership.objects.get(user=self.lead, org=self.org)
+        lead.managed_by = self.intern
+        with self.assertRaises(ValidationError):
+            lead.save()
+        self.assertEqual(self.below(self.lead), ["dev", "intern"])
+
+    def test_deleting_a_membership_detaches_it(self):
+        Membership.objects.get(user=self.lead, org=self.org).delete()
+        self.assertEqual(self.below(self.boss), ["lead2"])
+        # dev is still managed by lead, who is no longer in the org
+        self.assertTrue(hierarchy.is_ancestor(self.lead, self.intern))
+        self.assert_matches_rebuild()
+
+    def test_paths_are_per_org(self):
+        other = make_org(make_user("owner2"), name="Other")
+        m = add_member(self.intern, other)
+        m.managed_by = self.lead2
+        m.save()
+        self.assertFalse(hierarchy.is_ancestor(self.lead2, self.intern, self.org))
+        self.assertTrue(hierarchy.is_ancestor(self.lead2, self.intern, other))
+        self.assertEqual(self.below(self.lead2), [])
+
+    def test_indirect_managers_see_profiles_and_subusers(self):
+        self.assertTrue(can_view_profile(self.lead, self.intern))
+        self.assertFalse(can_view_profile(self.lead2, self.intern))
+
+        self.client.login(username="lead", password="pass")
+        resp = self.client.get(reverse("journal:subusers"), HTTP_HX_REQUEST="true")
+        self.assertContains(resp, "intern")
+        self.assertContains(resp, "dev")
+        self.assertNotContains(resp, "lead2")
+
+    def test_adding_your_own_manager_as_subuser_is_refused(self):
+        self.boss.email = "boss@example.com"
+        self.boss.save()
+        self.client.login(username="intern", password="pass")
+        resp = self.client.post(reverse("journal:subuser_create"), {"email": "boss@example.com", "role": "SUBAUTHOR"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertContains(resp, "can&#x27;t be managed", status_code=400)
+        self.assertIsNone(Membership.objects.get(user=self.boss, org=self.org).managed_by_id)
@@ -0,0 +1,74 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+from journal import images
+from journal.models import Entry, EntryImage
+from .utils import make_user, make_org
+
+
+def jpeg(size=(2000, 1000)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, "navy").save(buf, "JPEG")
+    return SimpleUploadedFile("photo.jpg", buf.getvalue(), content_type="image/jpeg")
+
+
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media, IMAGE_VARIANT_WIDTHS=[320, 640, 4000])
+        override.enable()
+        self.addCleanup(override.disable)
+
+        user = make_user("u")
+        self.entry = Entry.objects.create(org=make_org(user), author=user, title="T")
+
+    def render(self, img):
+        return Template('{% load responsive_images %}{% responsive_img img sizes="200px" %}').render(
+            Context({"img": img}))
+
+    def test_upload_queues_task_after_commit(self):
+        with mock.patch("journal.tasks.build_image_variants.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                img = EntryImage.objects.create(entry=self.entry, image=jpeg())
+        delay.assert_called_once_with("journal.entryimage", img.pk)
+
+    def test_original_until_variants_ready(self):
+        img = EntryImage.objects.create(entry=self.entry, image=jpeg())
+        html = self.render(img)
+        self.assertIn(f'src="{img.image.url}"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertNotIn("srcset", html)
+
+    def test_variants_built_at_widths_below_original(self):
+        img = EntryImage.objects.create(entry=self.entry, image=jpeg())
+        with mock.patch("journal.tasks.build_image_variants.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                images.refresh_variants(img)
+        delay.assert_not_called()  # the variants-only save doesn't requeue
+
+        img.refresh_from_db()
+        v = img.variants
+        self.assertEqual((v["src"], v["width"], v["height"]), (img.image.name, 2000, 1000))
+        self.assertEqual([w[:2] for w in v["webp"]], [[320, 160], [640, 320]])
+        with img.image.storage.open(v["webp"][0][2]) as fh:
+            self.assertEqual(Image.open(fh).format, "WEBP")
+
+        html = self.render(img)
+        self.assertIn('type="image/webp"', html)
+        self.assertIn(" 640w", html)
+        self.assertIn('width="640"', html)
+        self.assertIn('height="320"', html)
+
+    def test_replaced_original_falls_back(self):
+        img = EntryImage.objects.create(entry=self.entry, image=jpeg())
+        images.refresh_variants(img)
+        img.image = jpeg((100, 100))
+        self.assertFalse(images.ready_variants(img))
+        self.assertTrue(images.needs_variants(img))
@@ -0,0 +1,105 @@
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from journal import mail_queue, sms
+from journal.invites import parse_recipients
+from journal.models import Invite, InviteCampaign, OutboundEmail
+from journal.tasks import send_invite_campaign
+from .utils import make_user, make_org
+
+
+class ParseRecipientsTests(TestCase):
+    def test_splits_classifies_and_dedupes(self):
+        found, bad = parse_recipients("A@Example.com, +1 (555) 123-4567\nb@example.com;a@example.com\nnope")
+        self.assertEqual(found, [("email", "a@example.com"), ("sms", "+15551234567"), ("email", "b@example.com")])
+        self.assertEqual(bad, ["nope"])
+
+
+@override_settings(SMS_BACKEND="journal.sms.LocMemBackend", INVITE_BATCH_SIZE=2)
+class InviteCampaignTests(TestCase):
+    def setUp(self):
+        self.mod = make_user("mod")
+        self.org = make_org(self.mod)
+        self.client.login(username="mod", password="pass")
+        sms.outbox.clear()
+
+    def post(self, recipients):
+        with mock.patch("journal.tasks.send_invite_campaign.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                r = self.client.post(reverse("journal:member_invite_bulk"),
+                                     {"recipients": recipients, "role": "AUTHOR"})
+        return r, delay
+
+    def test_bulk_creates_invites_and_queues_one_task(self):
+        r, delay = self.post("a@example.com\nb@example.com\n+15551234567")
+        self.assertContains(r, "3 invites queued.")
+        self.assertContains(r, 'id="invite-campaigns" class="mb-3" hx-swap-oob="true"')
+        campaign = InviteCampaign.objects.get()
+        self.assertEqual(campaign.total, 3)
+        self.assertEqual(campaign.invites.filter(delivery_status=Invite.Delivery.QUEUED).count(), 3)
+        self.assertEqual(len(set(campaign.invites.values_list("token", flat=True))), 3)
+        delay.assert_called_once_with(campaign.pk, "http://testserver")
+
+    def test_invalid_recipient_rejected(self):
+        r, delay = self.post("a@example.com, bogus")
+        self.assertContains(r, "Not an email or E.164 number: bogus")
+        self.assertFalse(Invite.objects.exists())
+        delay.assert_not_called()
+
+    def test_batches_reschedule_and_email_joins_mail_queue(self):
+        self.post("a@example.com\nb@example.com\n+15551234567")
+        campaign = InviteCampaign.objects.get()
+        with mock.patch("journal.tasks.send_invite_campaign.apply_async") as again:
+            send_invite_campaign.apply(args=[campaign.pk, "http://x"])
+        self.assertEqual(OutboundEmail.objects.filter(invite__campaign=campaign).count(), 2)
+        again.assert_called_once()
+        self.assertEqual(again.call_args.kwargs["countdown"], 60)
+
+        send_invite_campaign.apply(args=[campaign.pk, "http://x"])  # the SMS; emails aren't re-queued
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+        self.assertEqual(len(sms.outbox), 1)
+        self.assertTrue(sms.outbox[0]["body"].startswith(f"Join {self.org.name}: http://x/"))
+
+        mail_queue.flush()
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(campaign.invites.exclude(delivery_status=Invite.Delivery.SENT).exists())
+
+        r = self.client.get(reverse("journal:invite_campaigns"))
+        self.assertContains(r, "3 sent")
+        self.assertNotContains(r, "every 3s")  # nothing pending: polling stops
+        self.assertNotContains(r, "a@example.com")  # recipients load on demand
+
+        r = self.client.get(reverse("journal:invite_campaign_recipients", args=[campaign.pk]))
+        self.assertContains(r, "a@example.com")
+        self.assertContains(r, "+15551234567")
+
+    def test_progress_poll_is_one_query_whatever_the_size(self):
+        self.post("\n".join(f"u{i}@example.com" for i in range(30)))
+        self.client.get(reverse("journal:invite_campaigns"))  # warm session/membership cache
+        with self.assertNumQueries(3):  # session, user, campaigns with counts
+            r = self.client.get(reverse("journal:invite_campaigns"))
+        self.assertContains(r, "30 pending")
+        self.assertContains(r, "every 3s")
+
+    def test_recipients_of_other_orgs_hidden(self):
+        self.post("a@example.com")
+        campaign = InviteCampaign.objects.get()
+        other = make_user("mod2")
+        make_org(other, name="Other")
+        self.client.login(username="mod2", password="pass")
+        r = self.client.get(reverse("journal:invite_campaign_recipients", args=[campaign.pk]))
+        self.assertEqual(r.status_code, 404)
+
+    @override_settings(SMS_BACKEND="journal.tests.test_invite_delivery.FailingSMS")
+    def test_failures_handed_to_deliver_invite(self):
+        self.post("+15551234567")
+        inv = Invite.objects.get()
+        with mock.patch("journal.tasks.deliver_invite.apply_async") as retry:
+            send_invite_campaign.apply(args=[inv.campaign_id, "http://x"])
+        inv.refresh_from_db()
+        self.assertEqual(inv.delivery_status, Invite.Delivery.RETRYING)
+        self.assertEqual(inv.delivery_error, "gateway timeout")
+        retry.assert_called_once()
+        self.assertEqual(retry.call_args.args[0], (inv.pk, f"http://x/invite/accept/{inv.token}/"))
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from journal import mail_queue, sms
+from journal.models import Invite
+from journal.tasks import deliver_invite
+from .utils import make_user, make_org
+
+
+class FailingSMS:
+    def send(self, to, body):
+        raise sms.SMSError("gateway timeout")
+
+
+class InviteDeliveryTests(TestCase):
+    def setUp(self):
+        self.mod = make_user("mod")
+        self.org = make_org(self.mod)
+        sms.outbox.clear()
+
+    def invite(self, **kw):
+        return Invite.create(org=self.org, role="AUTHOR", created_by=self.mod, **kw)
+
+    def test_view_queues_instead_of_sending(self):
+        self.client.login(username="mod", password="pass")
+        with mock.patch("journal.tasks.deliver_invite.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                r = self.client.post(reverse("journal:member_invite"),
+                                     {"delivery": "email", "email": "new@example.com", "role": "AUTHOR"})
+        self.assertContains(r, "queued")
+        inv = Invite.objects.get()
+        delay.assert_called_once()
+        self.assertEqual(delay.call_args.args[0], inv.pk)
+        self.assertEqual(inv.delivery_status, Invite.Delivery.QUEUED)
+        self.assertEqual(mail.outbox, [])
+
+    def test_email_sent_and_recorded(self):
+        inv = self.invite(email="a@example.com")
+        deliver_invite.apply(args=[inv.pk, "http://x/accept"])
+        deliver_invite.apply(args=[inv.pk, "http://x/accept"])  # still queued: not enqueued twice
+        self.assertEqual(mail.outbox, [])
+        mail_queue.flush()
+        inv.refresh_from_db()
+        self.assertEqual(inv.delivery_status, Invite.Delivery.SENT)
+        self.assertIsNotNone(inv.delivered_at)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("http://x/accept", mail.outbox[0].body)
+
+    @override_settings(SMS_BACKEND="journal.sms.LocMemBackend")
+    def test_sms_uses_configured_backend(self):
+        inv = self.invite(phone="+15551234567", delivery="sms")
+        deliver_invite.apply(args=[inv.pk, "http://x/accept"])
+        self.assertEqual(sms.outbox, [{"to": "+15551234567", "body": f"Join {self.org.name}: http://x/accept"}])
+
+    @override_settings(SMS_BACKEND="journal.tests.test_invite_delivery.FailingSMS")
+    def test_retries_then_marks_failed(self):
+        inv = self.invite(phone="+15551234567", delivery="sms")
+        deliver_invite.apply(args=[inv.pk, "http://x/accept"])  # eager: retries run inline
+        inv.refresh_from_db()
+        self.assertEqual(inv.delivery_status, Invite.Delivery.FAILED)
+        self.assertEqual(inv.delivery_attempts, deliver_invite.max_retries + 1)
+        self.assertEqual(inv.delivery_error, "gateway timeout")
+
+    def test_already_sent_is_not_resent(self):
+        inv = self.invite(email="a@example.com")
+        Invite.objects.filter(pk=inv.pk).update(delivery_status=Invite.Delivery.SENT)
+        deliver_invite.apply(args=[inv.pk, "http://x/accept"])
+        self.assertEqual(mail.outbox, [])
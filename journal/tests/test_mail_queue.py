@@ -0,0 +1,95 @@
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from journal import mail_queue
+from journal.models import OutboundEmail
+from journal.tasks import flush_mail_queue
+
+
+class FlakyBackend(BaseEmailBackend):
+    """
+    Counts sessions; "refused@" is rejected, "big@" is too large, "down@"
+    drops the connection and "bug@" raises something unexpected.
+    """
+    sessions = 0
+
+    def open(self):
+        FlakyBackend.sessions += 1
+
+    def send_messages(self, messages):
+        for m in messages:
+            if m.to[0].startswith("refused@"):
+                raise smtplib.SMTPRecipientsRefused({m.to[0]: (550, b"no such user")})
+            if m.to[0].startswith("big@"):
+                raise smtplib.SMTPDataError(552, b"message size exceeds fixed limit")
+            if m.to[0].startswith("bug@"):
+                raise ValueError("template blew up")
+            if m.to[0].startswith("down@"):
+                raise smtplib.SMTPServerDisconnected("connection lost")
+            mail.outbox.append(m)
+        return len(messages)
+
+
+@override_settings(EMAIL_BACKEND="journal.tests.test_mail_queue.FlakyBackend")
+class MailQueueTests(TestCase):
+    def setUp(self):
+        FlakyBackend.sessions = 0
+
+    def enqueue(self, *recipients):
+        with mock.patch("journal.tasks.flush_mail_queue.apply_async") as scheduled:
+            with self.captureOnCommitCallbacks(execute=True):
+                for to in recipients:
+                    mail_queue.enqueue("Hi", "Body", [to])
+        return scheduled
+
+    def statuses(self):
+        return dict(OutboundEmail.objects.values_list("to__0", "status"))
+
+    def test_one_flush_scheduled_per_window(self):
+        scheduled = self.enqueue("a@example.com", "b@example.com", "c@example.com")
+        scheduled.assert_called_once_with(countdown=5)
+
+    def test_batch_sent_over_one_session(self):
+        self.enqueue("a@example.com", "b@example.com", "refused@example.com")
+        stats = mail_queue.flush()
+        self.assertEqual(FlakyBackend.sessions, 1)
+        self.assertEqual((stats["batch"], stats["sent"], stats["refused"]), (3, 2, 1))
+        self.assertIn("connect_ms", stats)
+        self.assertIn("send_ms", stats)
+        self.assertEqual([m.to for m in mail.outbox], [["a@example.com"], ["b@example.com"]])
+        self.assertEqual(self.statuses()["refused@example.com"], OutboundEmail.Status.FAILED)
+
+    def test_dropped_connection_requeues_the_rest(self):
+        self.enqueue("a@example.com", "down@example.com", "c@example.com")
+        with self.assertRaises(mail_queue.MailTransportError):
+            mail_queue.flush()
+        self.assertEqual(self.statuses(), {"a@example.com": "sent", "down@example.com": "pending",
+                                           "c@example.com": "pending"})
+
+    @override_settings(MAIL_MAX_ATTEMPTS=3)
+    def test_rejected_message_does_not_hold_back_the_batch(self):
+        self.enqueue("big@example.com", "a@example.com", "b@example.com")
+        stats = mail_queue.flush()
+        self.assertEqual((stats["sent"], stats["refused"], stats["requeued"]), (2, 1, 0))
+        self.assertEqual(self.statuses(), {"big@example.com": "failed", "a@example.com": "sent",
+                                           "b@example.com": "sent"})
+        self.assertEqual(OutboundEmail.objects.get(to__0="big@example.com").error,
+                         "552 message size exceeds fixed limit")
+
+    def test_unexpected_error_releases_the_batch(self):
+        self.enqueue("a@example.com", "bug@example.com", "c@example.com")
+        with self.assertRaises(ValueError):
+            mail_queue.flush()
+        self.assertEqual(self.statuses(), {"a@example.com": "sent", "bug@example.com": "pending",
+                                           "c@example.com": "pending"})
+
+    @override_settings(MAIL_MAX_ATTEMPTS=2)
+    def test_task_retries_then_gives_up(self):
+        self.enqueue("down@example.com")
+        flush_mail_queue.apply()  # eager: retries run inline
+        msg = OutboundEmail.objects.get()
+        self.assertEqual((msg.status, msg.attempts), (OutboundEmail.Status.FAILED, 2))
+        self.assertEqual(msg.error, "connection lost")
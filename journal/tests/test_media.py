@@ -0,0 +1,126 @@
+import io
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from journal import images
+from journal.models import Entry, EntryImage, Membership, ProfileImage, UserProfile
+from journal.utils import active_membership
+from journal.views_media import can_read_media
+from .utils import make_user, make_org, add_member
+
+
+def photo():
+    buf = io.BytesIO()
+    Image.new("RGB", (800, 400), "teal").save(buf, "JPEG")
+    return SimpleUploadedFile("p.jpg", buf.getvalue(), content_type="image/jpeg")
+
+
+class ProtectedMediaTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media, MEDIA_ACCEL_REDIRECT=False, IMAGE_VARIANT_WIDTHS=[320])
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.member = make_user("member")
+        org = make_org(self.member)
+        entry = Entry.objects.create(org=org, author=self.member, title="T")
+        self.img = EntryImage.objects.create(entry=entry, image=photo())
+        self.url = f"/media/{self.img.image.name}"
+        make_org(make_user("outsider"), name="Elsewhere")
+
+    def test_member_gets_file_with_immutable_caching(self):
+        self.client.login(username="member", password="pass")
+        r = self.client.get(self.url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", r["Cache-Control"])
+        self.assertEqual(b"".join(r.streaming_content), self.img.image.read())
+
+    def test_outsiders_and_anonymous_get_404(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.client.login(username="outsider", password="pass")
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_variant_checked_against_its_blob(self):
+        images.refresh_variants(self.img)
+        self.img.refresh_from_db()
+        variant = self.img.variants["webp"][0][2]
+        self.client.login(username="member", password="pass")
+        self.assertEqual(self.client.get(f"/media/{variant}").status_code, 200)
+
+    def test_range_request(self):
+        self.client.login(username="member", password="pass")
+        r = self.client.get(self.url, HTTP_RANGE="bytes=0-9")
+        self.assertEqual(r.status_code, 206)
+        self.assertEqual(len(r.content), 10)
+        self.assertTrue(r["Content-Range"].startswith("bytes 0-9/"))
+
+    @override_settings(MEDIA_ACCEL_REDIRECT=True)
+    def test_hands_off_to_nginx(self):
+        self.client.login(username="member", password="pass")
+        r = self.client.get(self.url)
+        self.assertEqual(r["X-Accel-Redirect"], f"/protected-media/{self.img.image.name}")
+        self.assertEqual(r.content, b"")
+
+    def test_single_query_permission_check(self):
+        active_membership(self.member).memberships  # request-scoped, already loaded by middleware
+        with self.assertNumQueries(1):
+            self.assertTrue(can_read_media(self.member, self.img.image.name))
+
+    def test_traversal_rejected(self):
+        self.client.login(username="member", password="pass")
+        self.assertEqual(self.client.get("/media/cas/../../settings.py").status_code, 404)
+
+
+def colored(color):
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 40), color).save(buf, "JPEG")
+    return SimpleUploadedFile("c.jpg", buf.getvalue(), content_type="image/jpeg")
+
+
+class MediaVisibilityTests(TestCase):
+    """Org membership alone doesn't open drafts or hidden library images."""
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.member = make_user("member")  # owns (so moderates) the org
+        self.org = make_org(self.member)
+        self.author = make_user("author")
+        add_member(self.author, self.org)
+        self.peer = make_user("peer")
+        add_member(self.peer, self.org)
+
+    def test_draft_images_only_for_author_moderators_and_managers(self):
+        draft = Entry.objects.create(org=self.org, author=self.author, title="D")
+        name = EntryImage.objects.create(entry=draft, image=colored("navy")).image.name
+        self.assertTrue(can_read_media(self.author, name))
+        self.assertTrue(can_read_media(self.member, name))  # owner moderates the org
+        self.assertFalse(can_read_media(self.peer, name))
+
+        m = Membership.objects.get(user=self.author, org=self.org)
+        m.managed_by = self.peer
+        m.save()
+        self.assertTrue(can_read_media(self.peer, name))
+
+    def test_approved_entry_images_for_every_member(self):
+        entry = Entry.objects.create(org=self.org, author=self.author, title="A", status=Entry.Status.APPROVED)
+        name = EntryImage.objects.create(entry=entry, image=colored("olive")).image.name
+        self.assertTrue(can_read_media(self.peer, name))
+
+    def test_hidden_library_images(self):
+        profile = UserProfile.objects.get(user=self.author)
+        hidden = ProfileImage.objects.create(profile=profile, image=colored("maroon"), visible=False)
+        shown = ProfileImage.objects.create(profile=profile, image=colored("silver"))
+        self.assertTrue(can_read_media(self.peer, shown.image.name))
+        self.assertFalse(can_read_media(self.peer, hidden.image.name))
+        self.assertTrue(can_read_media(self.author, hidden.image.name))
@@ -0,0 +1,80 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+from journal import images
+from journal.media_gc import collect
+from journal.models import Entry, EntryImage
+from .utils import make_user, make_org
+
+
+def photo():
+    buf = io.BytesIO()
+    Image.new("RGB", (800, 400), "olive").save(buf, "JPEG")
+    return SimpleUploadedFile("p.jpg", buf.getvalue(), content_type="image/jpeg")
+
+
+class MediaGCTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media, IMAGE_VARIANT_WIDTHS=[320])
+        override.enable()
+        self.addCleanup(override.disable)
+
+        user = make_user("u")
+        entry = Entry.objects.create(org=make_org(user), author=user, title="T")
+        img = EntryImage.objects.create(entry=entry, image=photo())
+        images.refresh_variants(img)
+        img.refresh_from_db()
+        self.kept = [img.image.name] + [v[2] for v in img.variants["webp"] + img.variants["jpeg"]]
+        self.orphans = {"cas/00/00/" + "0" * 64 + ".jpg": b"x" * 10,
+                        "entry_images/99/old.jpg": b"y" * 20,
+                        "profiles/7/gone.w320.webp": b"z" * 5}
+        for name, data in self.orphans.items():
+            self.write(name, data)
+
+        old = time.time() - 3 * 86400
+        for root, _, files in os.walk(self.media):
+            for f in files:
+                os.utime(os.path.join(root, f), (old, old))
+        self.fresh = "entry_images/99/uploading.jpg"
+        self.write(self.fresh, b"new")
+
+    def write(self, name, data):
+        path = os.path.join(self.media, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as fh:
+            fh.write(data)
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.media, name))
+
+    def test_dry_run_reports_without_touching(self):
+        stats = collect(dry_run=True, batch_size=2)
+        self.assertEqual(stats["orphans"], 3)
+        self.assertEqual(stats["bytes"], 35)
+        self.assertTrue(all(self.exists(n) for n in self.orphans))
+
+    def test_orphans_quarantined_referenced_kept(self):
+        stats = collect(batch_size=2)
+        self.assertEqual(stats["orphans"], 3)
+        for name in self.orphans:
+            self.assertFalse(self.exists(name))
+            self.assertTrue(os.path.exists(os.path.join(stats["quarantine"], name)))
+        self.assertTrue(all(self.exists(n) for n in self.kept))
+        self.assertTrue(self.exists(self.fresh))  # inside the grace period
+
+    def test_command_deletes(self):
+        out = io.StringIO()
+        call_command("gc_media", "--delete", stdout=out)
+        self.assertIn("3 orphans", out.getvalue())
+        self.assertIn("Reclaimed 35", out.getvalue())
+        self.assertFalse(any(self.exists(n) for n in self.orphans))
+        self.assertFalse(self.exists(".quarantine"))
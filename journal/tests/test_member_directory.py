@@ -0,0 +1,54 @@
+from django.test import TestCase
+from django.urls import reverse
+from journal.directory import normalize, search_members
+from journal.models import MemberNameToken, UserProfile
+from .utils import make_user, make_org, add_member
+
+
+class MemberDirectoryTests(TestCase):
+    def setUp(self):
+        self.mod = make_user("mod")
+        self.org = make_org(self.mod)
+        self.jose = make_user("jgarcia", first_name="José", last_name="García")
+        add_member(self.jose, self.org)
+        profile = UserProfile.objects.get(user=self.jose)
+        profile.set_nicknames(["Pepe", "Big J"])
+        profile.save()
+        self.other_org = make_org(make_user("owner2"), name="Other")
+        add_member(make_user("joan"), self.other_org)
+
+    def names(self, q):
+        return [m.user.username for m in search_members(self.org, q)]
+
+    def test_normalize(self):
+        self.assertEqual(normalize("  José-María O'Neil "), ["jose", "maria", "o", "neil"])
+
+    def test_prefix_matches_names_and_nicknames(self):
+        self.assertEqual(self.names("jos"), ["jgarcia"])
+        self.assertEqual(self.names("pep"), ["jgarcia"])
+        self.assertEqual(self.names("GARC big"), ["jgarcia"])
+        self.assertEqual(self.names("jose pepx"), [])
+        self.assertEqual(self.names("jo"), ["jgarcia"])  # joan is in another org
+
+    def test_tokens_follow_profile_and_membership_changes(self):
+        profile = UserProfile.objects.get(user=self.jose)
+        profile.set_nicknames(["Skipper"])
+        profile.save()
+        self.assertEqual(self.names("pepe"), [])
+        self.assertEqual(self.names("skip"), ["jgarcia"])
+
+        self.jose.memberships.get(org=self.org).delete()
+        self.assertEqual(self.names("skip"), [])
+        self.assertFalse(MemberNameToken.objects.filter(user=self.jose).exists())
+
+    def test_autocomplete_endpoint(self):
+        self.client.login(username="mod", password="pass")
+        r = self.client.get(reverse("journal:member_search"), {"q": "big"}, HTTP_HX_REQUEST="true")
+        self.assertContains(r, "@jgarcia")
+        r = self.client.get(reverse("journal:member_search"), {"q": "zzz"})
+        self.assertContains(r, "No members match")
+
+    def test_autocomplete_is_for_moderators_only(self):
+        self.client.login(username="jgarcia", password="pass")
+        r = self.client.get(reverse("journal:member_search"), {"q": "mod"}, HTTP_HX_REQUEST="true")
+        self.assertEqual(r.status_code, 403)
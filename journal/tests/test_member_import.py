@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from journal import member_import
+from journal.directory import search_members
+from journal.models import Membership, UserProfile
+from .utils import make_user, make_org, add_member
+
+User = get_user_model()
+URL = reverse("journal:member_import")
+
+
+class MemberImportTests(TestCase):
+    def setUp(self):
+        self.mod = make_user("mod")
+        self.org = make_org(self.mod)
+        make_user("taken")
+        self.client.login(username="mod", password="pass")
+
+    def test_bad_rows_reported_and_nothing_created(self):
+        csv = ("username,email,role,password\n"
+               "alice,alice@example.com,author,pw-alice\n"
+               "Taken,,,\n"
+               "bob,not-an-email,KING,\n"
+               "ALICE,,,\n")
+        r = self.client.post(URL, {"rows": csv})
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "3 of 4 rows need fixing")
+        self.assertContains(r, "Username already exists.")
+        self.assertContains(r, "Invalid email.")
+        self.assertContains(r, "Unknown role")
+        self.assertContains(r, "Username repeated in this import.")
+        self.assertNotContains(r, 'id="members-table"')
+        self.assertFalse(User.objects.filter(username="alice").exists())
+
+    @override_settings(PASSWORD_HASH_WORKERS=0)
+    def test_creates_users_profiles_and_memberships(self):
+        csv = "alice,alice@example.com,moderator,pw-alice\nbob,,,\n"
+        r = self.client.post(URL, {"rows": csv})
+        self.assertContains(r, "Imported 2 members.")
+        self.assertContains(r, 'id="members-table" hx-swap-oob="true"')
+        alice, bob = User.objects.get(username="alice"), User.objects.get(username="bob")
+        self.assertTrue(alice.check_password("pw-alice"))
+        self.assertFalse(bob.has_usable_password())
+        self.assertEqual(Membership.objects.get(user=alice, org=self.org).role, "MODERATOR")
+        self.assertEqual(Membership.objects.get(user=bob, org=self.org).role, "AUTHOR")
+        self.assertEqual(UserProfile.objects.filter(user__in=[alice, bob]).count(), 2)
+        self.assertEqual([m.user for m in search_members(self.org, "ali")], [alice])
+
+    def test_authors_cannot_import(self):
+        add_member(make_user("writer"), self.org)
+        self.client.login(username="writer", password="pass")
+        r = self.client.post(URL, {"rows": "eve,,,\n"})
+        self.assertEqual(r.status_code, 403)
+        self.assertFalse(User.objects.filter(username="eve").exists())
+
+    @override_settings(MEMBER_IMPORT_MAX_ROWS=1)
+    def test_row_limit(self):
+        r = self.client.post(URL, {"rows": "a,,,\nb,,,\n"})
+        self.assertContains(r, "At most 1 rows per import.")
+        self.assertFalse(User.objects.filter(username="a").exists())
+
+    @override_settings(PASSWORD_HASH_WORKERS=2)
+    def test_hash_passwords_in_pool_keeps_order(self):
+        hashes = member_import.hash_passwords(["one", "", "two", "three"])
+        self.assertTrue(check_password("one", hashes[0]))
+        self.assertFalse(check_password("", hashes[1]))
+        self.assertTrue(check_password("two", hashes[2]))
+        self.assertTrue(check_password("three", hashes[3]))
@@ -0,0 +1,109 @@
+import html
+import re
+from urllib.parse import parse_qsl, urlsplit
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from journal.models import Membership
+from journal.permissions import can_manage_map
+from journal.templatetags.can_manage import user_can_manage_user
+from .utils import make_user, make_org, add_member
+
+
+class MembersTablePermissionTests(TestCase):
+    def setUp(self):
+        self.owner = make_user("owner")
+        self.org = make_org(self.owner)
+        self.mod = make_user("mod")
+        add_member(self.mod, self.org, "MODERATOR")
+        for i, role in enumerate(["ADMIN", "AUTHOR", "SUBAUTHOR"]):
+            add_member(make_user(f"m{i}"), self.org, role)
+
+    def test_map_matches_single_filter(self):
+        rows = list(Membership.objects.filter(org=self.org).select_related("user"))
+        for actor in (self.owner, self.mod):
+            perms = can_manage_map(actor, rows)
+            for m in rows:
+                self.assertEqual(perms[m.pk], user_can_manage_user(actor, m.user), (actor, m))
+
+    def test_table_query_count_does_not_grow_with_rows(self):
+        self.client.login(username="mod", password="pass")
+        url = reverse("journal:members")
+        self.client.get(url, HTTP_HX_REQUEST="true")  # warm session/membership cache
+
+        with CaptureQueriesContext(connection) as small:
+            r = self.client.get(url, HTTP_HX_REQUEST="true")
+        self.assertEqual(r.status_code, 200)
+        for i in range(10):
+            add_member(make_user(f"extra{i}"), self.org, "AUTHOR")
+        self.client.get(url, HTTP_HX_REQUEST="true")  # re-cache the member count
+        with CaptureQueriesContext(connection) as big:
+            r = self.client.get(url, HTTP_HX_REQUEST="true")
+        self.assertEqual(len(big.captured_queries), len(small.captured_queries))
+        self.assertContains(r, "Edit profile", count=12)  # 10 extra authors + 2 original lower roles
+
+    def test_outsider_rows_are_not_manageable(self):
+        other = make_org(make_user("other_owner"), name="Other")
+        rows = list(Membership.objects.filter(org=other))
+        self.assertEqual(set(can_manage_map(self.owner, rows).values()), {False})
+
+    def test_set_role_only_below_own_rank(self):
+        self.client.login(username="mod", password="pass")
+        mine = Membership.objects.get(user=self.mod, org=self.org)
+        owners = Membership.objects.get(user=self.owner, org=self.org)
+        author = Membership.objects.get(user__username="m1", org=self.org)
+        url = lambda m: reverse("journal:member_set_role", args=[m.pk])
+
+        self.assertEqual(self.client.post(url(mine), {"role": "OWNER"}).status_code, 403)
+        self.assertEqual(self.client.post(url(owners), {"role": "SUBAUTHOR"}).status_code, 403)
+        self.assertEqual(self.client.post(url(author), {"role": "ADMIN"}).status_code, 403)
+        r = self.client.post(url(author), {"role": "SUBAUTHOR"})
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, '<option value="ADMIN"', count=1)  # the role filter, not the row selects
+        self.assertEqual(Membership.objects.get(pk=mine.pk).role, "MODERATOR")
+        self.assertEqual(Membership.objects.get(pk=owners.pk).role, "OWNER")
+        self.assertEqual(Membership.objects.get(pk=author.pk).role, "SUBAUTHOR")
+
+
+class MembersTablePagingTests(TestCase):
+    def setUp(self):
+        self.owner = make_user("owner", first_name="Zed")
+        self.org = make_org(self.owner)
+        for i in range(5):
+            add_member(make_user(f"a{i}", first_name=f"Ann{i}", email=f"{9 - i}@example.com"), self.org,
+                       "SUBAUTHOR" if i % 2 else "AUTHOR")
+        self.client.login(username="owner", password="pass")
+        self.url = reverse("journal:members")
+
+    def names(self, r):
+        return re.findall(r'<div class="fw-semibold">(\w+)', r.content.decode())
+
+    @override_settings(MEMBERS_PAGE_SIZE=2)
+    def test_keyset_pages_cover_everyone_once(self):
+        seen, params = [], {}
+        while True:
+            r = self.client.get(self.url, params, HTTP_HX_REQUEST="true")
+            seen += self.names(r)
+            m = re.search(r'hx-get="([^"]*cursor=[^"]*)"[^>]*>Next', r.content.decode())
+            if not m:
+                break
+            params = dict(parse_qsl(urlsplit(html.unescape(m.group(1))).query))
+        self.assertEqual(seen, ["Ann0", "Ann1", "Ann2", "Ann3", "Ann4", "Zed"])
+        self.assertContains(r, "6 members")
+
+    def test_sort_and_role_filter(self):
+        r = self.client.get(self.url, {"sort": "-name"}, HTTP_HX_REQUEST="true")
+        self.assertEqual(self.names(r)[:2], ["Zed", "Ann4"])
+        r = self.client.get(self.url, {"sort": "email", "role_filter": "SUBAUTHOR"}, HTTP_HX_REQUEST="true")
+        self.assertEqual(self.names(r), ["Ann3", "Ann1"])
+        self.assertContains(r, "2 members")
+
+    def test_total_is_cached_until_membership_changes(self):
+        self.client.get(self.url, HTTP_HX_REQUEST="true")
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url, HTTP_HX_REQUEST="true")
+        self.assertFalse(any("COUNT(" in q["sql"] for q in ctx.captured_queries))
+        add_member(make_user("late"), self.org)
+        self.assertContains(self.client.get(self.url, HTTP_HX_REQUEST="true"), "7 members")
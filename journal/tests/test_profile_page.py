@@ -0,0 +1,56 @@
+from django.test import TestCase
+from django.urls import reverse
+from journal.caching import cache_stats, reset_stats
+from journal.models import CustomField, SocialLink, UserProfile
+from journal.profiles import PROFILE_CACHE, load_profile, render_profile
+from .utils import make_user, make_org, add_member
+
+
+class ProfilePageTests(TestCase):
+    def setUp(self):
+        self.mod = make_user("mod")
+        self.org = make_org(self.mod)
+        self.kid = make_user("kid")
+        m = add_member(self.kid, self.org, role="SUBAUTHOR")
+        m.managed_by = self.mod
+        m.save()
+        self.profile = UserProfile.objects.get(user=self.kid)
+        self.profile.full_name = "Kid Example"
+        self.profile.save()
+        SocialLink.objects.create(profile=self.profile, platform="Mastodon", handle="@kid", url="https://m.example/kid")
+        SocialLink.objects.create(profile=self.profile, platform="Hidden", url="https://h.example", visible=False)
+        CustomField.objects.create(profile=self.profile, label="Hobby", value="Fishing")
+        reset_stats(PROFILE_CACHE)
+
+    def test_loader_uses_fixed_queries(self):
+        with self.assertNumQueries(4):
+            profile = load_profile(self.kid.pk)
+            self.assertEqual([s.platform for s in profile.visible_socials], ["Mastodon"])
+            self.assertEqual([c.label for c in profile.visible_custom_items], ["Hobby"])
+            self.assertEqual(profile.visible_images, [])
+            self.assertEqual(profile.user.username, "kid")
+
+    def test_cached_until_a_row_changes(self):
+        self.assertIn("Kid Example", render_profile(self.kid.pk))
+        with self.assertNumQueries(0):
+            html = render_profile(self.kid.pk)
+        self.assertNotIn("Hidden", html)
+        self.assertEqual(cache_stats(PROFILE_CACHE)["hits"], 1)
+
+        SocialLink.objects.filter(platform="Hidden").first().delete()
+        CustomField.objects.create(profile=self.profile, label="Pet", value="Rex")
+        self.assertIn("Rex", render_profile(self.kid.pk))
+        self.profile.full_name = "Kid Renamed"
+        self.profile.save()
+        self.assertIn("Kid Renamed", render_profile(self.kid.pk))
+
+    def test_view_for_manager_and_stranger(self):
+        self.client.login(username="mod", password="pass")
+        r = self.client.get(reverse("journal:profile_detail_by_id", args=[self.kid.pk]))
+        self.assertContains(r, "Mastodon: @kid")
+        self.assertContains(r, reverse("journal:profile_edit_user", args=[self.kid.pk]))
+
+        make_user("stranger")
+        self.client.login(username="stranger", password="pass")
+        r = self.client.get(reverse("journal:profile_detail_by_id", args=[self.kid.pk]))
+        self.assertEqual(r.status_code, 403)
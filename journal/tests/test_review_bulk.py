@@ -0,0 +1,53 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from journal.models import Entry
+from .utils import make_user, make_org, add_member
+
+
+class BulkReviewTests(TestCase):
+    def setUp(self):
+        self.mod = make_user("mod")
+        self.org = make_org(self.mod)
+        self.author = make_user("author")
+        add_member(self.author, self.org, "AUTHOR")
+        P = Entry.Status.PENDING
+        self.pending = [Entry.objects.create(org=self.org, author=self.author, title=f"P{i}", status=P)
+                        for i in range(5)]
+        other = make_org(make_user("x"), name="Other")
+        self.foreign = Entry.objects.create(org=other, author=self.author, title="F", status=P)
+        self.url = reverse("journal:entry_review_bulk")
+
+    def test_bulk_approve_single_update(self):
+        self.client.login(username="mod", password="pass")
+        ids = [e.pk for e in self.pending[:3]] + [self.foreign.pk]
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.post(self.url, {"action": "approve", "ids": ids})
+        self.assertEqual(r.status_code, 200)
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "journal_entry"')]
+        self.assertEqual(len(updates), 1)
+
+        approved = Entry.objects.filter(status=Entry.Status.APPROVED)
+        self.assertEqual(set(approved.values_list("pk", flat=True)), {e.pk for e in self.pending[:3]})
+        self.assertTrue(all(e.reviewer_id == self.mod.pk and e.approved_at for e in approved))
+        self.assertEqual(Entry.objects.get(pk=self.foreign.pk).status, Entry.Status.PENDING)
+        self.assertContains(r, "P3")
+        self.assertNotContains(r, "P0")
+
+    def test_bulk_send_back(self):
+        self.client.login(username="mod", password="pass")
+        self.client.post(self.url, {"action": "reject", "ids": [self.pending[0].pk]})
+        self.assertEqual(Entry.objects.get(pk=self.pending[0].pk).status, Entry.Status.DRAFT)
+
+    def test_authors_cannot_bulk_review(self):
+        self.client.login(username="author", password="pass")
+        r = self.client.post(self.url, {"action": "approve", "ids": [self.pending[0].pk]})
+        self.assertEqual(r.status_code, 403)
+
+    def test_bulk_change_invalidates_review_etag(self):
+        self.client.login(username="mod", password="pass")
+        etag = self.client.get(reverse("journal:review_queue"), HTTP_HX_REQUEST="true")["ETag"]
+        self.client.post(self.url, {"action": "approve", "ids": [self.pending[0].pk]})
+        r = self.client.get(reverse("journal:review_queue"), HTTP_HX_REQUEST="true", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
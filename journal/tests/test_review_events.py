@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from journal import events
+from journal.models import Entry
+from journal.views_events import review_event_html
+from .utils import make_user, make_org, add_member
+
+
+class _Recorder:
+    def __init__(self):
+        self.sent = []
+
+    def publish(self, org_id, event):
+        self.sent.append((org_id, event))
+
+
+class LocalBrokerTests(TestCase):
+    def test_publish_from_another_thread_reaches_subscriber(self):
+        broker = events.LocalBroker()
+
+        async def run():
+            stream = broker.subscribe(7)
+            first = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0)  # let the subscription register
+            threading.Thread(target=broker.publish, args=(7, {"kind": "submitted", "ids": [1]})).start()
+            threading.Thread(target=broker.publish, args=(8, {"kind": "submitted", "ids": [2]})).start()
+            got = await asyncio.wait_for(first, 2)
+            await stream.aclose()
+            return got
+
+        self.assertEqual(asyncio.run(run()), {"kind": "submitted", "ids": [1]})
+        self.assertEqual(dict(broker._subs), {})
+
+
+class ReviewEventTests(TestCase):
+    def setUp(self):
+        self.mod = make_user("mod")
+        self.org = make_org(self.mod)
+        self.author = make_user("author")
+        add_member(self.author, self.org, "AUTHOR")
+        self.entry = Entry.objects.create(org=self.org, author=self.author, title="Queued",
+                                          status=Entry.Status.PENDING)
+        self.recorder = _Recorder()
+        events._broker, self._saved = self.recorder, events._broker
+
+    def tearDown(self):
+        events._broker = self._saved
+
+    def test_approve_publishes_after_commit(self):
+        self.client.login(username="mod", password="pass")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("journal:entry_approve", args=[self.entry.pk]))
+        self.assertEqual(self.recorder.sent, [(self.org.pk, {"kind": "reviewed", "ids": [self.entry.pk]})])
+
+    def test_publish_draft_announces_submission(self):
+        draft = Entry.objects.create(org=self.org, author=self.author, title="D", status=Entry.Status.DRAFT)
+        self.client.login(username="author", password="pass")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("journal:entry_publish", args=[draft.pk]))
+        self.assertEqual(self.recorder.sent, [(self.org.pk, {"kind": "submitted", "ids": [draft.pk]})])
+
+    def test_event_html_appends_or_deletes_rows(self):
+        request = RequestFactory().get("/")
+        request.user = self.mod
+        html = review_event_html(request, self.org, {"kind": "submitted", "ids": [self.entry.pk]})
+        self.assertIn('hx-swap-oob="beforeend:#review-tbody"', html)
+        self.assertIn("Queued", html)
+        self.assertIn('id="review-count"', html)
+
+        html = review_event_html(request, self.org, {"kind": "reviewed", "ids": [self.entry.pk]})
+        self.assertIn(f'<tr id="review-{self.entry.pk}" hx-swap-oob="delete">', html)
+        self.assertNotIn("Queued", html)
+
+    def test_stream_is_moderator_only(self):
+        self.client.login(username="author", password="pass")
+        self.assertEqual(self.client.get(reverse("journal:review_events")).status_code, 403)
@@ -0,0 +1,65 @@
+from django.test import TestCase
+from django.urls import reverse
+from journal.models import Entry, Tab
+from .utils import make_user, make_org
+
+
+class RowLevelSwapTests(TestCase):
+    def setUp(self):
+        self.mod = make_user("mod")
+        self.org = make_org(self.mod)
+        self.client.login(username="mod", password="pass")
+
+    def test_approve_returns_only_oob_status(self):
+        a, b = (Entry.objects.create(org=self.org, author=self.mod, title=t, status=Entry.Status.PENDING)
+                for t in ("First", "Second"))
+        r = self.client.post(reverse("journal:entry_approve", args=[a.pk]))
+        self.assertNotContains(r, "Second")  # other rows aren't re-rendered
+        self.assertContains(r, '<span id="review-count" class="badge text-bg-secondary" hx-swap-oob="true">1</span>', html=True)
+        self.assertContains(r, 'id="review-empty" hidden')
+
+    def test_last_draft_removed_shows_empty_state(self):
+        e = Entry.objects.create(org=self.org, author=self.mod, title="Only draft")
+        r = self.client.post(reverse("journal:entry_delete", args=[e.pk]))
+        self.assertFalse(Entry.objects.filter(pk=e.pk).exists())
+        self.assertContains(r, "No drafts.")
+        self.assertNotContains(r, 'id="drafts-empty" hidden')
+        self.assertContains(r, ">0</span>")
+
+    def test_publish_removes_row(self):
+        e = Entry.objects.create(org=self.org, author=self.mod, title="Ready")
+        Entry.objects.create(org=self.org, author=self.mod, title="Later")
+        r = self.client.post(reverse("journal:entry_publish", args=[e.pk]))
+        self.assertNotContains(r, "Later")
+        self.assertContains(r, ">1</span>")
+
+    def test_tab_actions_return_single_row(self):
+        Tab.objects.create(org=self.org, name="Existing")
+        r = self.client.post(reverse("journal:tab_create"), {"name": "Family", "enabled": "on"})
+        t = Tab.objects.get(org=self.org, name="Family")
+        self.assertContains(r, f'id="tab-row-{t.pk}"')
+        self.assertNotContains(r, "Existing")
+        self.assertContains(r, ">2</span>")
+
+        r = self.client.post(reverse("journal:tab_toggle", args=[t.pk]))
+        self.assertTemplateUsed(r, "journal/partials/tab_row.html")
+        self.assertTemplateNotUsed(r, "journal/partials/tabs_table.html")
+        t.refresh_from_db()
+        self.assertFalse(t.enabled)
+
+        r = self.client.post(reverse("journal:tab_save_row", args=[t.pk]), {"name": "Kin"})
+        self.assertContains(r, "Kin")
+        self.assertTemplateUsed(r, "journal/partials/tab_row.html")
+
+    def test_duplicate_tab_name_reports_error(self):
+        Tab.objects.create(org=self.org, name="Family")
+        r = self.client.post(reverse("journal:tab_create"), {"name": "Family"})
+        self.assertContains(r, "already exists")
+        self.assertEqual(Tab.objects.filter(org=self.org, name="Family").count(), 1)
+
+    def test_inline_edit_and_cancel(self):
+        t = Tab.objects.create(org=self.org, name="Family")
+        r = self.client.get(reverse("journal:tab_edit_row", args=[t.pk]))
+        self.assertContains(r, reverse("journal:tab_save_row", args=[t.pk]))
+        r = self.client.get(reverse("journal:tab_row", args=[t.pk]))
+        self.assertTemplateUsed(r, "journal/partials/tab_row.html")
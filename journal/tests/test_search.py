@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from journal.models import Entry, Tab
+from journal.search import search_entries
+from .utils import make_user, make_org
+
+
+class EntrySearchTests(TestCase):
+    def setUp(self):
+        self.u = make_user("writer")
+        self.org = make_org(self.u)
+        self.tab = Tab.objects.create(org=self.org, name="Trips")
+        A = Entry.Status.APPROVED
+        self.fish = Entry.objects.create(org=self.org, author=self.u, status=A,
+                                         title="Fishing trip", body="We caught fish at the lake.")
+        self.fish.tabs.add(self.tab)
+        self.cake = Entry.objects.create(org=self.org, author=self.u, status=A,
+                                         title="Birthday", body="Cake and a short fishing story.")
+        self.draft = Entry.objects.create(org=self.org, author=self.u,
+                                          title="Fishing draft", body="not yet")
+        for i in range(4):  # unrelated rows so term rarity means something to the ranker
+            Entry.objects.create(org=self.org, author=self.u, status=A,
+                                 title=f"Note {i}", body="Groceries and chores.")
+        other = make_org(make_user("other"), name="Other")
+        Entry.objects.create(org=other, author=self.u, status=A, title="Fishing elsewhere")
+
+    def test_ranked_and_scoped_to_org_and_status(self):
+        rows, more = search_entries(self.org, "fishing")
+        self.assertEqual(rows, [self.fish, self.cake])
+        self.assertFalse(more)
+
+    def test_prefix_and_tab_filter(self):
+        rows, _ = search_entries(self.org, "fish", tab=self.tab)
+        self.assertEqual(rows, [self.fish])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.cake.body = "Cake only."
+        self.cake.save()
+        self.assertEqual(search_entries(self.org, "fishing")[0], [self.fish])
+        self.fish.delete()
+        self.assertEqual(search_entries(self.org, "fishing")[0], [])
+
+    def test_paginates(self):
+        rows, more = search_entries(self.org, "fishing", size=1)
+        self.assertEqual((rows, more), ([self.fish], True))
+        rows, more = search_entries(self.org, "fishing", size=1, page=2)
+        self.assertEqual((rows, more), ([self.cake], False))
+
+    def test_user_syntax_is_not_fts_syntax(self):
+        self.assertEqual(search_entries(self.org, 'fishing" -(*')[0], [self.fish, self.cake])
+        self.assertEqual(search_entries(self.org, "  ")[0], [])
+
+    def test_no_like_scan(self):
+        with CaptureQueriesContext(connection) as ctx:
+            search_entries(self.org, "fishing")
+        self.assertFalse(any(" LIKE " in q["sql"].upper() for q in ctx.captured_queries))
+
+    def test_htmx_endpoint(self):
+        self.client.login(username="writer", password="pass")
+        r = self.client.get(reverse("journal:entry_search"), {"q": "lake"}, HTTP_HX_REQUEST="true")
+        self.assertTemplateUsed(r, "journal/partials/search_results.html")
+        self.assertContains(r, "Fishing trip")
+        self.assertNotContains(r, "Birthday")
@@ -0,0 +1,102 @@
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from journal import images
+from journal.models import Entry, EntryImage, MediaBlob
+from journal.storage import blob_storage, retain
+from .utils import make_user, make_org
+
+
+def photo(name="p.jpg", color="red"):
+    buf = io.BytesIO()
+    Image.new("RGB", (800, 400), color).save(buf, "JPEG")
+    return SimpleUploadedFile(name, buf.getvalue(), content_type="image/jpeg")
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media, IMAGE_VARIANT_WIDTHS=[320])
+        override.enable()
+        self.addCleanup(override.disable)
+
+        user = make_user("u")
+        org = make_org(user)
+        self.e1 = Entry.objects.create(org=org, author=user, title="one")
+        self.e2 = Entry.objects.create(org=org, author=user, title="two")
+
+    def blob_files(self):
+        return sorted(f for _, _, files in os.walk(os.path.join(self.media, "cas")) for f in files)
+
+    def test_same_bytes_stored_once(self):
+        a = EntryImage.objects.create(entry=self.e1, image=photo("a.jpg"))
+        b = EntryImage.objects.create(entry=self.e2, image=photo("b.JPG"))
+        self.assertEqual(a.image.name, b.image.name)
+        self.assertTrue(a.image.name.startswith("cas/"))
+        self.assertEqual(len(self.blob_files()), 1)
+        self.assertEqual(MediaBlob.objects.get(name=a.image.name).refs, 2)
+
+        EntryImage.objects.create(entry=self.e1, image=photo("c.jpg", "blue"))
+        self.assertEqual(len(self.blob_files()), 2)
+
+    def test_blob_deleted_with_last_reference(self):
+        a = EntryImage.objects.create(entry=self.e1, image=photo())
+        b = EntryImage.objects.create(entry=self.e2, image=photo())
+        images.refresh_variants(a)
+        self.assertEqual(len(self.blob_files()), 3)  # original + webp + jpeg
+
+        with self.captureOnCommitCallbacks(execute=True):
+            a.delete()
+        self.assertEqual(MediaBlob.objects.get(name=b.image.name).refs, 1)
+        self.assertEqual(len(self.blob_files()), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            b.delete()
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertEqual(self.blob_files(), [])
+
+    def test_variants_reused_for_duplicate_upload(self):
+        a = EntryImage.objects.create(entry=self.e1, image=photo())
+        images.refresh_variants(a)
+        b = EntryImage.objects.create(entry=self.e2, image=photo())
+        images.refresh_variants(b)
+        b.refresh_from_db()
+        a.refresh_from_db()
+        self.assertEqual(a.variants, b.variants)
+
+    def test_repeated_save_skips_write(self):
+        storage = blob_storage()
+        first = storage.save("x.jpg", ContentFile(b"same"))
+        inode = os.stat(storage.path(first)).st_ino
+        self.assertEqual(storage.save("y.jpg", ContentFile(b"same")), first)
+        self.assertEqual(os.stat(storage.path(first)).st_ino, inode)  # not rewritten
+
+    def test_pending_collect_spares_a_reused_blob(self):
+        a = EntryImage.objects.create(entry=self.e1, image=photo())
+        with self.captureOnCommitCallbacks() as pending:
+            a.delete()
+        b = EntryImage.objects.create(entry=self.e2, image=photo())  # same bytes, before the collect runs
+        for callback in pending:
+            callback()
+        self.assertEqual(MediaBlob.objects.get(name=b.image.name).refs, 1)
+        self.assertEqual(len(self.blob_files()), 1)
+
+    def test_collected_blob_written_again(self):
+        a = EntryImage.objects.create(entry=self.e1, image=photo())
+        with self.captureOnCommitCallbacks(execute=True):
+            a.delete()
+        b = EntryImage.objects.create(entry=self.e2, image=photo())
+        self.assertTrue(blob_storage().exists(b.image.name))
+        self.assertEqual(MediaBlob.objects.get(name=b.image.name).refs, 1)
+
+    def test_retain_refuses_a_missing_blob(self):
+        with self.assertRaises(FileNotFoundError):
+            retain(["cas/00/00/gone.jpg"])
+        self.assertFalse(MediaBlob.objects.exists())
@@ -0,0 +1,93 @@
+import hashlib
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from journal.models import Entry, EntryImage, Tab
+from journal.uploads import CappedImageUploadHandler
+from .utils import make_user, make_org
+
+
+def jpeg_bytes(size=(64, 64)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, "green").save(buf, "JPEG")
+    return buf.getvalue()
+
+
+def upload(name="a.jpg", data=None, content_type="image/jpeg"):
+    return SimpleUploadedFile(name, jpeg_bytes() if data is None else data, content_type=content_type)
+
+
+class UploadTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = make_user("u")
+        self.org = make_org(self.user)
+        self.tab = Tab.objects.create(org=self.org, name="General", enabled=True)
+        self.client.login(username="u", password="pass")
+
+    def post(self, *files):
+        return self.client.post(reverse("journal:entry_create"),
+                                {"title": "T", "body": "b", "tabs": [self.tab.pk], "images": list(files)})
+
+    def test_images_created_with_one_insert(self):
+        with mock.patch("journal.tasks.build_entry_image_variants.delay"):
+            with CaptureQueriesContext(connection) as ctx:
+                r = self.post(upload("a.jpg"), upload("b.jpg"))
+        self.assertEqual(r.status_code, 302)
+        self.assertEqual(EntryImage.objects.filter(entry__title="T").count(), 2)
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "journal_entryimage"')]
+        self.assertEqual(len(inserts), 1)
+
+    def test_disguised_file_rejected(self):
+        r = self.post(upload("evil.jpg", b"<?php echo 1; ?>" * 10))
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "evil.jpg: not a valid image.")
+        self.assertFalse(Entry.objects.exists())
+
+    def test_wrong_type_rejected_before_streaming(self):
+        r = self.post(upload("notes.txt", b"hello", "text/plain"))
+        self.assertContains(r, "only JPEG, PNG or WebP")
+        self.assertFalse(Entry.objects.exists())
+
+    @override_settings(UPLOAD_MAX_FILE_BYTES=100)
+    def test_per_file_cap(self):
+        r = self.post(upload("big.jpg"))
+        self.assertContains(r, "big.jpg: larger than")
+        self.assertFalse(EntryImage.objects.exists())
+
+    @override_settings(UPLOAD_MAX_REQUEST_BYTES=1000)
+    def test_per_request_cap(self):
+        r = self.post(upload("a.jpg"), upload("b.jpg"))
+        self.assertContains(r, "per post")
+        self.assertFalse(Entry.objects.exists())
+
+    def test_hashed_while_streaming(self):
+        data = jpeg_bytes()
+        request = RequestFactory().post("/", {"images": upload("a.jpg", data)})
+        request.upload_handlers.insert(0, CappedImageUploadHandler(request))
+        f = request.FILES["images"]
+        self.assertEqual(f.sha256, hashlib.sha256(data).hexdigest())
+        self.assertTrue(hasattr(f, "temporary_file_path"))  # on disk, not in memory
+
+    def test_csrf_still_checked(self):
+        client = Client(enforce_csrf_checks=True)
+        client.login(username="u", password="pass")
+        r = client.post(reverse("journal:entry_create"), {"title": "T", "body": "b", "images": [upload()]})
+        self.assertEqual(r.status_code, 403)
+
+    def test_other_views_keep_default_handlers(self):
+        request = RequestFactory().post("/", {"attachment": upload("notes.txt", b"hello", "text/plain")})
+        self.assertEqual(request.FILES["attachment"].read(), b"hello")
@@ -0,0 +1,128 @@
+"""
+Upload handling for image posts.
+
+CappedImageUploadHandler (installed per view with @image_uploads, ahead of
+Django's default handlers) streams every file straight to a temp file,
+never into memory, and while doing so:
+
+- rejects anything that isn't a JPEG/PNG/WebP by name, declared type and
+  magic bytes before more than one chunk is written,
+- enforces UPLOAD_MAX_FILE_BYTES per file and UPLOAD_MAX_REQUEST_BYTES for
+  the whole request (checked against Content-Length up front, then counted),
+- hashes the bytes (sha256) and leaves the digest on the file as `.sha256`.
+
+Rejections are collected on `request.upload_errors`; views surface them on
+the form through is_valid_with_uploads().
+"""
+import hashlib
+import os
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, StopUpload, TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from . import images, storage
+from .caching import bump_versions
+from .models import EntryImage
+from .signals import touch_entries
+
+IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
+
+
+def _looks_like_image(head):
+    return (head.startswith(b"\xff\xd8\xff")                      # JPEG
+            or head.startswith(b"\x89PNG\r\n\x1a\n")              # PNG
+            or (head[:4] == b"RIFF" and head[8:12] == b"WEBP"))   # WebP
+
+
+class CappedImageUploadHandler(TemporaryFileUploadHandler):
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_file = getattr(settings, "UPLOAD_MAX_FILE_BYTES", 12 * 1024 * 1024)
+        self.max_request = getattr(settings, "UPLOAD_MAX_REQUEST_BYTES", 20 * 1024 * 1024)
+        self.total = 0
+        self.over_limit = False
+        if request is not None:
+            request.upload_errors = []
+
+    def _reject(self, msg):
+        if self.request is not None:
+            self.request.upload_errors.append(msg)
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.over_limit = content_length > self.max_request
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        if self.over_limit:
+            self._reject(f"Uploads are limited to {filesizeformat(self.max_request)} per post.")
+            raise StopUpload()
+        ext = os.path.splitext(file_name)[1].lower().lstrip(".")
+        if ext not in IMAGE_EXTENSIONS or not (content_type or "").startswith("image/"):
+            self._reject(f"{file_name}: only JPEG, PNG or WebP images are allowed.")
+            raise SkipFile()
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0 and not _looks_like_image(raw_data):
+            self._reject(f"{self.file_name}: not a valid image.")
+            raise SkipFile()
+        self.size += len(raw_data)
+        self.total += len(raw_data)
+        if self.size > self.max_file:
+            self._reject(f"{self.file_name}: larger than {filesizeformat(self.max_file)}.")
+            raise SkipFile()
+        if self.total > self.max_request:
+            self._reject(f"Uploads are limited to {filesizeformat(self.max_request)} per post.")
+            raise StopUpload()
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if not file_size:
+            self._reject(f"{self.file_name}: file is empty.")
+            self.file.close()
+            return None
+        f = super().file_complete(file_size)
+        f.sha256 = self.sha256.hexdigest()
+        return f
+
+
+def image_uploads(view):
+    """
+    Stream this view's uploads through CappedImageUploadHandler. Handlers
+    must be set before anything reads request.POST -- CsrfViewMiddleware
+    does -- so the CSRF check moves inside, after the handler is installed.
+    """
+    protected = csrf_protect(view)
+
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers.insert(0, CappedImageUploadHandler(request))
+        return protected(request, *args, **kwargs)
+    return wrapper
+
+
+def is_valid_with_uploads(form, request, field="images"):
+    """form.is_valid(), plus any files the upload handler turned away."""
+    valid = form.is_valid()
+    for msg in getattr(request, "upload_errors", ()):
+        form.add_error(field, msg)
+        valid = False
+    return valid
+
+
+def attach_images(entry, files):
+    """Create all of an entry's new EntryImage rows in one INSERT."""
+    rows = EntryImage.objects.bulk_create([EntryImage(entry=entry, image=f) for f in files])
+    if rows:
+        # bulk_create skips post_save (and MySQL returns no pks): do its work per entry
+        storage.retain(r.image.name for r in rows)
+        touch_entries([entry.pk])
+        bump_versions(f"org:{entry.org_id}", f"author:{entry.author_id}")
+        images.schedule_entry(entry.pk)
+    return rows
@@ -1,9 +1,12 @@
 
+from django.conf import settings
 from django.urls import path
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponse
 from . import views
 from . import views_profile
+from . import views_events
+from . import views_media
 
 def ok(_): return HttpResponse("OK", content_type="text/plain")
 
@@ -12,6 +15,7 @@ app_name = "journal"
 urlpatterns = [
     path("", views.index, name="index"),
     path("entry/new/", views.entry_create, name="entry_create"),
+    path("search/", views.entry_search, name="entry_search"),
 
     path("drafts/", views.drafts, name="drafts"),
     path("drafts/<int:pk>/publish/", views.entry_publish, name="entry_publish"),
@@ -24,16 +28,27 @@ urlpatterns = [
     path("review/", views.review_queue, name="review_queue"),
     path("review/<int:pk>/approve/", views.entry_approve, name="entry_approve"),
     path("review/<int:pk>/reject/", views.entry_reject, name="entry_reject"),
+    path("review/bulk/", views.entry_review_bulk, name="entry_review_bulk"),
+    path("review/events/", views_events.review_events, name="review_events"),
     
     path("tabs/", views.tabs, name="tabs"),
     path("tabs/table/", views.tabs_table, name="tabs_table"),
     path("tabs/create/", views.tab_create, name="tab_create"),
     path("tabs/toggle/<int:pk>/", views.tab_toggle, name="tab_toggle"),
     path("tabs/<int:pk>/edit/", views.tab_edit, name="tab_edit"),  # classic form page
+    path("tabs/<int:pk>/row/", views.tab_row, name="tab_row"),
+    path("tabs/<int:pk>/row/edit/", views.tab_edit_row, name="tab_edit_row"),
+    path("tabs/<int:pk>/row/save/", views.tab_save_row, name="tab_save_row"),
 
     path("members/", views.members, name="members"),
     path("members/add/", views.member_add, name="member_add"),
+    path("members/search/", views.member_search, name="member_search"),
     path("members/invite/", views.member_invite, name="member_invite"),
+    path("members/import/", views.member_import, name="member_import"),
+    path("members/invite/bulk/", views.member_invite_bulk, name="member_invite_bulk"),
+    path("members/invite/campaigns/", views.invite_campaigns, name="invite_campaigns"),
+    path("members/invite/campaigns/<int:pk>/", views.invite_campaign_recipients,
+         name="invite_campaign_recipients"),
     path("invite/accept/<str:token>/", views.invite_accept, name="invite_accept"),
     path("members/<int:pk>/set-role/", views.member_set_role, name="member_set_role"),
 
@@ -50,7 +65,7 @@ urlpatterns = [
     path("profile/edit/", views_profile.profile_edit, name="profile_edit"),
     path("u/<int:user_id>/profile/edit/", views.profile_edit, name="profile_edit_user"),
     # optional: allow managers to view/edit by id
-    path("profile/<int:user_id>/", views_profile.profile_detail, name="profile_detail_by_id"),
+    path("profile/<int:user_id>/", views.profile_detail, name="profile_detail_by_id"),
     path("profile/<int:user_id>/edit/", views_profile.profile_edit, name="profile_edit_by_id"),
     path("profile/rows/social/", views_profile.social_form_row, name="profile_social_row"),
     path("profile/<int:user_id>/rows/social/", views_profile.social_form_row, name="profile_social_row_user"),
@@ -61,6 +76,9 @@ urlpatterns = [
 
     path("subusers/", views.subusers_list, name="subusers"),
     path("subusers/add/", views.subuser_create, name="subuser_create"),
+
+    # uploaded files (permission-checked, see views_media)
+    path(settings.MEDIA_URL.lstrip("/") + "<path:path>", views_media.protected_media, name="media"),
 ]
 
 urlpatterns += [ path("ok/", login_required(ok), name="ok") ]
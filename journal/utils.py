@@ -1,43 +1,75 @@
-import os
-from django.core.mail import send_mail
-from django.conf import settings
-from .models import Membership
+from django.utils.functional import cached_property
+from .caching import cached_memberships
+
+MODERATOR_ROLES = {"OWNER", "ADMIN", "MODERATOR"}
 
 def send_invite_email(to_email, subject, body):
-    send_mail(subject, body, getattr(settings,"DEFAULT_FROM_EMAIL","no-reply@example.com"),
-              [to_email], fail_silently=True)
-
-def send_invite_sms(to_phone, body):
-    sid = os.getenv("TWILIO_ACCOUNT_SID")
-    tok = os.getenv("TWILIO_AUTH_TOKEN")
-    from_num = os.getenv("TWILIO_FROM_NUMBER")  # e.g. +15551234567
-    if sid and tok and from_num:
-        try:
-            from twilio.rest import Client
-            Client(sid, tok).messages.create(to=to_phone, from_=from_num, body=body)
-            return
-        except Exception:
-            pass
-    # Dev fallback
-    print(f"[SMS to {to_phone}] {body}")
+    # batched with other outgoing mail (journal.mail_queue)
+    from .mail_queue import enqueue
+    enqueue(subject, body, [to_email])
+
+def send_invite_sms(to_phone, body, backend=None):
+    from .sms import get_backend
+    (backend or get_backend()).send(to_phone, body)
+
+class ActiveMembership:
+    """
+    The user's active (first) membership with its org and role, looked up
+    at most once. Cached on the user object (like Django's _perm_cache), so
+    every helper handed request.user during one request shares the lookup;
+    across requests it comes from the membership cache (journal.caching).
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def memberships(self):
+        if not getattr(self.user, "is_authenticated", False):
+            return []
+        return cached_memberships(self.user)
+
+    @property
+    def membership(self):
+        return self.memberships[0] if self.memberships else None
+
+    @property
+    def org(self):
+        return self.membership.org if self.membership else None
+
+    @property
+    def role(self):
+        return self.membership.role if self.membership else None
+
+    @property
+    def is_moderator(self):
+        return str(self.role or "").upper() in MODERATOR_ROLES
+
+    @property
+    def has_subusers(self):
+        return bool(self.membership and self.membership.has_subusers)
+
+
+def active_membership(user):
+    """Return the (memoized) ActiveMembership for this user."""
+    am = getattr(user, "_active_membership", None)
+    if am is None:
+        am = ActiveMembership(user)
+        if user is not None:
+            user._active_membership = am
+    return am
 
 def get_user_org(user):
     """Return the first org for this user (or None)."""
     if not user or not user.is_authenticated:
         return None
-    m = (Membership.objects
-            .select_related("org")
-            .filter(user=user)
-            .order_by("id")
-            .first())
-    return m.org if m else None
+    return active_membership(user).org
 
 def is_htmx(request):
     return request.headers.get("HX-Request") == "true"
 
 def user_is_moderator(user):
-    m = Membership.objects.filter(user=user).first()
-    return bool(m and str(m.role).lower() in {"moderator","admin","owner"})
+    return active_membership(user).is_moderator
 
 def can_manage_member(actor, membership):
     if not actor.is_authenticated:
@@ -46,4 +78,4 @@ def can_manage_member(actor, membership):
     if user_is_moderator(actor):
         return True
     # parent can manage their own subusers
-    return membership.managed_by_id == actor.id
\ No newline at end of file
+    return membership.managed_by_id == actor.id
@@ -3,26 +3,40 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model, login, logout
 from django.core.mail import send_mail
+from django.core.exceptions import ValidationError
 from django.conf import settings
 from django.utils.crypto import get_random_string
-from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.cache import never_cache
 from django.template.loader import render_to_string
+from django.utils.html import format_html
 from django.urls import reverse
+from urllib.parse import urlencode
 from django.views.decorators.http import require_POST, require_http_methods
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.utils import timezone
 from django.db import transaction
-from .models import Entry, EntryImage, Tab, Membership, Organization, Invite, UserProfile, SocialLink, ProfileImage, CustomField
-from .forms import EntryForm, MemberAddForm, InviteForm, AcceptInviteForm, TabForm, TabRenameForm, ProfileMiniForm, SubuserCreateForm, SocialLinkForm, UserProfileForm, SocialFormSet, ImageFormSet, CustomFieldItemForm as CustomFieldForm
+from .models import Entry, EntryImage, Tab, Membership, Organization, Invite, InviteCampaign, UserProfile, SocialLink, ProfileImage, CustomField
+from .forms import EntryForm, MemberAddForm, InviteForm, BulkInviteForm, AcceptInviteForm, TabForm, TabRenameForm, ProfileMiniForm, SubuserCreateForm, SocialLinkForm, UserProfileForm, SocialFormSet, ImageFormSet, CustomFieldItemForm as CustomFieldForm
 from django import forms
 from django.template.loader import render_to_string
-from .utils import send_invite_email, send_invite_sms, get_user_org, is_htmx, user_is_moderator, can_manage_member
+from . import events, hierarchy
+from . import member_import as member_csv
+from .caching import bump_versions, cached_count, content_version
+from .conditional import etag_for
+from .directory import search_members
+from .fragments import render_entries, render_entry
+from .pagination import keyset_page, keyset_page_by
+from .profiles import render_profile
+from .search import search_entries
+from .uploads import attach_images, image_uploads, is_valid_with_uploads
+from .invites import campaign_progress, campaign_recipients, queue_delivery, start_campaign
+from .utils import get_user_org, is_htmx, user_is_moderator, can_manage_member
 from journal.constants import ROLE_CHOICES
 from journal.models import UserProfile
-from journal.permissions import can_view_profile, can_edit_profile
+from journal.permissions import assignable_roles, can_view_profile, can_edit_profile, can_manage_map
 
 U = get_user_model()
 
@@ -47,20 +61,75 @@ def site_base_url(request):
 #     m = Membership.objects.select_related("org").filter(user=request.user).first()
 #     org = m.org if m else None
 
+# ---------- Conditional GET scopes (see journal.conditional) ----------
+def _org_scope(request, *args, **kwargs):
+    org = get_user_org(request.user)
+    return content_version(f"org:{org.pk}") if org else None
+
+def _author_scope(request, *args, **kwargs):
+    return content_version(f"author:{request.user.pk}")
+
+def _entry_scope(request, pk):
+    row = Entry.objects.filter(pk=pk).values_list("org_id", "updated_at").first()
+    if not row:
+        return None
+    return f"{content_version(f'org:{row[0]}')}:{row[1].isoformat()}"
+
 @login_required
+@etag_for(_org_scope)
 def index(request):
     org = get_user_org(request.user)   # <-- pass user
     if not org:
         return redirect("journal:profile_detail")
 
-    tabs = Tab.objects.filter(org=org, enabled=True)
-    entries = (Entry.objects
-               .filter(org=org, status=Entry.Status.APPROVED)
-               .prefetch_related("tabs", "images")
-               .select_related("author")
-               .order_by("-created_at"))
-    return render(request, "journal/index.html", {"org": org, "tabs": tabs, "entries": entries})
+    # Keyset pagination: only one page of rows (and its prefetch IN-lists) per request
+    qs = (Entry.objects
+          .filter(org=org, status=Entry.Status.APPROVED)
+          .defer("body")  # cards show the stored excerpt
+          .select_related("author"))
+    entries, next_cursor = keyset_page(qs, request.GET.get("cursor"),
+                                       getattr(settings, "FEED_PAGE_SIZE", 20))
+    ctx = {"org": org, "entries": entries, "next_cursor": next_cursor,
+           "cards": render_entries("card", entries)}
+
+    # "Load more" requests only need the next batch of cards
+    if is_htmx(request) and request.GET.get("cursor"):
+        html = render_to_string("journal/partials/entry_cards.html", ctx, request)
+        return HttpResponse(html)
+
+    ctx["tabs"] = Tab.objects.filter(org=org, enabled=True)
+    return render(request, "journal/index.html", ctx)
+
+@login_required
+def entry_search(request):
+    org = get_user_org(request.user)
+    if not org:
+        return redirect("journal:profile_detail")
+
+    q = (request.GET.get("q") or "").strip()
+    tab = Tab.objects.filter(org=org, pk=request.GET.get("tab")).first() if request.GET.get("tab", "").isdigit() else None
+    status = Entry.Status.APPROVED
+    # moderators may search the queue too
+    if request.GET.get("status", "").isdigit() and user_is_moderator(request.user):
+        status = int(request.GET["status"])
+    try:
+        page = max(1, int(request.GET.get("page") or 1))
+    except ValueError:
+        page = 1
+
+    entries, has_more = search_entries(org, q, status=status, tab=tab, page=page,
+                                       size=getattr(settings, "FEED_PAGE_SIZE", 20)) if q else ([], False)
+    ctx = {"q": q, "tab": tab, "status": status, "entries": entries,
+           "page": page, "next_page": page + 1 if has_more else None}
 
+    if is_htmx(request):
+        html = render_to_string("journal/partials/search_results.html", ctx, request)
+        return HttpResponse(html)
+
+    ctx["tabs"] = Tab.objects.filter(org=org, enabled=True)
+    return render(request, "journal/search.html", ctx)
+
+@image_uploads
 @login_required
 @transaction.atomic
 def entry_create(request):
@@ -70,7 +139,7 @@ def entry_create(request):
         form = EntryForm(request.POST, request.FILES)
         form.fields["tabs"].queryset = Tab.objects.filter(org=org, enabled=True)
 
-        if form.is_valid():
+        if is_valid_with_uploads(form, request):
             entry = form.save(commit=False)
             entry.author = request.user
             entry.org = org
@@ -82,6 +151,8 @@ def entry_create(request):
                 entry.status = Entry.Status.DRAFT
 
             entry.save()
+            if entry.status == Entry.Status.PENDING:
+                events.publish(org.pk, events.SUBMITTED, [entry.pk])
 
             # Tabs (prefer form; fall back to a default in this org)
             tabs = list(form.cleaned_data.get("tabs") or [])
@@ -93,9 +164,7 @@ def entry_create(request):
                 tabs = [default_tab]
             entry.tabs.set(tabs)  # we manage M2M ourselves; no form.save_m2m()
 
-            # Images
-            for f in request.FILES.getlist("images"):
-                EntryImage.objects.create(entry=entry, image=f)
+            attach_images(entry, request.FILES.getlist("images"))
 
             messages.success(request, "Submitted for review." if "submit" in request.POST else "Draft saved.")
             return redirect("journal:index")
@@ -110,9 +179,11 @@ def entry_create(request):
 
 # ---------- Drafts (HTMX) ----------
 @login_required
+@etag_for(_author_scope)
 def drafts(request):
     rows = (Entry.objects
             .filter(author=request.user, status=Entry.Status.DRAFT)
+            .defer("body")
             .prefetch_related("tabs"))
     if is_htmx(request):
         html = render_to_string("journal/partials/drafts_table.html", {"entries": rows}, request)
@@ -120,10 +191,14 @@ def drafts(request):
     return render(request, "journal/drafts.html", {"entries": rows})
 
 @login_required
+@etag_for(_entry_scope)
 def entry_detail(request, pk):
-    entry = get_object_or_404(Entry.objects.select_related("author").prefetch_related("tabs","images"), pk=pk)
-    return render(request, "journal/entry_detail.html", {"entry": entry})
+    # tabs/images are only queried when the cached body fragment is missing
+    entry = get_object_or_404(Entry.objects.select_related("author"), pk=pk)
+    return render(request, "journal/entry_detail.html",
+                  {"entry": entry, "entry_html": render_entry("body", entry)})
 
+@image_uploads
 @login_required
 @transaction.atomic
 def entry_edit(request, pk):
@@ -131,10 +206,9 @@ def entry_edit(request, pk):
     if request.method == "POST":
         form = EntryForm(request.POST, request.FILES, instance=entry)
         form.fields["tabs"].queryset = Tab.objects.filter(org=entry.org, enabled=True)
-        if form.is_valid():
+        if is_valid_with_uploads(form, request):
             entry = form.save()
-            for f in request.FILES.getlist("images"):
-                EntryImage.objects.create(entry=entry, image=f)
+            attach_images(entry, request.FILES.getlist("images"))
             messages.success(request, "Entry updated.")
             return redirect("journal:entry_detail", pk=entry.pk)
     else:
@@ -146,11 +220,12 @@ def entry_edit(request, pk):
 
 # ---------- Review queue (HTMX, partial path updated) ----------
 @login_required
+@etag_for(_org_scope)
 def review_queue(request):
     if not user_is_moderator(request.user):
         return HttpResponseForbidden()
     org = get_user_org(request.user)
-    rows = Entry.objects.filter(org=org, status=Entry.Status.PENDING).select_related("author")
+    rows = _review_rows(org)
     if is_htmx(request):
         html = render_to_string("journal/partials/review_table.html", {"entries": rows}, request)
         return HttpResponse(html)
@@ -168,6 +243,8 @@ def tabs(request):
     form = TabForm()
     return render(request, "journal/tabs.html", {"tabs": rows, "form": form})
 
+@login_required
+@etag_for(_org_scope)
 def tabs_table(request):
     """Return just the table (HTMX refresh target)."""
     if not user_is_moderator(request.user):
@@ -188,12 +265,15 @@ def tab_create(request):
     name = " ".join((request.POST.get("name") or "").split()).strip()
     enabled = bool(request.POST.get("enabled"))
 
-    if name:
-        Tab.objects.create(org=org, name=name, enabled=enabled, created_by=request.user)
-
-    # Always re-render table (and optionally clear any error banner OOB)
-    rows = Tab.objects.filter(org=org).order_by("-enabled", "name")
-    html = render_to_string("journal/partials/tabs_table.html", {"tabs": rows}, request=request)
+    if not name:
+        return HttpResponse(_tabs_error("Name is required."))
+    if Tab.objects.filter(org=org, name=name).exists():
+        return HttpResponse(_tabs_error("A tab with that name already exists."))
+
+    # Append just the new row (plus OOB count / empty-state / cleared error)
+    t = Tab.objects.create(org=org, name=name, enabled=enabled, created_by=request.user)
+    html = render_to_string("journal/partials/tab_row.html", {"t": t}, request=request)
+    html += _oob_table_status("tabs", Tab.objects.filter(org=org).count()) + _tabs_error("")
     return HttpResponse(html)
 
 @login_required
@@ -206,36 +286,103 @@ def tab_toggle(request, pk):
     t.enabled = not t.enabled
     t.save(update_fields=["enabled"])
 
-    rows = Tab.objects.filter(org=org).order_by("-enabled", "name")
-    html = render_to_string("journal/partials/tabs_table.html", {"tabs": rows}, request=request)
+    html = render_to_string("journal/partials/tab_row.html", {"t": t}, request=request)
     return HttpResponse(html)
 
+# Row-level HTMX swaps: actions return only the changed row (or nothing, for a
+# removed row) plus out-of-band updates for the count badge and empty state.
+_TABLES = {
+    # table: (count badge id, empty-row id, colspan, empty text) -- keep in sync with the partials
+    "review": ("review-count", "review-empty", 4, "Nothing to review."),
+    "drafts": ("drafts-count", "drafts-empty", 3, "No drafts."),
+    "tabs":   ("tabs-count", "tabs-empty", 3, "No tabs yet."),
+}
+
+def _oob_table_status(table, count):
+    count_id, empty_id, colspan, text = _TABLES[table]
+    return (render_to_string("journal/partials/oob_count.html",
+                             {"id": count_id, "count": count, "oob": True})
+            + render_to_string("journal/partials/empty_row.html",
+                               {"id": empty_id, "colspan": colspan, "text": text, "count": count, "oob": True}))
+
+def _tabs_error(msg):
+    if not msg:
+        return '<div id="tabs-error" hx-swap-oob="true"></div>'
+    return format_html('<div class="alert alert-danger mt-2" hx-swap-oob="true" id="tabs-error">{}</div>', msg)
+
 # --- Members admin ---
 ROLE_CHOICES = [("moderator","moderator"), ("author","author"), ("subauthor","subauthor")]
 
+def _with_can_manage(actor, memberships):
+    """Evaluate row permissions for the whole table at once (m.can_manage)."""
+    rows = list(memberships)
+    perms = can_manage_map(actor, rows)
+    for m in rows:
+        m.can_manage = perms[m.pk]
+    return rows
+
+# Sortable columns of the members/subusers tables; each ends in a unique key for the keyset cursor
+MEMBER_SORTS = {
+    "name": ("user__first_name", "user__last_name", "user__username", "id"),
+    "email": ("user__email", "id"),
+    "role": ("role", "user__username", "id"),
+    "joined": ("id",),
+}
+
+def _members_ctx(request, org, qs=None, url_name="journal:members", count_parts=()):
+    """
+    One page of the members table. Sort ("name", "-email", ...), role filter
+    and cursor come from the query string, or from POSTed table state on
+    row actions; the total is cached per org (journal.caching.cached_count).
+    """
+    params = request.POST if request.method == "POST" else request.GET
+    sort = params.get("sort") or "name"
+    key = sort.lstrip("-")
+    if key not in MEMBER_SORTS:
+        sort = key = "name"
+    role = params.get("role_filter") or ""
+    if role not in Membership.Role.values:
+        role = ""
+
+    if qs is None:
+        qs = Membership.objects.filter(org=org)
+    if role:
+        qs = qs.filter(role=role)
+    total = cached_count(qs, f"members:{org.pk}", role or "all", *count_parts)
+    rows, next_cursor = keyset_page_by(
+        qs.select_related("user", "org"), MEMBER_SORTS[key], params.get("cursor"),
+        size=getattr(settings, "MEMBERS_PAGE_SIZE", 50), descending=sort.startswith("-"), tag=sort)
+
+    url = reverse(url_name)
+    def link(**changes):
+        state = {"sort": sort, "role_filter": role, **changes}
+        return f"{url}?{urlencode({k: v for k, v in state.items() if v})}"
+
+    return {
+        "org": org,
+        "members": _with_can_manage(request.user, rows),
+        "role_choices": Membership.Role.choices,
+        "assignable_roles": assignable_roles(request.user),
+        "total": total,
+        "table_url": url,
+        "sort": sort,
+        "role_filter": role,
+        "cursor": params.get("cursor") or "",
+        "sort_links": {k: link(sort=k if sort != k else f"-{k}") for k in MEMBER_SORTS},
+        "sort_arrows": {key: " ▼" if sort.startswith("-") else " ▲"},
+        "next_url": link(cursor=next_cursor) if next_cursor else None,
+        "first_url": link() if params.get("cursor") else None,
+    }
+
 @login_required
 def members(request):
     if not user_is_moderator(request.user):
         return HttpResponse(status=403)
 
     org = get_user_org(request.user)
-
-    # Single source of truth: `members` (not rows/memberships)
-    members = (
-        Membership.objects
-        .filter(org=org)                      # <-- filter by org
-        .select_related("user", "org")
-        .order_by("user__first_name", "user__last_name", "user__username")
-    )
-
-    form = MemberAddForm()
-
-    ctx = {
-        "org": org,
-        "members": members,                   # <-- consistent key
-        "role_choices": getattr(Membership, "Role", None).choices if hasattr(Membership, "Role") else ROLE_CHOICES,
-        "form": form,
-    }
+    ctx = _members_ctx(request, org)
+    ctx["form"] = MemberAddForm()
+    ctx["bulk_form"] = BulkInviteForm()
 
     if is_htmx(request):
         html = render_to_string("journal/partials/members_table.html", ctx, request=request)
@@ -251,10 +398,11 @@ def member_set_role(request, pk):
     org = get_user_org(request.user)
     m = get_object_or_404(Membership, pk=pk, org=org)
     role = request.POST.get("role")
-    if role in {r for r,_ in ROLE_CHOICES}:
-        m.role = role; m.save(update_fields=["role"])
-    rows = Membership.objects.filter(org=org).select_related("user")
-    html = render_to_string("journal/partials/members_table.html", {"memberships": rows, "ROLE_CHOICES": ROLE_CHOICES}, request)
+    # only members ranked below you, and only to roles ranked below you
+    if not can_manage_map(request.user, [m])[m.pk] or role not in assignable_roles(request.user):
+        return HttpResponseForbidden()
+    m.role = role; m.save(update_fields=["role"])
+    html = render_to_string("journal/partials/members_table.html", _members_ctx(request, org), request)
     return HttpResponse(html)
 
 @login_required
@@ -269,6 +417,9 @@ def plans(request):
 def profile(request):
     return render(request, "journal/profile.html", {"user": request.user})
 
+def _review_rows(org):
+    return Entry.objects.filter(org=org, status=Entry.Status.PENDING).defer("body").select_related("author")
+
 @login_required
 @require_POST
 def entry_approve(request, pk):
@@ -278,10 +429,11 @@ def entry_approve(request, pk):
     e = get_object_or_404(Entry, pk=pk, org=org)
     e.status = Entry.Status.APPROVED
     e.approved_at = timezone.now()
-    e.save(update_fields=["status","approved_at"])
-    rows = Entry.objects.filter(org=org, status=Entry.Status.PENDING).select_related("author")
-    html = render_to_string("journal/partials/review_table.html", {"entries": rows}, request)
-    return HttpResponse(html)
+    e.reviewer = request.user
+    e.save(update_fields=["status","approved_at","reviewer","updated_at"])
+    events.publish(org.pk, events.REVIEWED, [e.pk])
+    # the row leaves the queue: send no row, just the OOB count/empty state
+    return HttpResponse(_oob_table_status("review", _review_rows(org).count()))
 
 @login_required
 @require_POST
@@ -291,9 +443,36 @@ def entry_reject(request, pk):
     org = get_user_org(request.user)
     e = get_object_or_404(Entry, pk=pk, org=org)
     e.status = Entry.Status.DRAFT
-    e.save(update_fields=["status"])
-    rows = Entry.objects.filter(org=org, status=Entry.Status.PENDING).select_related("author")
-    html = render_to_string("journal/partials/review_table.html", {"entries": rows}, request)
+    e.save(update_fields=["status","updated_at"])
+    events.publish(org.pk, events.REVIEWED, [e.pk])
+    return HttpResponse(_oob_table_status("review", _review_rows(org).count()))
+
+@login_required
+@require_POST
+def entry_review_bulk(request):
+    """Approve or send back every selected pending entry with a single UPDATE."""
+    if not user_is_moderator(request.user):
+        return HttpResponseForbidden()
+    org = get_user_org(request.user)
+    action = request.POST.get("action")
+    ids = [int(i) for i in request.POST.getlist("ids") if i.isdigit()]
+    if action not in {"approve", "reject"}:
+        return HttpResponse(status=400)
+
+    if ids:
+        now = timezone.now()
+        selected = Entry.objects.filter(org=org, status=Entry.Status.PENDING, pk__in=ids)
+        moved = list(selected.values_list("pk", "author_id"))
+        if action == "approve":
+            selected.update(status=Entry.Status.APPROVED, approved_at=now,
+                            reviewer=request.user, updated_at=now)
+        else:
+            selected.update(status=Entry.Status.DRAFT, updated_at=now)
+        # update() skips post_save: bump the ETag versions ourselves
+        bump_versions(f"org:{org.pk}", *{f"author:{a}" for _, a in moved})
+        events.publish(org.pk, events.REVIEWED, [pk for pk, _ in moved])
+
+    html = render_to_string("journal/partials/review_table.html", {"entries": _review_rows(org)}, request)
     return HttpResponse(html)
 
 @login_required
@@ -303,18 +482,29 @@ def entry_publish(request, pk):
     e.status = Entry.Status.PENDING
     e.submitted_at = timezone.now()
     e.save(update_fields=["status","submitted_at"])
-    rows = Entry.objects.filter(author=request.user, status=Entry.Status.DRAFT).prefetch_related("tabs")
-    html = render_to_string("journal/partials/drafts_table.html", {"entries": rows}, request)
-    return HttpResponse(html)
+    events.publish(e.org_id, events.SUBMITTED, [e.pk])
+    return HttpResponse(_oob_table_status("drafts", _draft_count(request.user)))
 
 @login_required
 @require_POST
 def entry_delete(request, pk):
     e = get_object_or_404(Entry, pk=pk, author=request.user, status=Entry.Status.DRAFT)
     e.delete()
-    rows = Entry.objects.filter(author=request.user, status=Entry.Status.DRAFT).prefetch_related("tabs")
-    html = render_to_string("journal/partials/drafts_table.html", {"entries": rows}, request)
-    return HttpResponse(html)
+    return HttpResponse(_oob_table_status("drafts", _draft_count(request.user)))
+
+def _draft_count(user):
+    return Entry.objects.filter(author=user, status=Entry.Status.DRAFT).count()
+
+@login_required
+def member_search(request):
+    """Autocomplete over names and nicknames of the user's org (journal.directory)."""
+    if not user_is_moderator(request.user):
+        return HttpResponse(status=403)
+    org = get_user_org(request.user)
+    q = (request.GET.get("q") or "").strip()
+    results = search_members(org, q) if q else []
+    return HttpResponse(render_to_string("journal/partials/member_search_results.html",
+                                         {"q": q, "results": results}, request))
 
 @login_required
 @require_POST
@@ -332,9 +522,8 @@ def member_add(request):
         Membership.objects.get_or_create(user=user, org=org,
                                          defaults={"role": form.cleaned_data["role"]})
         # Re-render members table and blank form using HTMX OOB swaps
-        rows = Membership.objects.filter(org=org).select_related("user")
         table_html = render_to_string("journal/partials/members_table.html",
-                                      {"memberships": rows, "ROLE_CHOICES": ROLE_CHOICES}, request)
+                                      _members_ctx(request, org), request)
         form_html  = render_to_string("journal/partials/member_add_form.html",
                                       {"form": MemberAddForm()}, request)
         return HttpResponse(table_html + form_html)  # form has hx-swap-oob
@@ -344,6 +533,26 @@ def member_add(request):
                                      {"form": form}, request)
         return HttpResponse(form_html)
 
+@login_required
+@require_POST
+def member_import(request):
+    """Bulk add from pasted/loaded CSV: all rows valid, or nothing is created."""
+    if not user_is_moderator(request.user):
+        return HttpResponse(status=403)
+    org = get_user_org(request.user)
+    rows = member_csv.parse(request.POST.get("rows", ""))
+    clean, report = member_csv.validate(rows)
+    created = 0
+    if rows and not report:
+        created = member_csv.create_members(org, clean)
+
+    html = render_to_string("journal/partials/member_import_report.html",
+                            {"rows": len(rows), "report": report, "created": created}, request)
+    if created:
+        ctx = {**_members_ctx(request, org), "oob": True}
+        html += render_to_string("journal/partials/members_table.html", ctx, request)
+    return HttpResponse(html)
+
 @login_required
 def member_invite(request):
     if not user_is_moderator(request.user):
@@ -362,22 +571,13 @@ def member_invite(request):
                 delivery=form.cleaned_data["delivery"],
             )
             accept_url = site_base_url(request) + reverse("journal:invite_accept", args=[inv.token])
-
-            if inv.delivery == "email":
-                subject = f"You're invited to {org.name}"
-                body = render_to_string("journal/partials/invite_email.txt", {"org": org, "accept_url": accept_url})
-                send_invite_email(inv.email, subject, body)
-                dev_link = accept_url
-            else:
-                body = f"Join {org.name}: {accept_url}"
-                send_invite_sms(inv.phone, body)
-                dev_link = accept_url
+            queue_delivery(inv, accept_url)  # sent by a worker; status lands on the Invite
+            dev_link = accept_url
 
             # Refresh members table + show link (dev helper)
-            rows = Membership.objects.filter(org=org).select_related("user")
             table_html = render_to_string("journal/partials/members_table.html",
-                                          {"memberships": rows, "ROLE_CHOICES": ROLE_CHOICES}, request)
-            notice_html = f'<div class="alert alert-info" id="invite-link" hx-swap-oob="true">Invite sent. Dev link: <a href="{dev_link}">{dev_link}</a></div>'
+                                          _members_ctx(request, org), request)
+            notice_html = f'<div class="alert alert-info" id="invite-link" hx-swap-oob="true">Invite queued for delivery. Dev link: <a href="{dev_link}">{dev_link}</a></div>'
             # Reset the form via OOB
             form_html = render_to_string("journal/partials/member_invite_form.html",
                                          {"invite_form": InviteForm()}, request)
@@ -392,6 +592,45 @@ def member_invite(request):
     html = render_to_string("journal/partials/member_invite_form.html", {"invite_form": form}, request)
     return HttpResponse(html)
 
+def _campaigns_html(request, org, oob=False):
+    campaigns = campaign_progress(org)
+    return render_to_string("journal/partials/invite_campaigns.html",
+                            {"campaigns": campaigns, "polling": any(c.pending for c in campaigns), "oob": oob},
+                            request)
+
+@login_required
+@require_POST
+def member_invite_bulk(request):
+    """Invite many recipients at once; sending happens in throttled batches on a worker."""
+    if not user_is_moderator(request.user):
+        return HttpResponse(status=403)
+    org = get_user_org(request.user)
+    form = BulkInviteForm(request.POST)
+    if not form.is_valid():
+        return HttpResponse(render_to_string("journal/partials/bulk_invite_form.html",
+                                             {"bulk_form": form}, request))
+    campaign = start_campaign(org=org, role=form.cleaned_data["role"], created_by=request.user,
+                              recipients=form.cleaned_data["recipients"], base_url=site_base_url(request))
+    form_html = render_to_string("journal/partials/bulk_invite_form.html",
+                                 {"bulk_form": BulkInviteForm(), "queued": campaign.total}, request)
+    return HttpResponse(form_html + _campaigns_html(request, org, oob=True))
+
+@login_required
+def invite_campaigns(request):
+    """Progress of recent bulk invites (the partial polls itself while any are pending)."""
+    if not user_is_moderator(request.user):
+        return HttpResponse(status=403)
+    return HttpResponse(_campaigns_html(request, get_user_org(request.user)))
+
+@login_required
+def invite_campaign_recipients(request, pk):
+    """Per-recipient delivery status of one campaign, loaded when its row is opened."""
+    if not user_is_moderator(request.user):
+        return HttpResponse(status=403)
+    campaign = get_object_or_404(InviteCampaign, pk=pk, org=get_user_org(request.user))
+    return HttpResponse(render_to_string("journal/partials/invite_campaign_recipients.html",
+                                         {"invites": campaign_recipients(campaign)}, request))
+
 def invite_accept(request, token):
     inv = Invite.objects.filter(token=token).select_related("org").first()
     if not inv or not inv.is_valid():
@@ -451,7 +690,7 @@ def tab_edit_form(request, pk):
 @login_required
 @require_POST
 def tab_save_row(request, pk: int):
-    """Persist edits for one row, then return the refreshed table."""
+    """Persist edits for one row, then return just that row."""
     if not user_is_moderator(request.user):
         return HttpResponseForbidden()
     org = get_user_org(request.user)
@@ -460,21 +699,22 @@ def tab_save_row(request, pk: int):
     name = " ".join((request.POST.get("name") or "").split()).strip()
     enabled = bool(request.POST.get("enabled"))
 
+    error = ""
     if not name:
-        rows = Tab.objects.filter(org=org).order_by("-enabled","name")
-        html = render_to_string("journal/partials/tabs_table.html", {"tabs": rows}, request)
-        html += '<div class="alert alert-danger mt-2" hx-swap-oob="true" id="tabs-error">Name is required.</div>'
-        return HttpResponse(html)
+        error = "Name is required."
+    elif Tab.objects.filter(org=org, name=name).exclude(pk=tab.pk).exists():
+        error = "A tab with that name already exists."
+    if error:
+        html = render_to_string("journal/partials/tab_edit_row.html", {"t": tab}, request)
+        return HttpResponse(html + _tabs_error(error))
 
     if tab.name != name or tab.enabled != enabled:
         tab.name = name
         tab.enabled = enabled
         tab.save(update_fields=["name", "enabled"])
 
-    rows = Tab.objects.filter(org=org).order_by("-enabled","name")
-    html = render_to_string("journal/partials/tabs_table.html", {"tabs": rows}, request)
-    html += '<div id="tabs-error" hx-swap-oob="true"></div>'
-    return HttpResponse(html)
+    html = render_to_string("journal/partials/tab_row.html", {"t": tab}, request)
+    return HttpResponse(html + _tabs_error(""))
 
 @login_required
 def tab_edit_row(request, pk: int):
@@ -483,7 +723,17 @@ def tab_edit_row(request, pk: int):
         return HttpResponseForbidden()
     org = get_user_org(request.user)
     tab = get_object_or_404(Tab, pk=pk, org=org)
-    html = render_to_string("journal/partials/tab_edit_row.html", {"tab": tab}, request)
+    html = render_to_string("journal/partials/tab_edit_row.html", {"t": tab}, request)
+    return HttpResponse(html)
+
+@login_required
+def tab_row(request, pk: int):
+    """Swap a single row back to display mode (edit cancelled)."""
+    if not user_is_moderator(request.user):
+        return HttpResponseForbidden()
+    org = get_user_org(request.user)
+    tab = get_object_or_404(Tab, pk=pk, org=org)
+    html = render_to_string("journal/partials/tab_row.html", {"t": tab}, request)
     return HttpResponse(html)
 
 @login_required
@@ -536,6 +786,7 @@ def tutorial(request):
     # initial page loads the step container and lazy-loads the partial
     return render(request, "journal/tutorial.html", {"step": step})
 
+@image_uploads
 @login_required
 def tutorial_step(request, step: int):
     profile = _get_profile(request.user)
@@ -544,9 +795,7 @@ def tutorial_step(request, step: int):
 
     # Clamp step
     step = max(1, min(5, step))
-    org = None
-    m = request.user.memberships.select_related("org").first()
-    if m: org = m.org
+    org = get_user_org(request.user)
 
     # Handle POST actions per step
     if request.method == "POST":
@@ -590,15 +839,14 @@ def tutorial_step(request, step: int):
                 profile.onboarding_step = 4; profile.save(update_fields=["onboarding_step"])
             else:
                 form = EntryForm(request.POST, request.FILES)
-                if form.is_valid():
+                if is_valid_with_uploads(form, request):
                     entry = form.save(commit=False)
                     entry.author = request.user
                     if org: entry.org = org
                     entry.status = Entry.Status.DRAFT
                     entry.save()
                     form.save_m2m()
-                    for f in request.FILES.getlist("images"):
-                        EntryImage.objects.create(entry=entry, image=f)
+                    attach_images(entry, request.FILES.getlist("images"))
                     profile.onboarding_step = 4; profile.save(update_fields=["onboarding_step"])
                 else:
                     html = render_to_string("journal/partials/tutorial/_step_3_entry.html", {"form": form, "org": org}, request)
@@ -619,8 +867,8 @@ def tutorial_step(request, step: int):
                         phone=form.cleaned_data.get("phone","") if form.cleaned_data["delivery"]=="sms" else "",
                         delivery=form.cleaned_data["delivery"],
                     )
-                    from django.urls import reverse
-                    accept_url = f"{'https' if request.is_secure() else 'http'}://{request.get_host()}" + reverse("journal:invite_accept", args=[inv.token])
+                    accept_url = site_base_url(request) + reverse("journal:invite_accept", args=[inv.token])
+                    queue_delivery(inv, accept_url)
                     # Show link inline for dev
                     messages.info(request, f"Invite link (dev): {accept_url}")
                     profile.onboarding_step = 5; profile.save(update_fields=["onboarding_step"])
@@ -687,14 +935,14 @@ def logout_then_login(request):
 @login_required
 def subusers_list(request):
     org = get_user_org(request.user)
-    # Org managers see all subauthors; otherwise show only the ones you manage
-    qs = (Membership.objects
-          .filter(org=org, role=Membership.Role.SUBAUTHOR)
-          .select_related("user", "org"))
+    # Org managers see all subauthors; otherwise the ones you manage, at any depth
+    qs = Membership.objects.filter(org=org, role=Membership.Role.SUBAUTHOR)
+    scope = ("subusers",)
     if not user_is_moderator(request.user):
-        qs = qs.filter(managed_by=request.user)
+        qs = qs.filter(user_id__in=hierarchy.descendant_ids(org, request.user))
+        scope = ("subusers", request.user.pk)
 
-    ctx = {"org": org, "members": qs, "role_choices": Membership.Role.choices}
+    ctx = _members_ctx(request, org, qs, url_name="journal:subusers", count_parts=scope)
     if is_htmx(request):
         html = render_to_string("journal/partials/members_table.html", ctx, request=request)
         return HttpResponse(html)
@@ -735,18 +983,27 @@ def subuser_create(request):
     )
     if mem.managed_by_id is None:
         mem.managed_by = request.user
-        mem.save(update_fields=["managed_by"])
+        try:
+            mem.save(update_fields=["managed_by"])
+        except ValidationError as e:  # they already manage you (journal.hierarchy)
+            form.add_error("email", e)
+            html = render_to_string("journal/partials/form_errors.html", {"form": form}, request=request)
+            return HttpResponse(html, status=400)
 
     # return refreshed table for HTMX
     return subusers_list(request)
 
 @login_required
 def profile_detail(request, user_id=None):
-    subject = request.user if not user_id else get_object_or_404(UserProfile, user__id=user_id).user
-    profile = getattr(subject, "profile", None) or UserProfile.objects.get_or_create(user=subject)[0]
-    if not can_view_profile(request.user, subject):
+    subject_id = user_id or request.user.pk
+    is_self = subject_id == request.user.pk
+    if not is_self and not can_view_profile(request.user, subject_id):
         return HttpResponseForbidden()
-    return render(request, "journal/profile_detail.html", {"subject": subject, "profile": profile})
+    profile_html = render_profile(subject_id)  # cached; see journal.profiles
+    if profile_html is None:
+        raise Http404("No such user.")
+    return render(request, "journal/profile_detail.html",
+                  {"profile_html": profile_html, "subject_id": subject_id, "is_self": is_self})
 
 @login_required
 def profile_edit(request, user_id=None):
@@ -0,0 +1,58 @@
+"""
+Server-Sent Events for the review queue (async; run under asgi.py).
+
+Each open queue page holds one connection per moderator. Events from
+journal.events carry only entry ids; the stream renders the row/OOB HTML
+for its own request so CSRF tokens stay per-user.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseForbidden, StreamingHttpResponse
+from django.template.loader import render_to_string
+
+from . import events
+from .utils import active_membership
+from .views import _oob_table_status, _review_rows
+
+
+def _sse(event, html):
+    data = "\n".join(f"data: {line}" for line in html.splitlines() or [""])
+    return f"event: {event}\n{data}\n\n"
+
+
+def review_event_html(request, org, event):
+    """OOB swaps that bring an open queue in line with one event."""
+    ids = event["ids"]
+    entries = []
+    if event["kind"] == events.SUBMITTED:
+        entries = list(_review_rows(org).filter(pk__in=ids).order_by("pk"))
+    html = render_to_string("journal/partials/review_event.html",
+                            {"ids": ids, "entries": entries}, request)
+    return html + _oob_table_status("review", _review_rows(org).count())
+
+
+def _moderator_org(user):
+    am = active_membership(user)
+    return am.org if am.is_moderator else None
+
+
+async def review_events(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponseForbidden()
+    org = await sync_to_async(_moderator_org)(user)
+    if org is None:
+        return HttpResponseForbidden()
+
+    async def stream():
+        yield "retry: 5000\n\n"
+        async for event in events.subscribe(org.pk):
+            if event is None:
+                yield ": ping\n\n"  # keeps proxies from timing out idle streams
+                continue
+            html = await sync_to_async(review_event_html)(request, org, event)
+            yield _sse("review", html)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: flush each event immediately
+    return response
@@ -0,0 +1,142 @@
+"""
+Protected /media/ delivery.
+
+Every media URL comes through here for one indexed permission query; the
+bytes are then sent by nginx (X-Accel-Redirect into an `internal` location,
+which also handles Range and conditional requests). Without nginx (dev,
+MEDIA_ACCEL_REDIRECT off) Django streams the file itself, Range included.
+
+Who may read what:
+- cas/...                blobs (journal.storage) and their variants: any
+                         entry or profile-library image using the blob is
+                         readable under the rules below
+- entry images           the entry is in one of the viewer's orgs and is
+                         approved, or the viewer wrote it, moderates that org
+                         or manages its author (journal.hierarchy)
+- library images         the owner shares an org with the viewer and the image
+                         is visible, or the viewer is the owner or their manager
+- entry_images/<entry>/  (pre-dedup uploads) as entry images
+- profiles/<user>/       the viewer is that user or their manager, or shares an
+                         org with them and the file isn't a hidden library image
+"""
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.views.decorators.http import require_safe
+
+from django.db.models import Q
+
+from .hierarchy import descendant_ids_anywhere, is_ancestor
+from .models import Entry, EntryImage, Membership, ProfileImage
+from .storage import PREFIX as CAS_PREFIX
+from .uploads import IMAGE_EXTENSIONS
+from .utils import MODERATOR_ROLES, active_membership
+
+IMMUTABLE = "private, max-age=31536000, immutable"
+REVALIDATE = "private, no-cache"
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _blob_names(path):
+    """Originals a cas/ path can belong to (itself, or the blob a variant was cut from)."""
+    directory, fname = posixpath.split(path)
+    stem = fname.split(".", 1)[0]
+    return [f"{directory}/{stem}.{ext}" for ext in sorted(IMAGE_EXTENSIONS)]
+
+
+def _readable_entry_images(user, memberships):
+    managed = descendant_ids_anywhere(user)
+    moderated = [m.org_id for m in memberships if str(m.role).upper() in MODERATOR_ROLES]
+    return EntryImage.objects.filter(
+        Q(entry__status=Entry.Status.APPROVED) | Q(entry__author=user)
+        | Q(entry__org_id__in=moderated) | Q(entry__author_id__in=managed),
+        entry__org_id__in=[m.org_id for m in memberships])
+
+
+def _readable_library_images(user, org_ids):
+    return ProfileImage.objects.filter(
+        Q(visible=True, profile__user__memberships__org_id__in=org_ids)
+        | Q(profile__user=user) | Q(profile__user_id__in=descendant_ids_anywhere(user)))
+
+
+def can_read_media(user, path):
+    if not user.is_authenticated:
+        return False
+    if user.is_superuser:
+        return True
+    memberships = active_membership(user).memberships
+    org_ids = [m.org_id for m in memberships]
+    if not org_ids:
+        return False
+
+    if path.startswith(CAS_PREFIX):
+        names = _blob_names(path)
+        entries = _readable_entry_images(user, memberships).filter(image__in=names).order_by().values("pk")
+        library = _readable_library_images(user, org_ids).filter(image__in=names).order_by().values("pk")
+        return bool(entries.union(library)[:1])
+
+    top, _, rest = path.partition("/")
+    owner_id = rest.split("/", 1)[0]
+    if not owner_id.isdigit():
+        return False
+    owner_id = int(owner_id)
+    if top == "entry_images":
+        return _readable_entry_images(user, memberships).filter(image=path, entry_id=owner_id).exists()
+    if top == "profiles":
+        if owner_id == user.pk or is_ancestor(user, owner_id):
+            return True
+        return (Membership.objects.filter(user_id=owner_id, org_id__in=org_ids).exists()
+                and not ProfileImage.objects.filter(image=path, visible=False).exists())
+    return False
+
+
+def _ranged(request, full, content_type):
+    """Dev-only stand-in for what nginx does: one byte range, else the whole file."""
+    size = os.path.getsize(full)
+    m = _RANGE.match(request.headers.get("Range", ""))
+    if not m or m.groups() == ("", ""):
+        response = FileResponse(open(full, "rb"), content_type=content_type)
+    else:
+        start, end = m.groups()
+        if start:
+            start, end = int(start), min(int(end or size - 1), size - 1)
+        else:  # suffix range: the last N bytes
+            start, end = max(0, size - int(end)), size - 1
+        if start > end:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        with open(full, "rb") as fh:
+            fh.seek(start)
+            response = HttpResponse(fh.read(end - start + 1), status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+@require_safe
+def protected_media(request, path):
+    if posixpath.normpath(path) != path or path.startswith(("/", "..")):
+        raise Http404
+    if not can_read_media(request.user, path):
+        raise Http404  # same answer as a missing file: don't confirm what exists
+
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if getattr(settings, "MEDIA_ACCEL_REDIRECT", False):
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + path
+    else:
+        full = os.path.join(settings.MEDIA_ROOT, path)
+        if not os.path.isfile(full):
+            raise Http404
+        response = _ranged(request, full, content_type)
+
+    # content-addressed names never change content; anything else may be replaced in place
+    response["Cache-Control"] = IMMUTABLE if path.startswith(CAS_PREFIX) else REVALIDATE
+    response["Vary"] = "Cookie"
+    return response
@@ -5,6 +5,7 @@ from django.urls import reverse_lazy
 import logging
 import sentry_sdk
 from sentry_sdk.integrations.django import DjangoIntegration
+from celery.schedules import crontab
 from sentry_sdk.integrations.celery import CeleryIntegration  # if you use Celery
 from sentry_sdk.integrations.logging import LoggingIntegration
 
@@ -57,6 +58,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "journal.middleware.ActiveMembershipMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -115,6 +117,42 @@ else:
         }
     }
 
+# ── Cache ──────────────────────────────────────────────────────────────────────
+# Local memory in dev; Redis everywhere else (set REDIS_CACHE_URL to override).
+if DEBUG and not os.getenv("REDIS_CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "subdiaries",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_CACHE_URL", "redis://127.0.0.1:6379/2"),
+            "KEY_PREFIX": "subdiaries",
+        }
+    }
+# Rendered entry fragments: per-process, size-bounded LRU (keys are versioned, never stale)
+CACHES["fragments"] = {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "subdiaries-fragments",
+    "OPTIONS": {
+        "MAX_ENTRIES": int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", "5000")),
+        "CULL_FREQUENCY": 10,  # evict the least recently used 10% when full
+    },
+}
+MEMBERSHIP_CACHE_TTL = int(os.getenv("MEMBERSHIP_CACHE_TTL", "300"))
+FRAGMENT_CACHE_TTL = int(os.getenv("FRAGMENT_CACHE_TTL", "86400"))
+COUNT_CACHE_TTL = int(os.getenv("COUNT_CACHE_TTL", "3600"))  # versioned: never stale, just evicted
+
+# ── Live events (SSE) ──────────────────────────────────────────────────────────
+# In-process fan-out in dev; Redis pub/sub everywhere else (all workers see every event).
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "local" if DEBUG and not os.getenv("REDIS_EVENTS_URL") else "redis")
+EVENTS_REDIS_URL = os.getenv("REDIS_EVENTS_URL", "redis://127.0.0.1:6379/3")
+SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
 # ── Locale ─────────────────────────────────────────────────────────────────────
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "America/Chicago"
@@ -134,6 +172,21 @@ STATICFILES_FINDERS = [
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.getenv("MEDIA_ROOT", str(BASE_DIR / "media") if DEBUG else "/srv/subdiaries/media")
+# /media/ is permission-checked by journal.views_media; in prod nginx sends the bytes
+MEDIA_ACCEL_REDIRECT = get_bool("MEDIA_ACCEL_REDIRECT", not DEBUG)
+MEDIA_ACCEL_PREFIX = "/protected-media/"  # nginx `internal` location aliased to MEDIA_ROOT
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # entry/profile library images: deduplicated by content hash (journal.storage)
+    "blobs": {"BACKEND": "journal.storage.ContentAddressedStorage"},
+}
+# Resized WebP/JPEG copies made for every uploaded image (journal.images)
+IMAGE_VARIANT_WIDTHS = [int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",")]
+# Image posts stream to disk through journal.uploads (@image_uploads); keep the request cap within
+# nginx's client_max_body_size. Other uploads use Django's default handlers.
+UPLOAD_MAX_FILE_BYTES = int(os.getenv("UPLOAD_MAX_FILE_BYTES", str(12 * 1024 * 1024)))
+UPLOAD_MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", str(20 * 1024 * 1024)))
 
 # ── Auth redirects ─────────────────────────────────────────────────────────────
 LOGIN_URL = "login"
@@ -153,11 +206,51 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "app-password")
 EMAIL_USE_TLS = get_bool("EMAIL_USE_TLS", True)
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "Subdiaries <no-reply@yourdomain>")
 SITE_NAME = os.getenv("SITE_NAME", "Subdiaries")
+SITE_URL = os.getenv("SITE_URL", "http://localhost:8000")  # links in mail sent outside a request
+
+# ── SMS (journal.sms; Twilio when configured, console otherwise) ────────────────
+SMS_BACKEND = os.getenv("SMS_BACKEND", "journal.sms.TwilioBackend" if os.getenv("TWILIO_ACCOUNT_SID")
+                        else "journal.sms.ConsoleBackend")
+
+# ── Bulk invites (journal.invites.start_campaign) ──────────────────────────────
+# invites sent per SMTP connection / SMS client, and the pause between batches
+INVITE_BATCH_SIZE = int(os.getenv("INVITE_BATCH_SIZE", "50"))
+INVITE_BATCH_INTERVAL_SECONDS = int(os.getenv("INVITE_BATCH_INTERVAL_SECONDS", "60"))
+INVITE_BULK_MAX = int(os.getenv("INVITE_BULK_MAX", "1000"))
 
 # ── Celery (optional) ──────────────────────────────────────────────────────────
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://127.0.0.1:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://127.0.0.1:6379/1")
 CELERY_TASK_ALWAYS_EAGER = get_bool("CELERY_TASK_ALWAYS_EAGER", False)
+CELERY_BEAT_SCHEDULE = {}
+
+# ── Outbound mail (journal.mail_queue: batched over one SMTP session) ────────
+MAIL_BATCH_WINDOW_SECONDS = int(os.getenv("MAIL_BATCH_WINDOW_SECONDS", "5"))  # collect before sending
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "100"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "5"))
+CELERY_BEAT_SCHEDULE["flush-mail-queue"] = {  # safety net for a lost or failed schedule
+    "task": "journal.tasks.flush_mail_queue",
+    "schedule": 60.0,
+}
+
+# ── Notification digests (journal.digests) ───────────────────────────────────
+DIGEST_INTERVAL_HOURS = int(os.getenv("DIGEST_INTERVAL_HOURS", "24"))
+DIGEST_MAX_ITEMS = int(os.getenv("DIGEST_MAX_ITEMS", "50"))  # per section; the rest is a count
+if get_bool("DIGEST_BEAT", True):
+    CELERY_BEAT_SCHEDULE["notification-digests"] = {
+        "task": "journal.tasks.send_notification_digests",
+        "schedule": DIGEST_INTERVAL_HOURS * 3600.0,
+    }
+
+# ── Media GC (manage.py gc_media; nightly beat job if MEDIA_GC_BEAT) ──────────
+MEDIA_GC_ROOTS = ["cas", "entry_images", "profiles"]
+MEDIA_GC_GRACE_HOURS = int(os.getenv("MEDIA_GC_GRACE_HOURS", "24"))
+MEDIA_GC_QUARANTINE_DAYS = int(os.getenv("MEDIA_GC_QUARANTINE_DAYS", "14"))
+if get_bool("MEDIA_GC_BEAT", False):
+    CELERY_BEAT_SCHEDULE["gc-orphaned-media"] = {
+        "task": "journal.tasks.gc_orphaned_media",
+        "schedule": crontab(hour=3, minute=30),
+    }
 
 # ── Feature flags ──────────────────────────────────────────────────────────────
 ALLOW_SELF_REGISTER = get_bool("ALLOW_SELF_REGISTER", False)
@@ -166,6 +259,15 @@ BILLING_MODE = os.getenv("BILLING_MODE", "per_moderator")
 TRIAL_DAYS = int(os.getenv("TRIAL_DAYS", "14"))
 GRACE_DAYS = int(os.getenv("GRACE_DAYS", "7"))
 
+# ── Member import ──────────────────────────────────────────────────────────────
+MEMBER_IMPORT_MAX_ROWS = int(os.getenv("MEMBER_IMPORT_MAX_ROWS", "1000"))
+# processes hashing imported passwords (0 = hash inline)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# ── Feed ───────────────────────────────────────────────────────────────────────
+FEED_PAGE_SIZE = int(os.getenv("FEED_PAGE_SIZE", "20"))
+MEMBERS_PAGE_SIZE = int(os.getenv("MEMBERS_PAGE_SIZE", "50"))  # members / subusers tables
+
 SENTRY_DSN = os.getenv("SENTRY_DSN", "")
 SENTRY_ENVIRONMENT = os.getenv(
     "SENTRY_ENVIRONMENT",